@@ -18,6 +18,7 @@ from pipeline_eds.api.eds.config import get_configurable_default_plant_name, get
 from pipeline_eds.api.eds.rest.config import get_eds_rest_api_credentials
 from pipeline_eds import helpers
 from pipeline_eds.time_manager import TimeManager
+from pipeline_eds.bulk_time import format_timestamps
 from pipeline_eds.plotbuffer import PlotBuffer
 from pipeline_eds.api.eds.rest.client import EdsRestClient
 from pipeline_eds.api.eds.config import get_idcs_to_iess_suffix 
@@ -133,28 +134,22 @@ def fetch_trend_data(
         # Default behavior: use nice_step
         step_seconds = helpers.nice_step(time_delta_seconds)
 
-    # 7. Load Historic Data
-    results = EdsRestClient.load_historic_data(session, iess_list, dt_start, dt_finish, step_seconds) 
-    
-    if not results:
-        # Return an empty buffer if no data is found
-        return PlotBuffer(), iess_list 
-        
-    # 8. Populate PlotBuffer
-    data_buffer = PlotBuffer() 
-    for idx, rows in enumerate(results):
-        
-        attributes = points_data.get(iess_list[idx], {}) # Use .get for robustness
+    # 7. Labels per point, known before any samples arrive
+    labels = []
+    units = []
+    for idx, iess in enumerate(iess_list):
+        attributes = points_data.get(iess, {}) # Use .get for robustness
         unit = attributes.get('UN', 'N/A')
         description = attributes.get('DESC', 'Unknown Sensor')
-        label = f"{idcs[idx]}, {description}, ({unit})"
-        
-        for row in rows:
-            # raw is a dictionary with keys: ts (unix timestamp), value, quality
-            ts = helpers.iso(row.get("ts"))
-            av = row.get("value")
-            
-            data_buffer.append(label, ts, av, unit)
+        labels.append(f"{idcs[idx]}, {description}, ({unit})")
+        units.append(unit)
+
+    # 8. Load Historic Data, through the trend cache, so a repeated view only fetches what is new
+    results = EdsRestClient.load_historic_data(session, iess_list, dt_start, dt_finish, step_seconds)
+    data_buffer = PlotBuffer() 
+    for idx, series in enumerate(results):
+        # series is a columnar TrendSeries: timestamps (unix), values, qualities
+        data_buffer.extend(labels[idx], format_timestamps(series.timestamps, "iso", zone=None), series.values, units[idx])
             
     return data_buffer, iess_list
 
@@ -6,16 +6,30 @@ However, this should become a non-issue once we call the EDS SOAP API instead of
 We would like to move away from this and just use the SOAP api.
 """
 from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import hashlib
+import json
 import logging
+import os
+from pathlib import Path
+import threading
 import typer
 import pyhabitat as ph
 
-from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds import helpers
+from pipeline_eds.api.eds.trend_result import NAN, TabularTrendResult, TrendSeries
+from pipeline_eds.bulk_time import floor_timestamps, format_timestamps
 from pipeline_eds.decorators import log_function_call
+from pipeline_eds.env import SecretConfig
+from pipeline_eds.time_manager import TimeManager
+from pipeline_eds.workspace_manager import WorkspaceManager
 
 logger = logging.getLogger(__name__)
 if ph.on_windows():
     import mysql.connector
+    import mysql.connector.pooling
 else:
     pass
 
@@ -23,22 +37,28 @@ else:
 def _get_eds_local_db_credentials(service_name = "pipeline-eds-local-database",item_name = "eds_dbs") -> dict:
         return {}
     
+# Rows pulled from the server per fetchmany() round trip of the streaming cursor.
+LOCAL_DB_FETCH_SIZE = 10_000
+
 def access_database_files_locally(
     session_key: str,
     starttime: int,
     endtime: int,
     point: list[int],
     tables: list[str] | None = None
-) -> list[list[dict]]:
-
-    from pipeline_eds.api.eds.rest.alarm import decode_stat
+) -> TabularTrendResult:
     """
     Access MariaDB data directly by querying all MyISAM tables with .MYD files
     modified in the given time window, filtering by sensor ids in 'point'.
 
     If 'tables' is provided, only query those tables; otherwise fall back to most recent table.
 
-    Returns a list (per sensor id) of dicts with keys 'ts', 'value', 'quality'.
+    Each table is read with one `ids IN (...)` query on an unbuffered cursor, streamed with
+    fetchmany() and demultiplexed by sensor id, instead of one query per point per table.
+    Tables are scanned in parallel over a small pool of connections (see scan_tables_parallel).
+
+    Returns a TabularTrendResult: one columnar TrendSeries (ts, value, quality) per sensor id,
+    in the order of 'point', holding the samples of all queried tables in timestamp order.
 
     This is provided as a fallback if API access fails.
     """
@@ -47,7 +67,7 @@ def access_database_files_locally(
     workspace_name = 'eds_to_rjn'
     workspace_manager = WorkspaceManager(workspace_name)
 
-    local_database_dict = EdsRestClient._get_eds_local_db_credentials(service_name = "pipeline-eds-local-database",item_name = "eds_dbs")
+    local_database_dict = _get_eds_local_db_credentials(service_name = "pipeline-eds-local-database",item_name = "eds_dbs")
     if not isinstance(local_database_dict,dict) or len(local_database_dict):
         typer.echo("Please develop _get_eds_local_db_credentials() to return a JSON-like dict structure, " \
         "after drawing database credentials from the keyring and compiling them into a dictionary. " \
@@ -66,71 +86,275 @@ def access_database_files_locally(
     #conn_config = {k: v for k, v in full_config.items() if k != "storage_path"}
     
     conn_config = secrets_dict["eds_dbs"][session_key]
-    results = []
+    results = TabularTrendResult(series=[TrendSeries() for _ in point])
+    if not point:
+        return results
 
     try:
-        logger.info("Attempting: mysql.connector.connect(**conn_config)")
-        conn = mysql.connector.connect(**conn_config)
-        cursor = conn.cursor(dictionary=True)
+        logger.info("Attempting: pooled mysql.connector connections(**conn_config)")
+        pool = LocalDatabasePool.get_pool(session_key, conn_config)
 
         # Determine which tables to query
         if tables is None:
-            most_recent_table = get_most_recent_table(cursor, session_key.lower())
+            with LocalDatabasePool.connection(pool) as conn:
+                with conn.cursor(dictionary=True) as lookup_cursor:
+                    most_recent_table = get_most_recent_table(lookup_cursor, session_key.lower())
             if not most_recent_table:
                 logger.warning("No recent tables found.")
-                return [[] for _ in point]
+                return results
             tables_to_query = [most_recent_table]
         else:
             tables_to_query = tables
 
-        for table_name in tables_to_query:
-            if not table_has_ts_column(conn, table_name, db_type="mysql"):
-                logger.warning(f"Skipping table '{table_name}': no 'ts' column.")
-                continue
-
-            for point_id in point:
-                #logger.info(f"Querying table {table_name} for sensor id {point_id}")
-                query = f"""
-                    SELECT ts, ids, tss, stat, val FROM `{table_name}`
-                    WHERE ts BETWEEN %s AND %s AND ids = %s
-                    ORDER BY ts ASC
-                """
-                cursor.execute(query, (starttime, endtime, point_id))
-                full_rows = []
-                for row in cursor:
-                    quality_flags = decode_stat(row["stat"])
-                    quality_code = quality_flags[0][2] if quality_flags else "N"
-                    full_rows.append({
-                        "ts": row["ts"],
-                        "value": row["val"],
-                        "quality": quality_code,
-                    })
-                full_rows.sort(key=lambda x: x["ts"])
-                results.append(full_rows)
+        results = scan_tables_parallel(pool, tables_to_query, point, starttime, endtime,
+                                       schema_key=TableSchemaCache.key_for(conn_config))
 
     except mysql.connector.errors.DatabaseError as db_err:
         if "Can't connect to MySQL server" in str(db_err):
             logger.error("Local database access failed: Please run this code on the proper EDS server where the local MariaDB is accessible.")
             # Optionally:
             print("ERROR: This code must be run on the proper EDS server for local database access to work.")
-            return [[] for _ in point]  # return list of empty lists, one per point
+            return TabularTrendResult(series=[TrendSeries() for _ in point])  # one empty series per point
         else:
             raise  # re-raise other DB errors
     except Exception as e:
         logger.error(f"Unexpected error accessing local database: {e}")
         # hitting this in termux
         raise
-    finally:
-        # cleanup cursor/connection if they exist
-        try:
-            cursor.close()
-            conn.close()
-        except Exception:
-            pass
 
     logger.info(f"Successfully retrieved data for {len(point)} point(s)")
     return results
 
+class LocalDatabasePool:
+    """
+    One mysql.connector connection pool per local database (session key) for the life of the process.
+    Its size bounds how many tables are scanned at once, so the server never sees more than
+    MAX_CONNECTIONS connections from this process. MySQLConnectionPool raises PoolError when
+    it is exhausted, so connection() waits on a semaphore of the pool's size instead.
+    A pool is rebuilt when its session's conn_config changes, e.g. secrets hot-reloaded in serve mode.
+    """
+    MAX_CONNECTIONS = 4
+
+    _pools = {}  # {session_key: (config_digest, pool)}
+    _slots = {}  # {pool: BoundedSemaphore(pool_size)}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _config_digest(conn_config: dict) -> str:
+        return hashlib.sha256(json.dumps(conn_config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_pool(cls, session_key: str, conn_config: dict):
+        digest = cls._config_digest(conn_config)
+        stale = None
+        with cls._lock:
+            entry = cls._pools.get(session_key)
+            if entry is not None and entry[0] == digest:
+                return entry[1]
+            if entry is not None:
+                stale = entry[1]
+                cls._slots.pop(stale, None)  # callers still inside connection() hold their own reference
+            pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"pipeline_eds_{session_key}"[:64],
+                pool_size=cls.MAX_CONNECTIONS,
+                **conn_config,
+            )
+            cls._pools[session_key] = (digest, pool)
+        if stale is not None:
+            logger.info(f"Connection settings for local database '{session_key}' changed; rebuilt its pool")
+            cls._close_pool(stale)
+        return pool
+
+    @staticmethod
+    def _close_pool(pool):
+        """Close the idle connections of a replaced pool; borrowed ones go back to it and are dropped with it."""
+        try:
+            pool._remove_connections()
+        except Exception as e:
+            logger.debug(f"Could not close the connections of a replaced pool: {e}")
+
+    @classmethod
+    @contextmanager
+    def connection(cls, pool):
+        """Borrow a connection, waiting for a free one; closing a pooled connection hands it back to the pool."""
+        with cls._lock:
+            slots = cls._slots.get(pool)
+            if slots is None:
+                slots = cls._slots[pool] = threading.BoundedSemaphore(getattr(pool, "pool_size", cls.MAX_CONNECTIONS))
+        with slots:
+            conn = pool.get_connection()
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+
+def _load_json_cache(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save_json_cache(path: Path, data: dict):
+    """Write data to path atomically, so a concurrent reader never sees half a file. Failures are only logged."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not persist {path}: {e}")
+
+
+class TableSchemaCache:
+    """
+    Whether each table has a 'ts' column, remembered per process and in a JSON file between runs.
+
+    A pla_ table's columns do not change once it exists, so each table costs at most one
+    SHOW COLUMNS round trip ever, instead of one per table on every run.
+    """
+    CACHE_PATH = Path.home() / ".pipeline-eds" / "local_db_schema.json"
+
+    _has_ts = None  # {schema_key: {table: bool}}, loaded lazily
+    _lock = threading.Lock()
+
+    @staticmethod
+    def key_for(conn_config: dict) -> str:
+        return f"{conn_config.get('host', 'localhost')}:{conn_config.get('port', 3306)}/{conn_config.get('database', '')}"
+
+    @classmethod
+    def _load(cls) -> dict:
+        if cls._has_ts is None:
+            cls._has_ts = _load_json_cache(cls.CACHE_PATH)
+        return cls._has_ts
+
+    @classmethod
+    def _save(cls):
+        _save_json_cache(cls.CACHE_PATH, cls._has_ts)
+
+    @classmethod
+    def has_ts_column(cls, conn, schema_key: str, table_name: str) -> bool:
+        with cls._lock:
+            known = cls._load().get(schema_key, {}).get(table_name)
+        if known is not None:
+            return known
+        has_ts = table_has_ts_column(conn, table_name, db_type="mysql")
+        with cls._lock:
+            cls._load().setdefault(schema_key, {})[table_name] = has_ts
+            cls._save()
+        return has_ts
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._has_ts = {}
+            cls._save()
+
+
+def scan_tables_parallel(pool, tables: list[str], point: list, starttime: int, endtime: int,
+                         schema_key: str, max_workers: int | None = None) -> TabularTrendResult:
+    """
+    Query every table on its own pooled connection, in up to max_workers threads
+    (default: LocalDatabasePool.MAX_CONNECTIONS), then merge per point in timestamp order.
+
+    Returns:
+        TabularTrendResult: One TrendSeries per entry of 'point'.
+    """
+    if not point or not tables:
+        return TabularTrendResult(series=[TrendSeries() for _ in point])
+
+    def scan_table(table_name):
+        series_list = [TrendSeries() for _ in point]
+        with LocalDatabasePool.connection(pool) as conn:
+            if not TableSchemaCache.has_ts_column(conn, schema_key, table_name):
+                logger.warning(f"Skipping table '{table_name}': no 'ts' column.")
+                return series_list
+            # Unbuffered: rows stay on the server until fetched, so a large table is never held in full
+            cursor = conn.cursor(buffered=False)
+            try:
+                cursor.execute(build_points_query(table_name, len(point)), (starttime, endtime, *point))
+                n_rows = demultiplex_rows(cursor, point, series_list)
+            finally:
+                cursor.close()
+        logger.debug(f"Table {table_name}: {n_rows} row(s) for {len(point)} point(s)")
+        return series_list
+
+    max_workers = min(max_workers or LocalDatabasePool.MAX_CONNECTIONS, len(tables))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-db-scan") as executor:
+        per_table = list(executor.map(scan_table, tables))
+    return TabularTrendResult(series=merge_table_series(per_table, len(point)))
+
+def merge_table_series(per_table: list[list[TrendSeries]], n_points: int) -> list[TrendSeries]:
+    """
+    Concatenate the per-table series of each point, tables ordered by their first sample.
+    pla_ tables cover consecutive time slices, so this is normally already in timestamp order;
+    overlapping tables are sorted afterwards.
+    """
+    merged = []
+    for idx in range(n_points):
+        series = TrendSeries()
+        chunks = sorted((table[idx] for table in per_table if len(table[idx])), key=lambda chunk: chunk.timestamps[0])
+        for chunk in chunks:
+            series.extend(chunk)
+        sort_series_by_time(series)
+        merged.append(series)
+    return merged
+
+def build_points_query(table_name: str, n_points: int) -> str:
+    """One SELECT for all sensor ids of a table; parameters are (starttime, endtime, *ids)."""
+    placeholders = ", ".join(["%s"] * n_points)
+    return (
+        f"SELECT ts, ids, stat, val FROM `{table_name}` "
+        f"WHERE ts BETWEEN %s AND %s AND ids IN ({placeholders}) "
+        "ORDER BY ts ASC"
+    )
+
+def demultiplex_rows(cursor, point: list, series_list: list[TrendSeries], fetch_size: int = LOCAL_DB_FETCH_SIZE) -> int:
+    """
+    Stream (ts, ids, stat, val) rows from an executed cursor into the TrendSeries of their sensor id.
+
+    series_list[i] receives the rows of point[i]. Ids are matched as strings, since the
+    queries CSV carries them as text while the table column is numeric.
+    The stat values are collected per point and decoded to quality codes in bulk at the end.
+
+    Returns:
+        int: Number of rows read.
+    """
+    from pipeline_eds.api.eds.rest.alarm import decode_quality_column
+
+    stats_per_point = [array("q") for _ in series_list]
+    columns_by_id = {
+        str(point_id): (series.timestamps.append, series.values.append, stats.append)
+        for point_id, series, stats in zip(point, series_list, stats_per_point)
+    }
+    n_rows = 0
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        n_rows += len(rows)
+        for ts, ids, stat, val in rows:
+            columns = columns_by_id.get(str(ids))
+            if columns is None:
+                continue
+            ts_append, value_append, stat_append = columns
+            ts_append(int(ts))
+            value_append(NAN if val is None else val)
+            stat_append(stat)
+    for series, stats in zip(series_list, stats_per_point):
+        series.qualities.extend(decode_quality_column(stats))
+    return n_rows
+
+def sort_series_by_time(series: TrendSeries):
+    """Put the samples of a series merged from several tables in timestamp order, if they are not already."""
+    timestamps = series.timestamps
+    if all(timestamps[i] <= timestamps[i + 1] for i in range(len(timestamps) - 1)):
+        return
+    order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+    series.timestamps = array("q", (timestamps[i] for i in order))
+    series.values = array("d", (series.values[i] for i in order))
+    series.qualities = bytearray(series.qualities[i] for i in order)
+
 #def identify_relevant_MyISM_tables(session_key: str, starttime: int, endtime: int, secrets_dict: dict) -> list:
 # 3.8-safe, no hints
 def identify_relevant_MyISM_tables(session_key, starttime, endtime, secrets_dict):
@@ -184,17 +408,114 @@ def identify_relevant_MyISM_tables(session_key, starttime, endtime, secrets_dict
     return matching_tables
 
 def identify_relevant_tables(session_key, starttime, endtime, secrets_dict):
+    """
+    The pla_ tables whose ts range overlaps [starttime, endtime], taken from the persistent
+    TableTimeIndex. Falls back to a filesystem mtime scan if the database is not reachable.
+    """
     try:
         conn_config = secrets_dict["eds_dbs"][session_key]
-        conn = mysql.connector.connect(**conn_config)
-        cursor = conn.cursor(dictionary=True)
-        # Use INFORMATION_SCHEMA instead of filesystem
-        #return get_ten_most_recent_tables(cursor, conn_config["database"])
-        return get_n_most_recent_tables(cursor, conn_config["database"], n=80)
+        pool = LocalDatabasePool.get_pool(session_key, conn_config)
+        with LocalDatabasePool.connection(pool) as conn:
+            # Use INFORMATION_SCHEMA and the table index instead of the filesystem
+            return TableTimeIndex.tables_overlapping(conn, TableSchemaCache.key_for(conn_config),
+                                                     conn_config["database"], starttime, endtime)
     except mysql.connector.Error:
         logger.warning("Falling back to filesystem scan — DB not accessible.")
         return identify_relevant_MyISM_tables(session_key, starttime, endtime, secrets_dict)
 
+def list_tables(conn, db_name, prefix='pla_') -> list[str]:
+    """All table names with the given prefix, oldest (lowest name) first."""
+    query = """
+        SELECT TABLE_NAME
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME LIKE %s
+        ORDER BY TABLE_NAME ASC
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(query, (db_name, f'{prefix}%'))
+        return [row[0] for row in cursor.fetchall()]
+
+
+class TableTimeIndex:
+    """
+    Persistent catalog of (table, min_ts, max_ts, row_count) for the pla_ history tables.
+
+    Only tables missing from the catalog get a MIN/MAX/COUNT query, plus the newest table,
+    which is still being written to (and the one that was newest at the last refresh). Tables dropped from the server are dropped from the
+    catalog. With it, a request reads exactly the tables overlapping its window, rather
+    than a fixed number of the most recent ones.
+    """
+    CACHE_PATH = Path.home() / ".pipeline-eds" / "local_db_table_index.json"
+
+    _index = None  # {schema_key: {table: [min_ts, max_ts, row_count]}}, loaded lazily
+    _lock = threading.Lock()
+
+    @classmethod
+    def _load(cls) -> dict:
+        if cls._index is None:
+            cls._index = _load_json_cache(cls.CACHE_PATH)
+        return cls._index
+
+    @classmethod
+    def _save(cls):
+        _save_json_cache(cls.CACHE_PATH, cls._index)
+
+    @staticmethod
+    def _table_stats(conn, table_name) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT MIN(ts), MAX(ts), COUNT(*) FROM `{table_name}`")
+            min_ts, max_ts, row_count = cursor.fetchall()[0]
+        return [
+            int(min_ts) if min_ts is not None else None,
+            int(max_ts) if max_ts is not None else None,
+            int(row_count),
+        ]
+
+    @classmethod
+    def refresh(cls, conn, schema_key: str, db_name: str, prefix='pla_') -> dict:
+        """
+        Bring the catalog of one database up to date and return {table: [min_ts, max_ts, row_count]}.
+        """
+        tables = list_tables(conn, db_name, prefix)
+        with cls._lock:
+            known = dict(cls._load().get(schema_key, {}))
+        catalog = {table: known[table] for table in tables if table in known}
+
+        to_query = [table for table in tables if table not in catalog]
+        # The newest table keeps growing, and so did the previous newest until the current one was created
+        for growing in {tables[-1] if tables else None, max(catalog, default=None)}:
+            if growing is not None and growing not in to_query:
+                to_query.append(growing)
+        for table_name in to_query:
+            if not TableSchemaCache.has_ts_column(conn, schema_key, table_name):
+                continue
+            catalog[table_name] = cls._table_stats(conn, table_name)
+        logger.debug(f"Table index {schema_key}: {len(catalog)} table(s), {len(to_query)} queried")
+
+        if catalog != known:
+            with cls._lock:
+                cls._load()[schema_key] = catalog
+                cls._save()
+        return catalog
+
+    @classmethod
+    def tables_overlapping(cls, conn, schema_key: str, db_name: str, starttime: int, endtime: int, prefix='pla_') -> list[str]:
+        """Tables with samples in [starttime, endtime], oldest first."""
+        catalog = cls.refresh(conn, schema_key, db_name, prefix)
+        overlapping = [
+            (min_ts, table_name) for table_name, (min_ts, max_ts, row_count) in catalog.items()
+            if row_count and min_ts <= endtime and max_ts >= starttime
+        ]
+        table_names = [table_name for _, table_name in sorted(overlapping)]
+        logger.info(f"{len(table_names)} of {len(catalog)} '{prefix}' table(s) overlap the requested window: {table_names}")
+        return table_names
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._index = {}
+            cls._save()
+
 def get_most_recent_table(cursor, db_name, prefix='pla_'):
     query = f"""
         SELECT TABLE_NAME
@@ -322,16 +643,13 @@ def demo_eds_local_database_access():
             timestamps = []
             values = []
             
-            for row in results[idx]:
-                #print(f"row = {row}")
-                #EdsRestClient.print_point_info_row(row)
-
-                dt = datetime.fromtimestamp(row["ts"])
-                timestamp_str = helpers.round_datetime_to_nearest_past_five_minutes(dt).isoformat(timespec='seconds')
-                if row['quality'] == 'G':
+            series = results[idx]
+            timestamps_str = format_timestamps(floor_timestamps(series.timestamps, 300), "iso", zone=None)
+            for timestamp_str, value, quality in zip(timestamps_str, series.values, series.quality_codes()):
+                if quality == 'G':
                     timestamps.append(timestamp_str)
-                    values.append(round(row["value"],5)) # unrounded values fail to post
-            print(f"final row = {row}")
+                    values.append(round(value,5)) # unrounded values fail to post
+            print(f"final sample = {timestamps[-1] if timestamps else None}, {values[-1] if values else None}")
         else:
             print("No data rows for this point")
 
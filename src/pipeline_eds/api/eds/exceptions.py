@@ -18,6 +18,18 @@ class EdsRequestError(EdsAPIError):
         self.status_code = status_code
         super().__init__(message)
 
+class EdsTabularTimeoutError(EdsRequestError):
+    """Raised when the EDS server gives up on a tabular trend request (chunk status 'TIMEOUT')"""
+    pass
+
+class EdsRequestDeadlineError(EdsRequestError):
+    """Raised when submitted requests are still executing at the client's wait deadline"""
+    pass
+
+class EdsRequestCancelledError(EdsRequestError):
+    """Raised when waiting for submitted requests was cancelled by the caller"""
+    pass
+
 
 class EdsLoginException(Exception):
     """
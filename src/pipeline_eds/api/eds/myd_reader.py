@@ -0,0 +1,224 @@
+# src/pipeline_eds/api/eds/myd_reader.py
+"""
+Read-only access to the raw MyISAM data files (pla_*.MYD) of the EDS history tables,
+without a running MariaDB.
+
+The pla_ tables use the fixed (static) MyISAM row format: every record has the same
+length, a header byte (bit 0 set for a live row, clear for a deleted one) and the
+columns ts, ids, tss, stat, val packed little-endian. A .MYD file is therefore just an
+array of records. MydReader memory-maps it and filters rows by ids and ts range, so
+history can be extracted from a copy of the data directory at disk speed, with no
+database server and no load on the production MariaDB.
+
+The column types depend on the table definition (`SHOW CREATE TABLE pla_...`).
+MydRowLayout describes them and can be set per plant in the secrets file:
+
+    eds_dbs:
+      WWTF-config:
+        storage_path: 'E:/SQLData/wwtf/'
+        myd_layout:
+          header_bytes: 1
+          columns: [[ts, I], [ids, I], [tss, I], [stat, I], [val, d]]
+
+Column codes are struct codes (I = 4-byte unsigned int, d = 8-byte double, ...).
+Rows whose val is NULL are read as whatever the file holds in that slot; the pla_
+tables declare val NOT NULL.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from array import array
+import dataclasses
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+
+from pipeline_eds.api.eds.trend_result import TabularTrendResult, TrendSeries
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # rows are filtered with struct.iter_unpack instead
+
+logger = logging.getLogger(__name__)
+
+_NUMPY_CODES = {"B": "u1", "b": "i1", "H": "<u2", "h": "<i2", "I": "<u4", "i": "<i4",
+                "Q": "<u8", "q": "<i8", "f": "<f4", "d": "<f8"}
+
+@dataclasses.dataclass(frozen=True)
+class MydRowLayout:
+    """Byte layout of one fixed-format record."""
+    header_bytes: int = 1
+    columns: tuple = (("ts", "I"), ("ids", "I"), ("tss", "I"), ("stat", "I"), ("val", "d"))
+    live_flag: int = 1  # header bit set on live rows
+
+    @classmethod
+    def from_dict(cls, layout: dict | None) -> "MydRowLayout":
+        if not layout:
+            return cls()
+        defaults = cls()
+        return cls(
+            header_bytes=int(layout.get("header_bytes", defaults.header_bytes)),
+            columns=tuple((str(name), str(code)) for name, code in layout.get("columns", defaults.columns)),
+            live_flag=int(layout.get("live_flag", defaults.live_flag)),
+        )
+
+    @property
+    def struct_format(self) -> str:
+        padding = f"{self.header_bytes - 1}x" if self.header_bytes > 1 else ""
+        return "<B" + padding + "".join(code for _, code in self.columns)
+
+    @property
+    def record_length(self) -> int:
+        return struct.calcsize(self.struct_format)
+
+    def column_index(self, name: str) -> int:
+        """Position of a column in an unpacked record (index 0 is the header byte)."""
+        return 1 + [column for column, _ in self.columns].index(name)
+
+    def numpy_dtype(self):
+        fields = [("header", "u1")]
+        if self.header_bytes > 1:
+            fields.append(("_padding", f"V{self.header_bytes - 1}"))
+        fields += [(name, _NUMPY_CODES[code]) for name, code in self.columns]
+        return np.dtype(fields)
+
+
+class MydReader:
+    """
+    Memory-mapped reader of one .MYD file.
+
+    Usage:
+        with MydReader("E:/SQLData/wwtf/pla_68a98310.MYD") as reader:
+            series_list = reader.read_points(["8528", "2308"], starttime, endtime)
+    """
+
+    def __init__(self, path, layout: MydRowLayout | None = None):
+        self.path = Path(path)
+        self.layout = layout or MydRowLayout()
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # A file still being appended to may end in a partial record; ignore it
+        self.n_records = size // self.layout.record_length
+        if size % self.layout.record_length:
+            logger.debug(f"{self.path.name}: {size % self.layout.record_length} trailing byte(s) ignored")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n_records
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _records_view(self) -> memoryview:
+        return memoryview(self._mmap)[: self.n_records * self.layout.record_length]
+
+    def read_points(self, point: list, starttime: int, endtime: int) -> list[TrendSeries]:
+        """
+        Live rows of the given sensor ids with starttime <= ts <= endtime,
+        as one TrendSeries per entry of 'point', in file order.
+        """
+        from pipeline_eds.api.eds.rest.alarm import decode_quality_column
+
+        series_list = [TrendSeries() for _ in point]
+        if not self.n_records or not point:
+            return series_list
+        if np is not None:
+            self._read_points_numpy(point, starttime, endtime, series_list)
+            return series_list
+
+        layout = self.layout
+        ts_index, ids_index = layout.column_index("ts"), layout.column_index("ids")
+        stat_index, val_index = layout.column_index("stat"), layout.column_index("val")
+        live_flag = layout.live_flag
+        index_by_id = {int(point_id): idx for idx, point_id in enumerate(point)}
+        stats_per_point = [array("q") for _ in point]
+
+        view = self._records_view()
+        try:
+            for record in struct.iter_unpack(layout.struct_format, view):
+                if not record[0] & live_flag:
+                    continue
+                ts = record[ts_index]
+                if ts < starttime or ts > endtime:
+                    continue
+                idx = index_by_id.get(record[ids_index])
+                if idx is None:
+                    continue
+                series = series_list[idx]
+                series.timestamps.append(ts)
+                series.values.append(record[val_index])
+                stats_per_point[idx].append(record[stat_index])
+        finally:
+            view.release()
+
+        for series, stats in zip(series_list, stats_per_point):
+            series.qualities.extend(decode_quality_column(stats))
+        return series_list
+
+    def _read_points_numpy(self, point, starttime, endtime, series_list):
+        from pipeline_eds.api.eds.rest.alarm import decode_quality_column
+
+        records = np.frombuffer(self._mmap, dtype=self.layout.numpy_dtype(), count=self.n_records)
+        ids = np.array([int(point_id) for point_id in point], dtype=np.int64)
+        mask = (records["header"] & self.layout.live_flag) != 0
+        mask &= (records["ts"] >= starttime) & (records["ts"] <= endtime)
+        mask &= np.isin(records["ids"], ids)
+        selected = records[mask]  # a copy, so the mmap can be closed afterwards
+        for series, point_id in zip(series_list, ids):
+            rows = selected[selected["ids"] == point_id]
+            series.timestamps.extend(array("q", rows["ts"].astype(np.int64).tobytes()))
+            series.values.extend(array("d", rows["val"].astype(np.float64).tobytes()))
+            series.qualities.extend(decode_quality_column(rows["stat"]))
+
+
+def list_myd_tables(storage_dir, prefix: str = "pla_") -> list[str]:
+    """Table names of the .MYD files in storage_dir, oldest (lowest name) first."""
+    with os.scandir(storage_dir) as entries:
+        return sorted(
+            os.path.splitext(entry.name)[0] for entry in entries
+            if entry.is_file() and entry.name.startswith(prefix) and entry.name.upper().endswith(".MYD")
+        )
+
+def read_myd_tables(storage_dir, point: list, starttime: int, endtime: int,
+                    tables: list[str] | None = None, layout: MydRowLayout | None = None) -> TabularTrendResult:
+    """
+    Read the given tables (default: every pla_ table in storage_dir) straight from their .MYD files.
+
+    Returns:
+        TabularTrendResult: One TrendSeries per entry of 'point', merged across tables in timestamp order.
+    """
+    from pipeline_eds.api.eds.database import merge_table_series
+
+    storage_dir = Path(storage_dir)
+    if tables is None:
+        tables = list_myd_tables(storage_dir)
+    per_table = []
+    for table_name in tables:
+        path = storage_dir / f"{table_name}.MYD"
+        if not path.exists():
+            logger.warning(f"No data file for table '{table_name}' in {storage_dir}")
+            continue
+        with MydReader(path, layout) as reader:
+            per_table.append(reader.read_points(point, starttime, endtime))
+    return TabularTrendResult(series=merge_table_series(per_table, len(point)))
+
+def access_myd_files_offline(session_key: str, starttime: int, endtime: int, point: list,
+                             secrets_dict: dict, tables: list[str] | None = None) -> TabularTrendResult:
+    """
+    Offline counterpart of access_database_files_locally(): the same result,
+    read from the storage_path (and optional myd_layout) of the session's -config secrets.
+    """
+    plant_config = secrets_dict["eds_dbs"][f"{session_key}-config"]
+    layout = MydRowLayout.from_dict(plant_config.get("myd_layout"))
+    logger.info(f"Reading MyISAM data files offline from {plant_config['storage_path']}")
+    return read_myd_tables(plant_config["storage_path"], point, starttime, endtime, tables=tables, layout=layout)
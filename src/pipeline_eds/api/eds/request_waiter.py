@@ -0,0 +1,242 @@
+# src/pipeline_eds/api/eds/request_waiter.py
+"""
+Shared lifecycle handling for asynchronous EDS requests (REST /requests and SOAP getRequestStatus).
+
+EDS answers a tabular request with an id and computes the result in the background.
+RequestWaiter polls the status of one or many such ids until each one succeeds or fails:
+    - adaptive backoff: the first polls come quickly (small requests finish well under a second),
+      later polls slow down towards PollPolicy.max_delay, so long jobs do not hammer the server
+    - an overall deadline and an optional threading.Event to cancel the wait
+    - all in-flight ids are checked with one status call per poll
+    - a RequestTiming (polls, elapsed seconds, final status) per id
+
+The waiter knows nothing about the transport. It is given a `check_statuses(ids)` callable
+returning {id: (status, message)} with status one of SUCCESS, FAILURE or anything else (still running).
+rest_status_checker() and soap_status_checker() build those callables.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import asyncio
+import dataclasses
+import logging
+import threading
+import time
+from typing import Callable
+
+from pipeline_eds.api.eds.exceptions import EdsRequestCancelledError, EdsRequestDeadlineError, EdsRequestError
+from pipeline_eds.api.eds.rest import schemas
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = "SUCCESS"
+FAILURE = "FAILURE"
+
+@dataclasses.dataclass(frozen=True)
+class PollPolicy:
+    """How often to poll, and for how long at most."""
+    initial_delay: float = 0.1
+    multiplier: float = 1.5
+    max_delay: float = 5.0
+    deadline: float | None = 900.0  # seconds for the whole wait; None waits forever
+
+    def delays(self):
+        delay = self.initial_delay
+        while True:
+            yield delay
+            delay = min(self.max_delay, delay * self.multiplier)
+
+
+@dataclasses.dataclass
+class RequestTiming:
+    """Timing metrics of one waited-for request."""
+    request_id: object
+    status: str = "PENDING"
+    message: str = ""
+    polls: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == SUCCESS
+
+
+class RequestWaiter:
+    """
+    Poll a batch of EDS request ids until they are all done.
+
+    Args:
+        check_statuses: Callable taking a list of ids and returning {id: (status, message)}.
+                        Ids missing from the reply are treated as still running.
+        policy (PollPolicy): Backoff and deadline.
+        cancel_event (threading.Event): Optional; setting it ends the wait with EdsRequestCancelledError.
+        on_abandon: Optional callable given the ids still running after a deadline or cancel,
+                    e.g. to drop them on the server.
+        label (str): Prefix for log messages, e.g. the plant name.
+    """
+
+    def __init__(self, check_statuses: Callable, policy: PollPolicy | None = None,
+                 cancel_event: threading.Event | None = None,
+                 on_abandon: Callable | None = None, label: str = ""):
+        self.check_statuses = check_statuses
+        self.policy = policy or PollPolicy()
+        self.cancel_event = cancel_event
+        self.on_abandon = on_abandon
+        self.label = label
+
+    def wait(self, request_id) -> RequestTiming:
+        """
+        Wait for one request.
+
+        Raises:
+            EdsRequestError: The request failed on the server.
+            EdsRequestDeadlineError / EdsRequestCancelledError: See wait_all().
+        """
+        timing = self.wait_all([request_id])[request_id]
+        if not timing.succeeded:
+            raise EdsRequestError('request [{}] failed: {}'.format(request_id, timing.message))
+        return timing
+
+    def wait_all(self, request_ids) -> dict:
+        """
+        Wait until every request has succeeded or failed. A failed request does not stop the others.
+
+        Returns:
+            dict: {request_id: RequestTiming}
+
+        Raises:
+            EdsRequestDeadlineError: Some requests were still running at the policy deadline.
+            EdsRequestCancelledError: cancel_event was set.
+        """
+        started = time.monotonic()
+        timings = {request_id: RequestTiming(request_id) for request_id in request_ids}
+        pending = list(timings)
+        for delay in self.policy.delays():
+            if not pending:
+                break
+            delay = self._bounded_delay(delay, started)
+            if self._sleep(delay):
+                self._abandon(pending)
+                raise EdsRequestCancelledError(f"{self.label}wait cancelled with {len(pending)} request(s) still running")
+            statuses = self.check_statuses(list(pending))
+            pending = self._apply_statuses(timings, pending, statuses, started)
+            if pending and self._deadline_passed(started):
+                self._abandon(pending)
+                raise EdsRequestDeadlineError(f"{self.label}{len(pending)} request(s) still running after {self.policy.deadline:.0f} s: {pending}")
+        self._log_summary(timings)
+        return timings
+
+    async def async_wait_all(self, request_ids) -> dict:
+        """Event-loop version of wait_all(); status calls run in a worker thread."""
+        started = time.monotonic()
+        timings = {request_id: RequestTiming(request_id) for request_id in request_ids}
+        pending = list(timings)
+        for delay in self.policy.delays():
+            if not pending:
+                break
+            await asyncio.sleep(self._bounded_delay(delay, started))
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                await asyncio.to_thread(self._abandon, pending)
+                raise EdsRequestCancelledError(f"{self.label}wait cancelled with {len(pending)} request(s) still running")
+            statuses = await asyncio.to_thread(self.check_statuses, list(pending))
+            pending = self._apply_statuses(timings, pending, statuses, started)
+            if pending and self._deadline_passed(started):
+                await asyncio.to_thread(self._abandon, pending)
+                raise EdsRequestDeadlineError(f"{self.label}{len(pending)} request(s) still running after {self.policy.deadline:.0f} s: {pending}")
+        self._log_summary(timings)
+        return timings
+
+    async def async_wait(self, request_id) -> RequestTiming:
+        timing = (await self.async_wait_all([request_id]))[request_id]
+        if not timing.succeeded:
+            raise EdsRequestError('request [{}] failed: {}'.format(request_id, timing.message))
+        return timing
+
+    def _bounded_delay(self, delay: float, started: float) -> float:
+        # Never sleep past the deadline, so the last poll lands right on it
+        if self.policy.deadline is None:
+            return delay
+        remaining = self.policy.deadline - (time.monotonic() - started)
+        return max(0.0, min(delay, remaining))
+
+    def _deadline_passed(self, started: float) -> bool:
+        return self.policy.deadline is not None and time.monotonic() - started >= self.policy.deadline
+
+    def _sleep(self, delay: float) -> bool:
+        """Sleep, returning True early if the wait was cancelled."""
+        if self.cancel_event is None:
+            time.sleep(delay)
+            return False
+        return self.cancel_event.wait(delay)
+
+    def _apply_statuses(self, timings: dict, pending: list, statuses: dict, started: float) -> list:
+        elapsed = time.monotonic() - started
+        still_pending = []
+        for request_id in pending:
+            timing = timings[request_id]
+            timing.polls += 1
+            timing.elapsed = elapsed
+            timing.status, message = statuses.get(request_id, ("EXECUTING", ""))
+            if timing.status in (SUCCESS, FAILURE):
+                timing.message = message or ""
+            else:
+                still_pending.append(request_id)
+        if still_pending:
+            logger.debug(f"{self.label}{len(still_pending)} request(s) executing after {elapsed:.2f} s")
+        return still_pending
+
+    def _abandon(self, request_ids: list):
+        if self.on_abandon is None:
+            return
+        try:
+            self.on_abandon(list(request_ids))
+        except Exception as e:
+            logger.warning(f"{self.label}could not drop abandoned request(s) {request_ids}: {e}")
+
+    def _log_summary(self, timings: dict):
+        for timing in timings.values():
+            logger.info('{}request [{}] {} in {:.3f} s after {} poll(s)'.format(
+                self.label, timing.request_id, timing.status.lower(), timing.elapsed, timing.polls))
+
+
+def rest_status_checker(session, api_url: str | None = None) -> Callable:
+    """
+    Build a check_statuses callable for the REST API.
+    All ids go into one GET /requests?id=..&id=.. call; the reply is keyed by the id as a string.
+    """
+    api_url = api_url or str(session.base_url)
+
+    def check_statuses(request_ids: list) -> dict:
+        response = session.get(f'{api_url}/requests', params={'id': [str(request_id) for request_id in request_ids]}, verify=False)
+        reply = schemas.decode_request_statuses(response)
+        statuses = {}
+        for request_id in request_ids:
+            status = reply.get(str(request_id))
+            if status is not None:
+                statuses[request_id] = (status.status, status.message or "")
+        return statuses
+
+    return check_statuses
+
+
+def soap_status_checker(soapclient, authstring) -> Callable:
+    """
+    Build a check_statuses callable for the SOAP API.
+    getRequestStatus takes one id, so each poll makes one call per pending id.
+    """
+    soap_to_status = {'REQUEST-SUCCESS': SUCCESS, 'REQUEST-FAILURE': FAILURE}
+
+    def check_statuses(request_ids: list) -> dict:
+        statuses = {}
+        for request_id in request_ids:
+            reply = soapclient.service.getRequestStatus(authstring, request_id)
+            statuses[request_id] = (soap_to_status.get(reply.status, reply.status), getattr(reply, 'message', '') or '')
+        return statuses
+
+    return check_statuses
+
+
+def soap_request_dropper(soapclient, authstring) -> Callable:
+    """Build an on_abandon callable that drops SOAP requests nobody waits for anymore."""
+    def drop(request_ids: list):
+        for request_id in request_ids:
+            soapclient.service.dropRequest(authstring, request_id)
+    return drop
@@ -1,7 +1,22 @@
 
 """
 Alarm-specific EDS REST API functions copied manually by Clayton on 1 December 2025 from eds.py.
+
+Quality decoding:
+    decode_stat() lists every active alarm flag of one stat value, for display.
+    primary_quality() and the bulk functions below only need the primary quality code,
+    i.e. the quality of the lowest active flag ('N' when no flag is set), which is what
+    the trend data paths store. They use two precomputed lookup tables over the 23 flag bits:
+    the low 12 bits (4096 entries) and, when those are all clear, the high 11 bits (2048 entries).
 """
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the bulk decoders fall back to pure-Python table lookups
+
 @lru_cache()
 def get_stat_alarm_definitions():
     """
@@ -59,4 +74,72 @@ def decode_stat(stat_value):
     for bitmask, (description, quality) in alarm_dict.items():
         if stat_value & bitmask:
             active_flags.append((bitmask, description, quality))
-    return active_flags
\ No newline at end of file
+    return active_flags
+
+LOW_STAT_BITS = 12
+HIGH_STAT_BITS = 11
+_LOW_MASK = (1 << LOW_STAT_BITS) - 1
+_HIGH_MASK = (1 << HIGH_STAT_BITS) - 1
+NO_FLAG_QUALITY = ord("N")
+
+@lru_cache()
+def get_stat_quality_tables() -> tuple[bytes, bytes]:
+    """
+    (low_table, high_table) of primary quality codes as ASCII bytes.
+
+    low_table[stat & 0xFFF] is the code of the lowest set bit among bits 0-11, or 0 if none is set.
+    high_table[(stat >> 12) & 0x7FF] is the code of the lowest set bit among bits 12-22, or 'N'.
+    """
+    definitions = get_stat_alarm_definitions()
+
+    def build(n_bits, shift, empty_code):
+        table = bytearray(1 << n_bits)
+        table[0] = empty_code
+        for index in range(1, 1 << n_bits):
+            lowest_bit = (index & -index) << shift
+            table[index] = ord(definitions[lowest_bit][1])
+        return bytes(table)
+
+    return build(LOW_STAT_BITS, 0, 0), build(HIGH_STAT_BITS, LOW_STAT_BITS, NO_FLAG_QUALITY)
+
+def primary_quality(stat_value: int) -> str:
+    """
+    Example:
+    >>> primary_quality(8192 + 2)
+    'B'
+    >>> primary_quality(0)
+    'N'
+    """
+    low_table, high_table = get_stat_quality_tables()
+    return chr(low_table[stat_value & _LOW_MASK] or high_table[(stat_value >> LOW_STAT_BITS) & _HIGH_MASK])
+
+def decode_quality_column(stats) -> bytearray:
+    """
+    Primary quality codes of a whole column of stat values, as a bytearray of ASCII codes
+    (the layout of TrendSeries.qualities). Uses NumPy when it is installed.
+    """
+    low_table, high_table = get_stat_quality_tables()
+    if np is not None:
+        stat_array = np.asarray(stats, dtype=np.int64)
+        low_codes = np.frombuffer(low_table, dtype=np.uint8)[stat_array & _LOW_MASK]
+        high_codes = np.frombuffer(high_table, dtype=np.uint8)[(stat_array >> LOW_STAT_BITS) & _HIGH_MASK]
+        return bytearray(np.where(low_codes != 0, low_codes, high_codes).astype(np.uint8).tobytes())
+    return bytearray(low_table[stat & _LOW_MASK] or high_table[(stat >> LOW_STAT_BITS) & _HIGH_MASK] for stat in stats)
+
+def good_mask(stats):
+    """True where the primary quality of a stat value is 'G' (see quality_mask())."""
+    return quality_mask(decode_quality_column(stats))
+
+@lru_cache(maxsize=16)
+def _quality_table(wanted: bytes) -> bytes:
+    """bytes.translate() table: 1 for the wanted quality codes, 0 for the others."""
+    return bytes(1 if code in wanted else 0 for code in range(256))
+
+def quality_mask(qualities, wanted: bytes = b"G"):
+    """
+    True where an ASCII quality column (e.g. TrendSeries.qualities) holds one of the wanted codes.
+    A NumPy bool array when NumPy is installed, otherwise bytes of 0/1.
+    """
+    if np is not None:
+        return np.isin(np.frombuffer(bytes(qualities), dtype=np.uint8), np.frombuffer(wanted, dtype=np.uint8))
+    return bytes(qualities).translate(_quality_table(wanted))
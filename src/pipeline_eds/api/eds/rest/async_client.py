@@ -0,0 +1,179 @@
+# src/pipeline_eds/api/eds/rest/async_client.py
+"""
+Asyncio sibling of EdsRestClient.
+
+The method surface mirrors EdsRestClient (login, points export, create/wait/get tabular),
+so that the tabular requests for several plants (Maxson, WWTP, WWTF) can be submitted,
+polled and fetched concurrently on one event loop, instead of one plant after another.
+
+The blocking `requests` calls are pushed to worker threads with asyncio.to_thread(),
+and the polling waits use asyncio.sleep(), so one plant sleeping in its poll loop
+does not hold up the others. No extra HTTP dependency is needed.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import asyncio
+import logging
+
+from pipeline_eds.time_manager import TimeManager
+from pipeline_eds.api.eds.request_waiter import PollPolicy, RequestTiming, RequestWaiter, rest_status_checker
+from pipeline_eds.api.eds.exceptions import EdsRequestError
+from pipeline_eds.api.eds.rest import schemas
+from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds.api.eds.rest.sharding import plan_shards, stitch_shards
+from pipeline_eds.api.eds.trend_cache import get_default_trend_cache, load_through_cache
+from pipeline_eds.api.eds.trend_result import TabularTrendResult
+
+logger = logging.getLogger(__name__)
+
+class AsyncEdsRestClient:
+
+    @staticmethod
+    async def login_to_session(api_url, username, password, timeout=10):
+        return await asyncio.to_thread(EdsRestClient.login_to_session, api_url, username, password, timeout)
+
+    @staticmethod
+    async def login_to_session_with_api_credentials(api_credentials):
+        return await asyncio.to_thread(EdsRestClient.login_to_session_with_api_credentials, api_credentials)
+
+    @staticmethod
+    async def logout(session):
+        api_url = str(session.base_url)
+        try:
+            await asyncio.to_thread(session.post, f'{api_url}/logout', verify=False)
+        except Exception as e:
+            logger.warning(f"Logout failed for {api_url}: {e}")
+
+    @staticmethod
+    async def get_points_export(session, filter_iess: list = None, zd: str = None) -> str:
+        return await asyncio.to_thread(EdsRestClient.get_points_export, session, filter_iess, zd)
+
+    @staticmethod
+    async def get_points_metadata(session, filter_iess=None, zd=None, chunk_size: int | None = None) -> dict:
+        return await asyncio.to_thread(EdsRestClient.get_points_metadata, session, filter_iess, zd, chunk_size)
+
+    @staticmethod
+    async def create_tabular_request(session, api_url: str, starttime: int, endtime: int, points: list, step_seconds: int = 300):
+        """
+        Submit a tabular trend request. Returns request id on success, or None if failed.
+        """
+        return await asyncio.to_thread(EdsRestClient.create_tabular_request, session, api_url, starttime, endtime, points, step_seconds)
+
+    @staticmethod
+    async def wait_for_request_execution_session(session, api_url, req_id, policy: PollPolicy | None = None, cancel_event=None) -> RequestTiming:
+        waiter = RequestWaiter(rest_status_checker(session, api_url), policy or EdsRestClient.POLL_POLICY, cancel_event=cancel_event)
+        return await waiter.async_wait(req_id)
+
+    @staticmethod
+    async def get_tabular_trend(session, req_id, point_list) -> TabularTrendResult:
+        results = TabularTrendResult(point_list)
+        async for idx, series in AsyncEdsRestClient.iter_tabular_trend(session, req_id, point_list):
+            results[idx].extend(series)
+        return results
+
+    @staticmethod
+    async def iter_tabular_trend(session, req_id, point_list):
+        """
+        Async generator twin of EdsRestClient.iter_tabular_trend().
+        Yields (point_index, TrendSeries) per decoded /trend/tabular response page.
+        """
+        api_url = str(session.base_url)
+        while True:
+            response = await asyncio.to_thread(session.get, f'{api_url}/trend/tabular?id={req_id}', verify=False)
+            page, is_last = EdsRestClient._decode_tabular_page(schemas.decode_tabular_page(response))
+            for pair in page:
+                yield pair
+            if is_last:
+                return
+
+    @staticmethod
+    async def load_historic_data(session, filter_iess, starttime, endtime, step_seconds, use_cache: bool = True):
+        """
+        Async version of EdsRestClient.load_historic_data(), including the trend cache.
+        Returns a TabularTrendResult (one columnar series per point), or [] if the request could not be created.
+        """
+        starttime = TimeManager(starttime).as_unix()
+        endtime = TimeManager(endtime).as_unix()
+
+        point_list = filter_iess
+        cache = get_default_trend_cache() if use_cache else None
+        if cache is None:
+            return await AsyncEdsRestClient._fetch_historic_data(session, point_list, starttime, endtime, step_seconds)
+
+        # The cache is SQLite on a worker thread; each missing interval is fetched back on this event loop
+        loop = asyncio.get_running_loop()
+        def fetch(points, gap_start, gap_end):
+            coroutine = AsyncEdsRestClient._fetch_historic_data(session, points, gap_start, gap_end, step_seconds)
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        results = await asyncio.to_thread(load_through_cache, cache, str(session.base_url), point_list, step_seconds,
+                                          EdsRestClient.TABULAR_FUNCTION, starttime, endtime, fetch)
+        if results is not None:
+            return results
+        return await AsyncEdsRestClient._fetch_historic_data(session, point_list, starttime, endtime, step_seconds)
+
+    @staticmethod
+    async def _fetch_historic_data(session, point_list, starttime: int, endtime: int, step_seconds: int):
+        # Long windows are split into sub-requests that the server can finish before it times out
+        if len(plan_shards(starttime, endtime, step_seconds, point_list, target_samples=EdsRestClient.TABULAR_TARGET_SAMPLES)) > 1:
+            return await AsyncEdsRestClient.load_historic_data_sharded(session, point_list, starttime, endtime, step_seconds)
+        return await AsyncEdsRestClient._fetch_tabular_request(session, point_list, starttime, endtime, step_seconds)
+
+    @staticmethod
+    async def load_historic_data_sharded(session, filter_iess, starttime: int, endtime: int, step_seconds: int,
+                                         target_samples: int | None = None,
+                                         max_points_per_shard: int | None = None,
+                                         max_workers: int | None = None,
+                                         max_attempts: int = 3) -> TabularTrendResult:
+        """
+        Async version of EdsRestClient.load_historic_data_sharded(): an asyncio.Semaphore keeps
+        at most max_workers shards in flight, and only the failed shards are retried.
+
+        Raises:
+            EdsRequestError: If some shards still fail after max_attempts.
+        """
+        point_list = list(filter_iess)
+        target_samples = target_samples or EdsRestClient.TABULAR_TARGET_SAMPLES
+        semaphore = asyncio.Semaphore(max_workers or EdsRestClient.TABULAR_MAX_CONCURRENT_SHARDS)
+
+        shards = plan_shards(starttime, endtime, step_seconds, point_list, target_samples=target_samples, max_points_per_shard=max_points_per_shard)
+        logger.info(f"Tabular request split into {len(shards)} shard(s) of ~{target_samples} samples")
+
+        async def run_shard(shard):
+            async with semaphore:
+                results = await AsyncEdsRestClient._fetch_tabular_request(session, list(shard.points), shard.starttime, shard.endtime, step_seconds)
+            if not isinstance(results, TabularTrendResult):
+                raise EdsRequestError(f"Could not create tabular request for shard {shard.index} ({shard.starttime}-{shard.endtime})")
+            return results
+
+        shard_results = {}
+        pending = shards
+        errors = {}
+        for attempt in range(1, max_attempts + 1):
+            outcomes = await asyncio.gather(*(run_shard(shard) for shard in pending), return_exceptions=True)
+            errors = {}
+            for shard, outcome in zip(pending, outcomes):
+                if isinstance(outcome, Exception):
+                    errors[shard.index] = outcome
+                else:
+                    shard_results[shard.index] = outcome
+            if not errors:
+                break
+            pending = [shard for shard in pending if shard.index in errors]
+            logger.warning(f"Attempt {attempt}/{max_attempts}: {len(pending)} shard(s) failed; retrying only those. First error: {next(iter(errors.values()))}")
+
+        if errors:
+            raise EdsRequestError(f"{len(errors)} of {len(shards)} tabular shard(s) failed after {max_attempts} attempts: {next(iter(errors.values()))}")
+
+        return stitch_shards(point_list, shards, shard_results)
+
+    @staticmethod
+    async def _fetch_tabular_request(session, point_list, starttime: int, endtime: int, step_seconds: int):
+        api_url = str(session.base_url)
+        request_id = await AsyncEdsRestClient.create_tabular_request(session, api_url, starttime, endtime, points=point_list, step_seconds=step_seconds)
+        if not request_id:
+            logger.warning(f"Could not create tabular request for points: {point_list}")
+            return []
+        logger.info(f"request_id = {request_id}")
+        await AsyncEdsRestClient.wait_for_request_execution_session(session, api_url, request_id)
+        return await AsyncEdsRestClient.get_tabular_trend(session, request_id, point_list)
+
@@ -4,15 +4,37 @@ import requests
 from datetime import datetime
 import re
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 from pipeline_eds.time_manager import TimeManager
 from pipeline_eds.decorators import log_function_call
-from pipeline_eds.api.eds.exceptions import EdsLoginException
+from pipeline_eds.api.eds.exceptions import EdsLoginException, EdsRequestError, EdsTabularTimeoutError
+from pipeline_eds.api.eds.request_waiter import PollPolicy, RequestTiming, RequestWaiter, rest_status_checker
+from pipeline_eds.api.eds.rest import schemas
+from pipeline_eds.api.eds.rest.session_pool import EdsSessionPool
+from pipeline_eds.api.eds.rest.sharding import DEFAULT_TARGET_SAMPLES, plan_shards, samples_after, stitch_shards
+from pipeline_eds.api.eds.trend_cache import get_default_trend_cache, load_through_cache
+from pipeline_eds.api.eds.trend_result import TabularTrendResult, TrendSeries
 
 logger = logging.getLogger(__name__)
 
+# Regex to find key='value' pairs in /points/export lines. Handles single-quoted values.
+_POINT_ATTRIBUTE_PATTERN = re.compile(r"(\w+)='([^']*)'")
+
 class EdsRestClient:
+    # Maximum characters of comma-joined IESS sent in one /points/export query string.
+    POINTS_EXPORT_QUERY_BUDGET = 1800
+    # Samples (points x steps) per tabular sub-request before load_historic_data() shards a request.
+    TABULAR_TARGET_SAMPLES = DEFAULT_TARGET_SAMPLES
+    # Sub-requests in flight at once, per session, for a sharded request.
+    TABULAR_MAX_CONCURRENT_SHARDS = 3
+    # Aggregation function of tabular requests; part of the trend cache key.
+    TABULAR_FUNCTION = "AVG"
+    # Backoff and deadline for waiting on /requests status.
+    POLL_POLICY = PollPolicy()
+    # IESS per /points/query body in get_points_live_bulk().
+    LIVE_QUERY_CHUNK_SIZE = 500
+
     def __init__(self):
         pass
 
@@ -44,20 +66,18 @@ class EdsRestClient:
                                 timeout=timeout
                                 )
         response.raise_for_status() # Raises an HTTPError for bad responses (4xx or 5xx)
-        json_response = response.json()
-        #print(f"response = {response}")
-        session.headers['Authorization'] = f"Bearer {json_response['sessionId']}"
+        login = schemas.decode_login(response)
+        session.headers['Authorization'] = f"Bearer {login.sessionId}"
         return session
 
     @staticmethod
-    def login_to_session_with_api_credentials(api_credentials):
+    def login_to_session_with_api_credentials(api_credentials, persist_token: bool = True):
+        """
+        Return an authenticated session from EdsSessionPool: reused within this process,
+        and with a still-valid token from the keyring, no /login round trip at all.
+        """
         try:
-            session = EdsRestClient.login_to_session(
-                api_url=api_credentials.get("url"),
-                username=api_credentials.get("username"),
-                password=api_credentials.get("password"),
-                timeout=10
-            )
+            session = EdsSessionPool.get_session_with_api_credentials(api_credentials, persist_token=persist_token)
             session.base_url = api_credentials.get("url")
             session.zd = api_credentials.get("zd")
             return session
@@ -116,42 +136,109 @@ class EdsRestClient:
             }],
             'order' : ['iess']
             }
-        response = session.post(f"{api_url}/points/query", json=query, verify=False).json()
+        response = schemas.decode_points_query(session.post(f"{api_url}/points/query", json=query, verify=False))
         
-        if not response or "points" not in response:
+        if not response.points:
             return None
 
-        points = response["points"]
+        points = response.points
         if len(points) != 1:
             raise ValueError(f"Expected 1 point for iess='{iess}', got {len(points)}")
 
         return points[0]
 
     @staticmethod
-    def get_tabular_trend(session, req_id, point_list):
+    def get_points_live_bulk(session, iess_list: list[str], chunk_size: int | None = None) -> dict:
+        """
+        Live values of many points, with one /points/query per chunk of IESS
+        (a single call for a typical plant point list).
+
+        Args:
+            session (requests.Session): The active session object.
+            iess_list (list[str]): IESS names; duplicates and blanks are ignored.
+            chunk_size (int): IESS per request. Defaults to LIVE_QUERY_CHUNK_SIZE.
+
+        Returns:
+            dict: {iess: point dict}, the same point dicts get_points_live() returns.
+                  Points EDS does not know are missing from the snapshot.
+        """
+        api_url = str(session.base_url)
+        chunk_size = chunk_size or EdsRestClient.LIVE_QUERY_CHUNK_SIZE
+        unique_iess = [iess for iess in dict.fromkeys(iess_list) if iess]
+
+        snapshot = {}
+        for chunk_start in range(0, len(unique_iess), chunk_size):
+            chunk = unique_iess[chunk_start:chunk_start + chunk_size]
+            query = {
+                'filters' : [{
+                'iess': chunk,
+                'tg' : [0, 1],
+                }],
+                'order' : ['iess']
+                }
+            response = schemas.decode_points_query(session.post(f"{api_url}/points/query", json=query, verify=False))
+            if not response.points:
+                logger.warning(f"No points in /points/query response for {len(chunk)} IESS")
+                continue
+            for point in response.points:
+                snapshot[point.get("iess")] = point
+
+        missing = len(unique_iess) - len(snapshot)
+        if missing:
+            logger.debug(f"{missing} of {len(unique_iess)} points not returned by /points/query")
+        return snapshot
+
+    @staticmethod
+    def get_tabular_trend(session, req_id, point_list) -> TabularTrendResult:
         # The raw from EdsRestClient.get_tabular_trend() is brought in like this: 
         #   sample = [1757763000, 48.93896783431371, 'G'] 
-        results = [[] for _ in range(len(point_list))]
+        # and is packed into per-point columns (timestamps, values, qualities), not per-sample dicts.
+        results = TabularTrendResult(point_list)
+        for idx, series in EdsRestClient.iter_tabular_trend(session, req_id, point_list):
+            results[idx].extend(series)
+        return results
+
+    @staticmethod
+    def iter_tabular_trend(session, req_id, point_list):
+        """
+        Streaming variant of get_tabular_trend().
+
+        Yields (point_index, TrendSeries) as soon as each /trend/tabular response page
+        is decoded, instead of holding everything until the 'LAST' chunk arrives.
+        A consumer (CSV writer, RJN upload, plot buffer) can start work on the first page,
+        and peak memory stays at about one page for multi-month exports.
+        """
+        api_url = str(session.base_url) 
         while True:
-            api_url = str(session.base_url) 
-            response = session.get(f'{api_url}/trend/tabular?id={req_id}', verify=False).json()
-            
-            for chunk in response:
-                if chunk['status'] == 'TIMEOUT':
-                    raise RuntimeError('timeout')
+            response = session.get(f'{api_url}/trend/tabular?id={req_id}', verify=False)
+            page, is_last = EdsRestClient._decode_tabular_page(schemas.decode_tabular_page(response))
+            yield from page
+            if is_last:
+                return
 
-                for idx, samples in enumerate(chunk['items']):
-                    for sample in samples:
-                        #print(f"sample = {sample}")
-                        structured = {
-                            "ts": sample[0],          # Timestamp
-                            "value": sample[1],       # Measurement value
-                            "quality": sample[2],       # Optional units or label
-                        }
-                        results[idx].append(structured)
+    @staticmethod
+    def _decode_tabular_page(page) -> tuple[list[tuple[int, TrendSeries]], bool]:
+        """
+        Turn one decoded /trend/tabular page (list of schemas.TabularChunk) into (point_index, TrendSeries) pairs.
+        Shared by EdsRestClient and AsyncEdsRestClient.
+
+        Returns:
+            tuple: (pairs, is_last), where is_last is True once the 'LAST' chunk has been seen.
+        """
+        pairs = []
+        for chunk in page:
+            if chunk.status == 'TIMEOUT':
+                raise EdsTabularTimeoutError('EDS server timed out on the tabular trend request. Try a shorter window or fewer points.')
+
+            for idx, samples in enumerate(chunk.items):
+                if samples:
+                    series = TrendSeries()
+                    series.extend_samples(samples)
+                    pairs.append((idx, series))
 
-                if chunk['status'] == 'LAST':
-                    return results
+            if chunk.status == 'LAST':
+                return pairs, True
+        return pairs, False
 
 
     @staticmethod
@@ -161,7 +248,7 @@ class EdsRestClient:
 
         Args:
             session (requests.Session): The active session object.
-            filter_iess (list): A list of IESS strings to filter by. Currently only allows one input.
+            filter_iess (list): A list of IESS strings to filter by, sent comma-joined in one query.
             zd (str): An optional zone directory to filter by.
         
         Returns:
@@ -211,46 +298,96 @@ class EdsRestClient:
 
 
     @staticmethod
-    def get_points_metadata(session, filter_iess=None, zd=None):
+    def parse_points_export(raw_export_str: str) -> dict:
+        """
+        Parse the text of a /points/export response into an IESS-keyed index.
+
+        Every line that starts with 'POINT ' carries key='value' pairs, e.g.
+            POINT IESS='M100FI.UNIT0@NET0' UN='MGD' DESC='INFLUENT FLOW' ...
+
+        Returns:
+            dict: {iess: {attribute: value}} for every POINT line in the text.
+        """
+        index = {}
+        for line in raw_export_str.strip().splitlines():
+            line = line.strip()
+            # We are only interested in lines that start with 'POINT'
+            if not line.startswith('POINT '):
+                continue
+            attributes = dict(_POINT_ATTRIBUTE_PATTERN.findall(line))
+            iess = attributes.get('IESS')
+            if iess and iess not in index:
+                index[iess] = attributes
+        return index
+
+    @staticmethod
+    def chunk_iess_for_export(filter_iess: list, chunk_size: int | None = None) -> list[list[str]]:
+        """
+        Split an IESS list into chunks for /points/export.
+
+        If chunk_size is not given, chunks are sized automatically so that the
+        comma-joined iess filter of each request stays under POINTS_EXPORT_QUERY_BUDGET
+        characters. Short lists go out in a single request.
+        """
+        if chunk_size is not None:
+            chunk_size = max(1, int(chunk_size))
+            return [filter_iess[i:i + chunk_size] for i in range(0, len(filter_iess), chunk_size)]
+
+        chunks = []
+        current = []
+        current_length = 0
+        for iess in filter_iess:
+            # +1 for the comma delimiter; URL-encoding of '@' and ',' costs a little more, so +3
+            item_length = len(iess) + 3
+            if current and current_length + item_length > EdsRestClient.POINTS_EXPORT_QUERY_BUDGET:
+                chunks.append(current)
+                current = []
+                current_length = 0
+            current.append(iess)
+            current_length += item_length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def get_points_metadata(session, filter_iess=None, zd=None, chunk_size: int | None = None):
         """
         Retrieves and parses point metadata into a dictionary.
 
+        The whole IESS list is requested in one /points/export call (or a few, for
+        long lists), and each response is parsed once into an IESS-keyed index.
+        Any requested point that a batched response did not include is looked up
+        on its own, so servers that only honour a single iess filter still work.
+
         Args:
             session (requests.Session): The active session object.
             filter_iess (list): A list of IESS strings to filter by.
             zd (str): An optional zone directory to filter by.
+            chunk_size (int): Optional number of IESS per request. Chosen automatically if None.
         
         Returns:
             dict: A dictionary where keys are IESS strings and values are
                   dictionaries of the point's attributes.
                   Returns an empty dictionary on failure.
         """
-        raw_export_str = EdsRestClient.get_points_export(session, filter_iess, zd)
-        
-        all_points_metadata = {}
-        
-        # Regex to find key='value' pairs. Handles single-quoted values.
-        # This pattern is more robust than a simple split.
-        pattern = re.compile(r"(\w+)='([^']*)'")
-        for iess_value in filter_iess:
-            # We must make a separate API call for each IESS.
-            # Use the existing get_points_export function, but pass a single
-            # IESS value in a list so the URL formatting remains consistent.
-            raw_export_str = EdsRestClient.get_points_export(session, filter_iess=[iess_value], zd=zd)
+        if not filter_iess:
+            return EdsRestClient.parse_points_export(EdsRestClient.get_points_export(session, None, zd))
 
-            
-            for line in raw_export_str.strip().splitlines():
-                # We are only interested in lines that start with 'POINT'
-                if line.strip().startswith('POINT '):
-                    # Extract key-value pairs using the regex
-                    attributes = dict(pattern.findall(line))
-                    
-                    # Double-check that the returned IESS matches the requested one
-                    if attributes.get('IESS') == iess_value:
-                        all_points_metadata[iess_value] = attributes
-                        break # We found our point, so we can stop parsing this response
-        
-        return all_points_metadata
+        if isinstance(filter_iess, str):
+            filter_iess = [filter_iess]
+        wanted = list(dict.fromkeys(filter_iess)) # de-duplicate, keep order
+
+        index = {}
+        for chunk in EdsRestClient.chunk_iess_for_export(wanted, chunk_size):
+            index.update(EdsRestClient.parse_points_export(EdsRestClient.get_points_export(session, filter_iess=chunk, zd=zd)))
+
+        missing = [iess for iess in wanted if iess not in index]
+        if missing and len(wanted) > 1:
+            logger.debug(f"Batched points export did not return {len(missing)} point(s); looking them up individually: {missing}")
+            for iess in missing:
+                index.update(EdsRestClient.parse_points_export(EdsRestClient.get_points_export(session, filter_iess=[iess], zd=zd)))
+
+        return {iess: index[iess] for iess in wanted if iess in index}
     # --- Example of how to use it ---
     # (Assuming you have a 'session' object and a list of iess values)
     #
@@ -293,7 +430,7 @@ class EdsRestClient:
                 {
                     "pointId": {"iess": p},
                     "shadePriority": "DEFAULT",
-                    "function": "AVG",
+                    "function": EdsRestClient.TABULAR_FUNCTION,
                 }
                 for p in points
             ],
@@ -310,45 +447,43 @@ class EdsRestClient:
             return None
 
         try:
-            payload = res.json()
-        except Exception:
-            logger.error(f"Non-JSON response: {res.text}")
+            payload = schemas.decode_tabular_request_created(res)
+        except EdsRequestError as e:
+            logger.error(f"{e}: {res.text}")
             return None
 
-        req_id = payload.get("id")
+        req_id = payload.id
         if not req_id:
-            logger.error(f"No request id in response: {payload}")
+            logger.error(f"No request id in response: {res.text}")
             return None
 
         return req_id
 
     @staticmethod
-    def wait_for_request_execution_session(session, api_url, req_id):
-        st = time.time()
-        while True:
-            time.sleep(1)
-            res = session.get(f'{api_url}/requests?id={req_id}', verify=False).json()
-            status = res[str(req_id)]
-            if status['status'] == 'FAILURE':
-                raise RuntimeError('request [{}] failed: {}'.format(req_id, status['message']))
-            elif status['status'] == 'SUCCESS':
-                break
-            elif status['status'] == 'EXECUTING':
-                print('request [{}] progress: {:.2f}\n'.format(req_id, time.time() - st))
-
-        print('request [{}] executed in: {:.3f} s\n'.format(req_id, time.time() - st))
+    def wait_for_request_execution_session(session, api_url, req_id, policy: PollPolicy | None = None, cancel_event=None) -> RequestTiming:
+        """
+        Wait until a submitted request has executed, polling /requests with adaptive backoff.
 
+        Raises:
+            EdsRequestError: The request failed on the server.
+            EdsRequestDeadlineError: It was still executing at the policy deadline.
+            EdsRequestCancelledError: cancel_event was set.
+        """
+        waiter = RequestWaiter(rest_status_checker(session, api_url), policy or EdsRestClient.POLL_POLICY, cancel_event=cancel_event)
+        return waiter.wait(req_id)
 
     @log_function_call(level=logging.DEBUG)    
     @staticmethod
-    def load_historic_data(session, filter_iess, starttime, endtime, step_seconds):    
+    def load_historic_data(session, filter_iess, starttime, endtime, step_seconds, use_cache: bool = True):    
         """
         Retrieves historic time series data for a list of points (IESS)
         within a specified time range and step interval using the EDS API.
 
         This function converts the start and end times to Unix timestamps,
-        creates a tabular trend request, waits for its execution, and
-        then retrieves the results.
+        checks the local trend cache, and requests only the intervals that
+        the cache does not hold yet (creating a tabular trend request, waiting
+        for its execution and retrieving the results). The whole window is
+        then read back from the cache.
 
         Args:
             session (EdsSession): The authenticated EDS API session object.
@@ -359,10 +494,11 @@ class EdsRestClient:
             endtime (str or int): The end time for the data request.
                                 Can be a datetime string or a Unix timestamp.
             step_seconds (int): The aggregation interval (step size) in seconds.
+            use_cache (bool): Set False to always go to EDS for the full window.
 
         Returns:
-            list[dict] or list: A list of dictionaries containing the historic
-                                data results (tabular trend), or an empty list
+            TabularTrendResult or list: One columnar TrendSeries per point
+                                (timestamps, values, qualities), or an empty list
                                 if the request creation failed.
         """
 
@@ -371,8 +507,21 @@ class EdsRestClient:
         logger.info(f"starttime = {starttime}")
         logger.info(f"endtime = {endtime}")
 
-
         point_list = filter_iess
+        cache = get_default_trend_cache() if use_cache else None
+        if cache is not None:
+            results = load_through_cache(cache, str(session.base_url), point_list, step_seconds, EdsRestClient.TABULAR_FUNCTION, starttime, endtime,
+                                         lambda points, start, end: EdsRestClient._fetch_historic_data(session, points, start, end, step_seconds))
+            if results is not None:
+                return results
+        return EdsRestClient._fetch_historic_data(session, point_list, starttime, endtime, step_seconds)
+
+    @staticmethod
+    def _fetch_historic_data(session, point_list, starttime: int, endtime: int, step_seconds: int):
+        # Long windows are split into sub-requests that the server can finish before it times out
+        if len(plan_shards(starttime, endtime, step_seconds, point_list, target_samples=EdsRestClient.TABULAR_TARGET_SAMPLES)) > 1:
+            return EdsRestClient.load_historic_data_sharded(session, point_list, starttime, endtime, step_seconds)
+
         api_url = str(session.base_url) 
         request_id = EdsRestClient.create_tabular_request(session, api_url, starttime, endtime, points=point_list, step_seconds=step_seconds)
         if not request_id:
@@ -382,3 +531,135 @@ class EdsRestClient:
         results = EdsRestClient.get_tabular_trend(session, request_id, point_list)
         logger.debug(f"len(results) = {len(results)}")
         return results
+
+    @staticmethod
+    def load_historic_data_sharded(session, filter_iess, starttime: int, endtime: int, step_seconds: int,
+                                   target_samples: int | None = None,
+                                   max_points_per_shard: int | None = None,
+                                   max_workers: int | None = None,
+                                   max_attempts: int = 3) -> TabularTrendResult:
+        """
+        Retrieve a large tabular trend as several smaller sub-requests.
+
+        The window (and optionally the point list) is split by plan_shards() into shards of
+        about target_samples samples. Shards run with at most max_workers in flight, only
+        the shards that failed are retried, and the results are stitched back together in
+        time order with the duplicate samples at shard edges removed.
+
+        Raises:
+            EdsRequestError: If some shards still fail after max_attempts.
+        """
+        starttime = TimeManager(starttime).as_unix()
+        endtime = TimeManager(endtime).as_unix()
+        point_list = list(filter_iess)
+        target_samples = target_samples or EdsRestClient.TABULAR_TARGET_SAMPLES
+        max_workers = max_workers or EdsRestClient.TABULAR_MAX_CONCURRENT_SHARDS
+
+        shards = plan_shards(starttime, endtime, step_seconds, point_list, target_samples=target_samples, max_points_per_shard=max_points_per_shard)
+        logger.info(f"Tabular request split into {len(shards)} shard(s) of ~{target_samples} samples")
+
+        shard_results = {}
+        pending = shards
+        errors = {}
+        for attempt in range(1, max_attempts + 1):
+            errors = {}
+            for batch_start in range(0, len(pending), max_workers):
+                batch_results, batch_errors = EdsRestClient._run_tabular_shard_batch(session, pending[batch_start:batch_start + max_workers], step_seconds)
+                shard_results.update(batch_results)
+                errors.update(batch_errors)
+            if not errors:
+                break
+            pending = [shard for shard in pending if shard.index in errors]
+            logger.warning(f"Attempt {attempt}/{max_attempts}: {len(pending)} shard(s) failed; retrying only those. First error: {next(iter(errors.values()))}")
+
+        if errors:
+            raise EdsRequestError(f"{len(errors)} of {len(shards)} tabular shard(s) failed after {max_attempts} attempts: {next(iter(errors.values()))}")
+
+        return stitch_shards(point_list, shards, shard_results)
+
+    @staticmethod
+    def _run_tabular_shard_batch(session, batch, step_seconds) -> tuple[dict, dict]:
+        """
+        Submit a batch of shards, wait for all of them with one /requests poll per round,
+        then download the finished ones in parallel.
+
+        Returns:
+            tuple: ({shard_index: TabularTrendResult}, {shard_index: exception})
+        """
+        api_url = str(session.base_url)
+        request_ids = {}
+        errors = {}
+        for shard in batch:
+            request_id = EdsRestClient.create_tabular_request(session, api_url, shard.starttime, shard.endtime, points=list(shard.points), step_seconds=step_seconds)
+            if request_id:
+                request_ids[shard.index] = request_id
+            else:
+                errors[shard.index] = EdsRequestError(f"Could not create tabular request for shard {shard.index} ({shard.starttime}-{shard.endtime})")
+
+        try:
+            timings = RequestWaiter(rest_status_checker(session, api_url), EdsRestClient.POLL_POLICY).wait_all(list(request_ids.values()))
+        except EdsRequestError as e:
+            errors.update({index: e for index in request_ids})
+            return {}, errors
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(request_ids))) as executor:
+            futures = {}
+            for shard in batch:
+                request_id = request_ids.get(shard.index)
+                if request_id is None:
+                    continue
+                if not timings[request_id].succeeded:
+                    errors[shard.index] = EdsRequestError('request [{}] failed: {}'.format(request_id, timings[request_id].message))
+                    continue
+                futures[shard.index] = executor.submit(EdsRestClient.get_tabular_trend, session, request_id, list(shard.points))
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors[index] = e
+        return results, errors
+
+    @staticmethod
+    def stream_historic_data(session, filter_iess, starttime, endtime, step_seconds, max_attempts: int = 3):
+        """
+        Like load_historic_data(), but yields (point_index, TrendSeries) page by page.
+
+        Long windows are split by plan_shards() like load_historic_data_sharded(), and the shards
+        run one after another in time order, so a multi-month export never becomes one giant
+        server job and memory stays at about one page. A failed shard is requested again; samples
+        already yielded (and shard-edge duplicates) are not yielded twice.
+        Always goes to EDS: the trend cache would hold the whole window in memory first.
+
+        Raises:
+            EdsRequestError: If a shard still fails after max_attempts.
+        """
+        starttime = TimeManager(starttime).as_unix()
+        endtime = TimeManager(endtime).as_unix() 
+
+        point_list = list(filter_iess)
+        shards = plan_shards(starttime, endtime, step_seconds, point_list, target_samples=EdsRestClient.TABULAR_TARGET_SAMPLES)
+        last_ts = {}  # {point index: newest timestamp yielded}
+        for shard in sorted(shards, key=lambda s: (s.starttime, s.point_offset)):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    for idx, series in EdsRestClient._stream_tabular_request(session, list(shard.points), shard.starttime, shard.endtime, step_seconds):
+                        idx += shard.point_offset
+                        series = samples_after(series, last_ts.get(idx))
+                        if len(series):
+                            last_ts[idx] = series.timestamps[-1]
+                            yield idx, series
+                    break
+                except EdsRequestError as e:
+                    if attempt == max_attempts:
+                        raise
+                    logger.warning(f"Attempt {attempt}/{max_attempts}: shard {shard.index} ({shard.starttime}-{shard.endtime}) failed; retrying. {e}")
+
+    @staticmethod
+    def _stream_tabular_request(session, point_list, starttime: int, endtime: int, step_seconds: int):
+        api_url = str(session.base_url) 
+        request_id = EdsRestClient.create_tabular_request(session, api_url, starttime, endtime, points=point_list, step_seconds=step_seconds)
+        if not request_id:
+            raise EdsRequestError(f"Could not create tabular request for points: {point_list}")
+        EdsRestClient.wait_for_request_execution_session(session, api_url, request_id)
+        yield from EdsRestClient.iter_tabular_trend(session, request_id, point_list)
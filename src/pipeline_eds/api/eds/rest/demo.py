@@ -63,9 +63,10 @@ def demo_eds_print_point_live_alt():
     logging.debug(f"queries_dictlist_filtered_by_session_key = {queries_dictlist_filtered_by_session_key}\n")
     logging.debug(f"queries_defaultdictlist_grouped_by_session_key = {queries_defaultdictlist_grouped_by_session_key}\n")
 
+    snapshot = EdsRestClient.get_points_live_bulk(session, [row["iess"] for row in queries_dictlist_filtered_by_session_key])
     for row in queries_dictlist_filtered_by_session_key:
         iess = str(row["iess"]) if row["iess"] not in (None, '', '\t') else None
-        point_data = EdsRestClient.get_points_live(session,iess)
+        point_data = snapshot.get(iess)
         if point_data is None:
             raise ValueError(f"No live point returned for iess {iess}")
         else:
@@ -148,6 +149,7 @@ def demo_eds_webplot_point_live():
     from pipeline_eds.queriesmanager import QueriesManager, load_query_rows_from_csv_files, group_queries_by_col
     from workspaces.eds_to_rjn.code import collector
     from pipeline_eds.plotbuffer import PlotBuffer
+    from pipeline_eds.point_transforms import compile_transform
     from pipeline_eds import gui_starlette_msgspec_plotly
 
     # Initialize the workspace based on configs and defaults, in the demo initializtion script
@@ -176,10 +178,11 @@ def demo_eds_webplot_point_live():
                 #ts = helpers.iso(row.get("ts"))
                 av = row.get("value")
                 un = row.get("un")
-                # QUICK AND DIRTY CONVERSION FOR WWTF WETWELL LEVEL TO FEET 
-                if row.get('iess') == "M310LI.UNIT0@NET0":
-                    av = (av/12)+181.25 # convert inches of wetwell to feet above mean sealevel
-                    un = "FT"
+                # Conversions declared in the query CSV, e.g. the wet well level in inches to feet above mean sea level
+                transform = compile_transform(row)
+                if av is not None:
+                    av = transform.convert_value(av)
+                un = transform.unit or un
                 label = f"{row.get('shortdesc')} ({un})" 
                 if ts is not None and av is not None:
                     data_buffer.append(label, ts, av)
@@ -250,7 +253,7 @@ def demo_eds_print_tabular_trend():
         #
         for idx, iess in enumerate(point_list):
             print('\n{} samples:'.format(iess))
-            for s in results[idx]:
+            for s in results[idx].rows():
                 #print('{} {} {}'.format(datetime.fromtimestamp(s['ts']), round(s['value'],2), s['quality']))
                 print('{} {} {}'.format(datetime.fromtimestamp(s['ts']), s['value'], s['quality']))
         queries_manager.update_success(api_id=key) # not appropriate here in demo without successful transmission to 3rd party API
@@ -0,0 +1,72 @@
+# src/pipeline_eds/api/eds/rest/schemas.py
+"""
+msgspec schemas for EDS REST responses.
+
+Responses are decoded straight from response.content into these Structs with
+reusable decoders, instead of response.json() building generic dicts that are then
+walked by hand. For /trend/tabular pages this skips one dict per chunk and one list
+per sample, and every field is type-checked while decoding.
+
+A response that does not match its schema raises EdsRequestError naming the endpoint
+and the offending path (e.g. `$[0].items[3][17][0]`), instead of a KeyError further down.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import msgspec
+
+from pipeline_eds.api.eds.exceptions import EdsRequestError
+
+# Annotations are spelled with typing generics: msgspec evaluates them at runtime, also on Python 3.9.
+
+class LoginResponse(msgspec.Struct):
+    """POST /login"""
+    sessionId: str
+
+class RequestStatus(msgspec.Struct):
+    """One entry of GET /requests?id=.., keyed by the request id as a string."""
+    status: str
+    message: Optional[str] = None  # EDS may send null
+
+class TabularRequestCreated(msgspec.Struct):
+    """POST /trend/tabular"""
+    id: Union[int, str, None] = None
+
+# [ts, value, quality], e.g. [1757763000, 48.93896783431371, 'G']
+TabularSample = Tuple[int, Optional[float], Optional[str]]
+
+class TabularChunk(msgspec.Struct):
+    """One chunk of a GET /trend/tabular?id=.. page: status plus samples per requested point."""
+    status: str
+    items: List[List[TabularSample]] = []
+
+class PointsQueryResponse(msgspec.Struct):
+    """POST /points/query. Points stay plain dicts, since callers merge them into CSV rows."""
+    points: Optional[List[Dict[str, Any]]] = None
+
+_login_decoder = msgspec.json.Decoder(LoginResponse)
+_request_status_decoder = msgspec.json.Decoder(Dict[str, RequestStatus])
+_tabular_created_decoder = msgspec.json.Decoder(TabularRequestCreated)
+_tabular_page_decoder = msgspec.json.Decoder(List[TabularChunk])
+_points_query_decoder = msgspec.json.Decoder(PointsQueryResponse)
+
+def _decode(decoder, response, endpoint: str):
+    try:
+        return decoder.decode(response.content)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise EdsRequestError(f"Malformed response from EDS {endpoint}: {e}", status_code=getattr(response, "status_code", None)) from None
+
+def decode_login(response) -> LoginResponse:
+    return _decode(_login_decoder, response, "/login")
+
+def decode_request_statuses(response) -> dict[str, RequestStatus]:
+    return _decode(_request_status_decoder, response, "/requests")
+
+def decode_tabular_request_created(response) -> TabularRequestCreated:
+    return _decode(_tabular_created_decoder, response, "/trend/tabular (create)")
+
+def decode_tabular_page(response) -> list[TabularChunk]:
+    return _decode(_tabular_page_decoder, response, "/trend/tabular")
+
+def decode_points_query(response) -> PointsQueryResponse:
+    return _decode(_points_query_decoder, response, "/points/query")
@@ -0,0 +1,180 @@
+# src/pipeline_eds/api/eds/rest/session_pool.py
+"""
+Reusable, authenticated EDS REST sessions.
+
+A /login round trip over VPN is a large part of a short `eds trend` call. EdsSessionPool:
+    - keeps one requests.Session per (api_url, username, zd) for the life of the process,
+      with a pooled keep-alive HTTPAdapter, so later calls reuse both the login and the TCP connections
+    - optionally persists the bearer sessionId in the system keyring with a time-to-live,
+      so the next CLI call or daemon run within that window skips /login entirely
+    - re-logs in and replays the request once when EDS answers 401 (expired or revoked token)
+
+A token taken from the keyring is trusted until EDS rejects it; the 401 path makes that safe.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import json
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pipeline_eds.api.eds.rest import schemas
+
+try:
+    import keyring
+except ImportError:
+    keyring = None  # sessions are still pooled in-process, just not persisted between runs
+
+logger = logging.getLogger(__name__)
+
+class EdsSessionPool:
+    # How long a persisted sessionId is offered to later processes before a fresh /login.
+    TOKEN_TTL_SECONDS = 2 * 60 * 60
+    # Keep-alive connections per host; covers the parallel shard downloads of one session.
+    POOL_MAXSIZE = 8
+
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _keyring_service_name(api_url: str) -> str:
+        return f"pipeline-eds-session-{api_url}"
+
+    @classmethod
+    def get_session(cls, api_url: str, username: str, password: str, zd: str | None = None,
+                    persist_token: bool = True, timeout: int = 10) -> requests.Session:
+        """
+        Return an authenticated session for this EDS API and user, logging in only if needed.
+
+        Raises:
+            requests.exceptions.RequestException: If a needed /login fails.
+        """
+        api_url = api_url.rstrip("/")
+        # zd is read off the session by the client, so plants sharing a host and user each get their own
+        key = (api_url, username, zd)
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = cls._new_session(api_url, username, password, persist_token, timeout)
+                session.zd = zd
+                cls._sessions[key] = session
+        return session
+
+    @classmethod
+    def get_session_with_api_credentials(cls, api_credentials: dict, persist_token: bool = True) -> requests.Session:
+        return cls.get_session(
+            api_url=api_credentials.get("url"),
+            username=api_credentials.get("username"),
+            password=api_credentials.get("password"),
+            zd=api_credentials.get("zd"),
+            persist_token=persist_token,
+        )
+
+    @classmethod
+    def _new_session(cls, api_url, username, password, persist_token, timeout) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=cls.POOL_MAXSIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.base_url = api_url
+
+        token = cls._load_token(api_url, username) if persist_token else None
+        if token:
+            logger.info(f"Reusing stored EDS session for {username} at {api_url}")
+            session.headers['Authorization'] = f"Bearer {token}"
+        else:
+            cls._login(session, api_url, username, password, persist_token, timeout)
+
+        session.hooks['response'].append(cls._relogin_hook(session, api_url, username, password, persist_token, timeout))
+        return session
+
+    @classmethod
+    def _login(cls, session, api_url, username, password, persist_token, timeout):
+        data = {'username': username, 'password': password, 'type': 'script'}
+        response = session.post(f"{api_url}/login", json=data, verify=False, timeout=timeout)
+        response.raise_for_status() # Raises an HTTPError for bad responses (4xx or 5xx)
+        token = schemas.decode_login(response).sessionId
+        session.headers['Authorization'] = f"Bearer {token}"
+        if persist_token:
+            cls._store_token(api_url, username, token)
+
+    @classmethod
+    def _relogin_hook(cls, session, api_url, username, password, persist_token, timeout):
+        relogin_lock = threading.Lock()
+
+        def relogin_on_401(response, *args, **kwargs):
+            request = response.request
+            if response.status_code != 401 or request.url.endswith("/login") or getattr(request, "_eds_replayed", False):
+                return response
+            rejected = request.headers.get('Authorization')
+            with relogin_lock:
+                # Another thread may already have logged in again with the same stale token
+                if session.headers.get('Authorization') == rejected:
+                    logger.info(f"EDS session for {username} at {api_url} expired; logging in again")
+                    cls._login(session, api_url, username, password, persist_token, timeout)
+            replay = request.copy()
+            replay.headers['Authorization'] = session.headers['Authorization']
+            replay._eds_replayed = True
+            response.close()
+            return session.send(replay, **kwargs)
+
+        return relogin_on_401
+
+    @classmethod
+    def _load_token(cls, api_url: str, username: str) -> str | None:
+        if keyring is None:
+            return None
+        try:
+            stored = keyring.get_password(cls._keyring_service_name(api_url), username)
+        except Exception as e:
+            logger.debug(f"Keyring unavailable for EDS session tokens: {e}")
+            return None
+        if not stored:
+            return None
+        try:
+            entry = json.loads(stored)
+        except ValueError:
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry.get("token")
+
+    @classmethod
+    def _store_token(cls, api_url: str, username: str, token: str):
+        if keyring is None:
+            return
+        entry = {"token": token, "expires_at": time.time() + cls.TOKEN_TTL_SECONDS}
+        try:
+            keyring.set_password(cls._keyring_service_name(api_url), username, json.dumps(entry))
+        except Exception as e:
+            logger.debug(f"Could not persist EDS session token: {e}")
+
+    @classmethod
+    def forget_token(cls, api_url: str, username: str):
+        """Drop a persisted token, e.g. after changing the password."""
+        if keyring is None:
+            return
+        try:
+            keyring.delete_password(cls._keyring_service_name(api_url.rstrip("/")), username)
+        except Exception:
+            pass
+
+    @classmethod
+    def close_all(cls, logout: bool = False):
+        """
+        Close every pooled session. With logout=True the server sessions are ended too,
+        and their persisted tokens forgotten.
+        """
+        with cls._lock:
+            sessions = list(cls._sessions.items())
+            cls._sessions.clear()
+        for (api_url, username, _zd), session in sessions:
+            if logout:
+                try:
+                    session.post(f"{api_url}/logout", verify=False)
+                except Exception as e:
+                    logger.warning(f"Logout failed for {api_url}: {e}")
+                cls.forget_token(api_url, username)
+            session.close()
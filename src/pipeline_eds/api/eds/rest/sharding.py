@@ -0,0 +1,93 @@
+# src/pipeline_eds/api/eds/rest/sharding.py
+"""
+Planning and stitching for sharded tabular trend requests.
+
+Large windows run slowly on the EDS server and sometimes come back as 'TIMEOUT'.
+plan_shards() splits a request into sub-requests of about `target_samples` samples each
+(points x steps), along time and, optionally, along the point list.
+stitch_shards() puts the per-shard results back together in time order per point,
+dropping the duplicate sample that two neighbouring shards share at their common edge.
+
+Execution (bounded concurrency, retries of failed shards only) lives in
+EdsRestClient.load_historic_data_sharded() and AsyncEdsRestClient.load_historic_data_sharded();
+EdsRestClient.stream_historic_data() runs the shards one after another.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import dataclasses
+from bisect import bisect_right
+
+from pipeline_eds.api.eds.trend_result import TabularTrendResult, TrendSeries
+
+DEFAULT_TARGET_SAMPLES = 100_000
+
+@dataclasses.dataclass(frozen=True)
+class TrendShard:
+    """One sub-request: a time window for a contiguous slice of the point list."""
+    index: int
+    starttime: int
+    endtime: int
+    point_offset: int
+    points: tuple
+
+def plan_shards(starttime: int, endtime: int, step_seconds: int, points: list[str],
+                target_samples: int = DEFAULT_TARGET_SAMPLES,
+                max_points_per_shard: int | None = None) -> list[TrendShard]:
+    """
+    Split a tabular request into shards of roughly target_samples samples each.
+
+    Args:
+        starttime, endtime (int): Unix seconds of the whole window.
+        step_seconds (int): The aggregation interval of the request.
+        points (list[str]): The IESS list of the request.
+        target_samples (int): Samples (points x steps) to aim for per shard.
+        max_points_per_shard (int): Optionally also split long point lists.
+
+    Returns:
+        list[TrendShard]: Ordered by point slice, then by time. A small request is one shard.
+    """
+    points = list(points)
+    step_seconds = max(1, int(step_seconds))
+    points_per_shard = max(1, len(points) if not max_points_per_shard else min(len(points), int(max_points_per_shard)))
+
+    steps_per_shard = max(1, target_samples // points_per_shard)
+    span = steps_per_shard * step_seconds
+    time_windows = []
+    window_start = starttime
+    while True:
+        window_end = min(window_start + span, endtime)
+        time_windows.append((window_start, window_end))
+        if window_end >= endtime:
+            break
+        window_start = window_end
+
+    shards = []
+    for point_offset in range(0, max(1, len(points)), points_per_shard):
+        point_slice = tuple(points[point_offset:point_offset + points_per_shard])
+        for window_start, window_end in time_windows:
+            shards.append(TrendShard(len(shards), window_start, window_end, point_offset, point_slice))
+    return shards
+
+def stitch_shards(point_list: list[str], shards: list[TrendShard], shard_results: dict) -> TabularTrendResult:
+    """
+    Merge per-shard TabularTrendResults into one result for the whole point list.
+
+    Shards are applied in time order per point, and any sample at or before the
+    last timestamp already kept (the shared shard edge) is dropped.
+    """
+    merged = TabularTrendResult(point_list)
+    for shard in sorted(shards, key=lambda s: (s.point_offset, s.starttime)):
+        result = shard_results[shard.index]
+        for local_idx in range(len(shard.points)):
+            source = result[local_idx]
+            target = merged[shard.point_offset + local_idx]
+            target.extend(samples_after(source, target.timestamps[-1] if len(target) else None))
+    return merged
+
+def samples_after(series: TrendSeries, last_ts: int | None) -> TrendSeries:
+    """The samples of series later than last_ts (all of them if last_ts is None)."""
+    if last_ts is None or not len(series):
+        return series
+    first = bisect_right(series.timestamps, last_ts)
+    if first == 0:
+        return series
+    return TrendSeries(series.timestamps[first:], series.values[first:], series.qualities[first:])
@@ -3,14 +3,20 @@ from __future__ import annotations # Delays annotation evaluation, allowing mode
 import sys
 import logging
 import time
-from suds.client import Client as SudsClient # uses suds-py3
 
 from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds.api.eds.exceptions import EdsRequestError
+from pipeline_eds.api.eds.soap.client_factory import SoapClientFactory
+from pipeline_eds.api.eds.soap.point_resolver import SoapPointResolver
+from pipeline_eds.api.eds.request_waiter import PollPolicy, RequestWaiter, soap_request_dropper, soap_status_checker
 from pipeline_eds.security_and_config import SecurityAndConfig, get_base_url_config_with_prompt
 from pipeline_eds.variable_clarity import Redundancy
 from pipeline_eds.api.eds.config import get_configurable_default_plant_name, get_configurable_idcs_list
 
 class EdsSoapClient:
+    # Backoff and deadline for waiting on getRequestStatus.
+    POLL_POLICY = PollPolicy()
+
     def __init__(self):
         pass
 
@@ -29,7 +35,7 @@ class EdsSoapClient:
                 # We need a SOAP client instance to perform the logout
                 if self.soapclient is None:
                     # Initialize just to logout, if not done already
-                    self.soapclient = SudsClient(self.soap_url)
+                    self.soapclient = SoapClientFactory.get_client(self.soap_url)
                 self.soapclient.service.logout(self.authstring)
                 print(f"[{self.plant_name}] Logout successful.")
             except Exception as e:
@@ -107,8 +113,8 @@ class EdsSoapClient:
         # ———————————————————————— SOAP Session ————————————————————————
         try:
             print(f"[{plant_name}] Connecting → {eds_soap_api_url}")
-            soapclient = SudsClient(eds_soap_api_url)
-            authstring = soapclient.service.login(username, password)
+            # Parsed WSDL and authstring are reused across calls; both are kept by the factory
+            soapclient, authstring = SoapClientFactory.get_authenticated(eds_soap_api_url, username, password)
             if not authstring:
                 print(f"[{plant_name}] Login failed")
                 return None
@@ -118,15 +124,10 @@ class EdsSoapClient:
             idcs = [s.upper() for s in idcs]
             iess_list = [f"{idc}{iess_suffix}" for idc in idcs]
 
-            # Verify points exist (optional but smart)
-            filter_obj = soapclient.factory.create('PointFilter')
-            existing_iess = []
+            # Verify points exist (optional but smart): one combined getPoints call, cached per plant
+            existing_iess = SoapPointResolver.resolve(soapclient, authstring, eds_soap_api_url, iess_list)
             for iess in iess_list:
-                filter_obj.iessRe = iess
-                reply = soapclient.service.getPoints(authstring, filter_obj, None, None, None)
-                if reply.matchCount == 1:
-                    existing_iess.append(iess)
-                else:
+                if iess not in existing_iess:
                     print(f"[{plant_name}] Point not found: {iess}")
 
             if not existing_iess:
@@ -157,28 +158,28 @@ class EdsSoapClient:
             print(f"[{plant_name}] Tabular request submitted → {request_id}")
 
             # ———————————————————————— Poll until ready ————————————————————————
-            while True:
-                time.sleep(1)
-                status_resp = soapclient.service.getRequestStatus(authstring, request_id)
-                status = status_resp.status
-                if status == 'REQUEST-SUCCESS':
-                    tabular_data = soapclient.service.getTabular(authstring, request_id)
-                    print(f"[{plant_name}] Trend data ready → {len(tabular_data.rows)} rows")
-                    break
-                elif status == 'REQUEST-FAILURE':
-                    print(f"[{plant_name}] Request failed: {status_resp.message}")
-                    break
+            waiter = RequestWaiter(
+                soap_status_checker(soapclient, authstring),
+                cls.POLL_POLICY,
+                on_abandon=soap_request_dropper(soapclient, authstring),
+                label=f"[{plant_name}] ",
+            )
+            timing = waiter.wait_all([request_id])[request_id]
+            if timing.succeeded:
+                tabular_data = soapclient.service.getTabular(authstring, request_id)
+                print(f"[{plant_name}] Trend data ready → {len(tabular_data.rows)} rows")
+            else:
+                print(f"[{plant_name}] Request failed: {timing.message}")
+
+        except EdsRequestError as e:
+            print(f"[{plant_name}] {e}")
 
         except Exception as e:
             from pipeline_eds.api.eds.exceptions import EdsLoginException
             EdsLoginException.connection_error_message(e, url=eds_soap_api_url)
-
-        finally:
-            if authstring and soapclient:
-                try:
-                    soapclient.service.logout(authstring)
-                except:
-                    pass
+            # The session may be what failed: it is logged out and the next call logs in again.
+            # No logout otherwise: the authstring stays alive for the next call and is logged out at exit.
+            SoapClientFactory.invalidate(eds_soap_api_url, username)
 
         return tabular_data
 
@@ -229,7 +230,7 @@ class EdsSoapClient:
         try:
             # 1. Create the SOAP client
             print(f"Attempting to connect to WSDL at: {eds_soap_api_url}")
-            soapclient = SudsClient(eds_soap_api_url)
+            soapclient = SoapClientFactory.get_client(eds_soap_api_url)
             print("SOAP client created successfully.")
             # You can uncomment the line below to see all available services
             # print(soapclient)
@@ -428,7 +429,7 @@ class EdsSoapClient:
         try:
             # 1. Create the SOAP client
             print(f"Attempting to connect to WSDL at: {eds_soap_api_url}")
-            soapclient = SudsClient(eds_soap_api_url)
+            soapclient = SoapClientFactory.get_client(eds_soap_api_url)
             print("SOAP client created successfully.")
             # You can uncomment the line below to see all available services
             # print(soapclient)
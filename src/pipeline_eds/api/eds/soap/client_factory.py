@@ -0,0 +1,208 @@
+# src/pipeline_eds/api/eds/soap/client_factory.py
+"""
+One parsed suds client, and one logged-in authstring, per EDS SOAP endpoint.
+
+Building SudsClient(url) downloads and parses the Ovation WSDL and its schemas,
+which takes seconds over the VPN. SoapClientFactory:
+    - keeps the suds client of each WSDL URL for the life of the process
+    - gives suds an on-disk ObjectCache, so the parsed WSDL survives between processes.
+      The cache directory is keyed by a hash of the URL and a hash of the WSDL document,
+      so a changed WSDL on the server gets a fresh cache instead of stale bindings.
+      The document is only checked again after WSDL_RECHECK_SECONDS, and then with a
+      conditional GET (ETag / Last-Modified), so an unchanged WSDL is not downloaded again.
+    - keeps the authstring of each (url, username) and checks it with ping() before reuse
+      when it has been idle, logging in again only if the server dropped it.
+Sessions still open at process exit are logged out.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import atexit
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import threading
+import time
+
+import requests
+from suds.cache import ObjectCache
+from suds.client import Client as SudsClient # uses suds-py3
+
+logger = logging.getLogger(__name__)
+
+class SoapClientFactory:
+    WSDL_CACHE_DIR = Path.home() / ".pipeline-eds" / "wsdl_cache"
+    # Parsed WSDL kept this long even if the content hash could not be checked.
+    WSDL_CACHE_DAYS = 30
+    # The WSDL on the server is checked for changes at most this often.
+    WSDL_RECHECK_SECONDS = 24 * 3600
+    WSDL_VALIDATORS_FILE = "validators.json"
+    # An authstring idle for longer than this is pinged before reuse.
+    PING_AFTER_IDLE_SECONDS = 60
+
+    _clients = {}
+    _sessions = {}
+    _lock = threading.Lock()
+    _url_locks = {}  # {wsdl_url: lock held while that client is built}
+    _stale = []  # [(wsdl_url, authstring)] forgotten by invalidate() whose logout failed
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()[:16]
+
+    @classmethod
+    def wsdl_cache_location(cls, wsdl_url: str) -> Path:
+        """
+        Directory for the parsed WSDL of this URL: WSDL_CACHE_DIR/<url hash>/<content hash>.
+        Within WSDL_RECHECK_SECONDS of the last check the known directory is used without a
+        request. If the WSDL cannot be downloaded, the most recent cache of the URL is used.
+        """
+        url_dir = cls.WSDL_CACHE_DIR / cls._hash(wsdl_url.encode("utf-8"))
+        validators = cls._load_validators(url_dir)
+        known = url_dir / validators["location"] if validators.get("location") else None
+        if known is not None and known.is_dir() and time.time() - validators.get("checked_at", 0) < cls.WSDL_RECHECK_SECONDS:
+            return known
+
+        headers = {}
+        if known is not None and known.is_dir():
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            response = requests.get(wsdl_url, headers=headers, timeout=10, verify=False)
+            if response.status_code == 304 and headers:
+                location = known
+            else:
+                response.raise_for_status()
+                location = url_dir / cls._hash(response.content)
+                validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+            validators.update(location=location.name, checked_at=time.time())
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Could not fetch WSDL for its content hash ({e}); using the latest cache")
+            existing = sorted((p for p in url_dir.glob("*") if p.is_dir()), key=lambda p: p.stat().st_mtime) if url_dir.exists() else []
+            location = known if known is not None and known.is_dir() else (existing[-1] if existing else url_dir / "unverified")
+            validators = None
+
+        # Drop caches of older WSDL versions of this URL
+        if url_dir.exists():
+            for stale in url_dir.iterdir():
+                if stale != location and stale.is_dir():
+                    shutil.rmtree(stale, ignore_errors=True)
+        location.mkdir(parents=True, exist_ok=True)
+        if validators is not None:
+            cls._save_validators(url_dir, validators)
+        return location
+
+    @classmethod
+    def _load_validators(cls, url_dir: Path) -> dict:
+        try:
+            with open(url_dir / cls.WSDL_VALIDATORS_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _save_validators(cls, url_dir: Path, validators: dict):
+        path = url_dir / cls.WSDL_VALIDATORS_FILE
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(validators, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not save WSDL validators: {e}")
+
+    @classmethod
+    def get_client(cls, wsdl_url: str) -> SudsClient:
+        """
+        Return the process-wide suds client for a WSDL URL, parsing the WSDL at most once.
+        Only the thread building this URL's client waits on the WSDL check; the class lock is never held over the network.
+        """
+        with cls._lock:
+            client = cls._clients.get(wsdl_url)
+            url_lock = cls._url_locks.setdefault(wsdl_url, threading.Lock())
+        if client is not None:
+            return client
+        with url_lock:
+            with cls._lock:
+                client = cls._clients.get(wsdl_url)
+            if client is None:
+                started = time.perf_counter()
+                cache = ObjectCache(location=str(cls.wsdl_cache_location(wsdl_url)), days=cls.WSDL_CACHE_DAYS)
+                client = SudsClient(wsdl_url, cache=cache)
+                logger.info(f"SOAP client for {wsdl_url} ready in {time.perf_counter() - started:.2f} s")
+                with cls._lock:
+                    cls._clients[wsdl_url] = client
+        return client
+
+    @classmethod
+    def get_authenticated(cls, wsdl_url: str, username: str, password: str) -> tuple[SudsClient, str | None]:
+        """
+        Return (client, authstring) for this endpoint and user, logging in only when needed.
+        authstring is None if the login was refused.
+        """
+        client = cls.get_client(wsdl_url)
+        key = (wsdl_url, username)
+        with cls._lock:
+            session = cls._sessions.get(key)
+        if session is not None:
+            authstring, last_used = session
+            if time.monotonic() - last_used < cls.PING_AFTER_IDLE_SECONDS or cls._ping(client, authstring):
+                with cls._lock:
+                    cls._sessions[key] = (authstring, time.monotonic())
+                return client, authstring
+            logger.info(f"SOAP session for {username} at {wsdl_url} expired; logging in again")
+
+        authstring = client.service.login(username, password)
+        with cls._lock:
+            if authstring:
+                cls._sessions[key] = (authstring, time.monotonic())
+            else:
+                cls._sessions.pop(key, None)
+        return client, authstring
+
+    @staticmethod
+    def _ping(client, authstring) -> bool:
+        try:
+            client.service.ping(authstring)
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def invalidate(cls, wsdl_url: str, username: str):
+        """
+        Forget an authstring, e.g. after a call failed in a way that suggests the session is gone.
+        The session may still be alive on the server (a transient network error), so it is logged
+        out first; if that fails too, logout_all() tries again at exit.
+        """
+        with cls._lock:
+            session = cls._sessions.pop((wsdl_url, username), None)
+        if session is not None and not cls._logout(wsdl_url, session[0]):
+            with cls._lock:
+                cls._stale.append((wsdl_url, session[0]))
+
+    @classmethod
+    def _logout(cls, wsdl_url: str, authstring: str) -> bool:
+        client = cls._clients.get(wsdl_url)
+        if client is None:
+            return True
+        try:
+            client.service.logout(authstring)
+            return True
+        except Exception as e:
+            logger.debug(f"SOAP logout failed for {wsdl_url}: {e}")
+            return False
+
+    @classmethod
+    def logout_all(cls):
+        with cls._lock:
+            sessions = [(wsdl_url, authstring) for (wsdl_url, _), (authstring, _) in cls._sessions.items()] + cls._stale
+            cls._sessions.clear()
+            cls._stale = []
+        for wsdl_url, authstring in sessions:
+            cls._logout(wsdl_url, authstring)
+
+atexit.register(SoapClientFactory.logout_all)
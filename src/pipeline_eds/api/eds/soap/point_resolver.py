@@ -0,0 +1,119 @@
+# src/pipeline_eds/api/eds/soap/point_resolver.py
+"""
+Batched existence check of IESS names over the EDS SOAP API.
+
+Instead of one getPoints call per IESS, the names are combined into one anchored
+iessRe alternation, e.g. ^(M100FI\.UNIT0@NET0|FI8001\.UNIT0@NET0)$, split into a few
+chunks when the pattern would get long. The matched points are mapped back to the
+requested names. Names that resolved once are remembered per endpoint, so the next
+request for the same plant needs no getPoints call at all.
+
+If a reply does not carry point names (nothing to map back), that chunk falls back to
+the one-call-per-name check.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Characters with a meaning in the server's regular expressions. Escaped one by one,
+# so that no Python-only escapes (like re.escape's) end up in the pattern.
+_REGEX_METACHARACTERS = set(r".^$*+?()[]{}|\\")
+
+def escape_iess(iess: str) -> str:
+    return "".join("\\" + char if char in _REGEX_METACHARACTERS else char for char in iess)
+
+def build_iess_patterns(iess_list: list[str], max_pattern_length: int) -> list[tuple[str, list[str]]]:
+    """
+    Combine IESS names into anchored alternations of at most max_pattern_length characters.
+
+    Returns:
+        list[tuple]: (pattern, names in that pattern)
+    """
+    chunks = []
+    names = []
+    length = 4  # ^( and )$
+    for iess in iess_list:
+        escaped = escape_iess(iess)
+        added = len(escaped) + (1 if names else 0)
+        if names and length + added > max_pattern_length:
+            chunks.append(names)
+            names = []
+            length = 4
+            added = len(escaped)
+        names.append(iess)
+        length += added
+    if names:
+        chunks.append(names)
+    return [("^(" + "|".join(escape_iess(iess) for iess in chunk) + ")$", chunk) for chunk in chunks]
+
+def _point_iess(point) -> str | None:
+    """The IESS of a returned point, whether it sits on the point or on its pointId."""
+    iess = getattr(point, "iess", None)
+    if iess is None:
+        iess = getattr(getattr(point, "id", None) or getattr(point, "pointId", None), "iess", None)
+    return str(iess) if iess is not None else None
+
+
+class SoapPointResolver:
+    # Longest iessRe pattern sent in one getPoints call.
+    MAX_PATTERN_LENGTH = 2000
+
+    _known = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def resolve(cls, soapclient, authstring, endpoint: str, iess_list: list[str]) -> list[str]:
+        """
+        Return the IESS names of iess_list that exist on the server, in the requested order.
+
+        Args:
+            soapclient: A suds client of the endpoint.
+            authstring (str): A logged-in authstring.
+            endpoint (str): Cache key for the plant, e.g. the WSDL URL.
+            iess_list (list[str]): Requested names.
+        """
+        with cls._lock:
+            known = set(cls._known.get(endpoint, ()))
+        unresolved = [iess for iess in dict.fromkeys(iess_list) if iess not in known]
+
+        found = set()
+        for pattern, names in build_iess_patterns(unresolved, cls.MAX_PATTERN_LENGTH):
+            found |= cls._match_chunk(soapclient, authstring, pattern, names)
+        if unresolved:
+            logger.debug(f"Resolved {len(found)} of {len(unresolved)} uncached IESS at {endpoint}")
+
+        with cls._lock:
+            cls._known.setdefault(endpoint, set()).update(found)
+        existing = known | found
+        return [iess for iess in iess_list if iess in existing]
+
+    @staticmethod
+    def _match_chunk(soapclient, authstring, pattern: str, names: list[str]) -> set:
+        filter_obj = soapclient.factory.create('PointFilter')
+        filter_obj.iessRe = pattern
+        reply = soapclient.service.getPoints(authstring, filter_obj, None, None, None)
+        points = getattr(reply, "points", None) or []
+        returned = {_point_iess(point) for point in points}
+        returned.discard(None)
+
+        if returned or not getattr(reply, "matchCount", 0):
+            by_upper = {name.upper(): name for name in names}
+            return {by_upper[iess.upper()] for iess in returned if iess.upper() in by_upper}
+
+        # Matches were counted but not listed: check this chunk name by name
+        found = set()
+        for iess in names:
+            filter_obj.iessRe = iess
+            if soapclient.service.getPoints(authstring, filter_obj, None, None, None).matchCount == 1:
+                found.add(iess)
+        return found
+
+    @classmethod
+    def forget(cls, endpoint: str | None = None):
+        with cls._lock:
+            if endpoint is None:
+                cls._known.clear()
+            else:
+                cls._known.pop(endpoint, None)
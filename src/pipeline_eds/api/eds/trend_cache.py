@@ -0,0 +1,276 @@
+# src/pipeline_eds/api/eds/trend_cache.py
+"""
+On-disk historian cache for tabular trend data.
+
+Samples are kept in one SQLite file, keyed by (source, iess, step, function), where
+source is the EDS API base URL, so that equal IESS names on different plants do not mix.
+Next to the samples, the cache records which time intervals it holds completely
+("coverage"). Before going to EDS, load_historic_data() asks plan_fetches() which
+intervals are still missing per point, requests only those, stores them, and then
+reads the whole window back from disk.
+
+Rules that keep the cache honest:
+    - Windows are aligned to the step grid, so samples from different calls line up.
+    - Coverage never extends past the last completed step (now - step). The most recent,
+      still-changing bucket is always fetched again and overwritten.
+    - Coverage stops before the first grid step that came back missing, without a value
+      (NaN) or with quality 'N'. Late historian data or a comms outage is asked for again
+      on the next call instead of being frozen in the cache.
+
+Default location: ~/.pipeline-eds/trend_cache.sqlite, next to config.json.
+Set PIPELINE_EDS_TREND_CACHE to another file path, or to "off" to disable the cache.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from array import array
+import contextlib
+import dataclasses
+from itertools import repeat
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from pipeline_eds.api.eds.trend_result import NAN, NO_DATA_QUALITY, TabularTrendResult, TrendSeries
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TREND_CACHE_PATH = Path.home() / ".pipeline-eds" / "trend_cache.sqlite"
+TREND_CACHE_ENV_VAR = "PIPELINE_EDS_TREND_CACHE"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    source TEXT NOT NULL,
+    iess TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    function TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL,
+    quality INTEGER NOT NULL,
+    PRIMARY KEY (source, iess, step, function, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    source TEXT NOT NULL,
+    iess TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    function TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    PRIMARY KEY (source, iess, step, function, start_ts)
+) WITHOUT ROWID;
+"""
+
+@dataclasses.dataclass(frozen=True)
+class TrendGap:
+    """
+    A missing interval shared by one or more points.
+    first_ts and last_ts are inclusive grid timestamps; request_window() is what to ask EDS for.
+    """
+    first_ts: int
+    last_ts: int
+    step: int
+    points: tuple
+
+    def request_window(self) -> tuple[int, int]:
+        # One extra step, so the last grid sample is included whether EDS treats 'till' as inclusive or not
+        return self.first_ts, self.last_ts + self.step
+
+
+class TrendCache:
+    """SQLite-backed store of trend samples plus the intervals it holds completely."""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path) if path is not None else DEFAULT_TREND_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Serialises writers within this process; SQLite's busy timeout covers other processes.
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the cache safe to use from worker threads.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def align_window(starttime: int, endtime: int, step_seconds: int) -> tuple[int, int]:
+        """Widen a window outwards to the step grid."""
+        step = max(1, int(step_seconds))
+        first = (int(starttime) // step) * step
+        last = -((-int(endtime)) // step) * step
+        return first, last
+
+    def coverage(self, source: str, iess: str, step_seconds: int, function: str) -> list[tuple[int, int]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT start_ts, end_ts FROM coverage WHERE source=? AND iess=? AND step=? AND function=? ORDER BY start_ts",
+                (source, iess, int(step_seconds), function),
+            ).fetchall()
+        return [(start_ts, end_ts) for start_ts, end_ts in rows]
+
+    def missing_intervals(self, source: str, iess: str, step_seconds: int, function: str, starttime: int, endtime: int) -> list[tuple[int, int]]:
+        """Return the inclusive grid intervals in [starttime, endtime] that the cache does not hold."""
+        step = max(1, int(step_seconds))
+        first, last = self.align_window(starttime, endtime, step)
+        gaps = []
+        cursor = first
+        for start_ts, end_ts in self.coverage(source, iess, step, function):
+            if end_ts < cursor:
+                continue
+            if start_ts > last:
+                break
+            if start_ts > cursor:
+                gaps.append((cursor, start_ts - step))
+            cursor = max(cursor, end_ts + step)
+        if cursor <= last:
+            gaps.append((cursor, last))
+        return gaps
+
+    def plan_fetches(self, source: str, point_list: list[str], step_seconds: int, function: str, starttime: int, endtime: int) -> list[TrendGap]:
+        """
+        Work out what to request from EDS. Points with identical gaps share one TrendGap,
+        so a mostly-warm cache turns into a few small requests rather than one per point.
+        """
+        points_by_gap = {}
+        for iess in dict.fromkeys(point_list):
+            for gap in self.missing_intervals(source, iess, step_seconds, function, starttime, endtime):
+                points_by_gap.setdefault(gap, []).append(iess)
+        return [TrendGap(first_ts, last_ts, int(step_seconds), tuple(points)) for (first_ts, last_ts), points in sorted(points_by_gap.items())]
+
+    def store(self, source: str, gap: TrendGap, function: str, result: TabularTrendResult, now: float | None = None):
+        """
+        Save the samples EDS returned for a gap and mark the gap as covered, up to the last completed step
+        and, per point, up to the last step before its first missing or empty sample.
+        result must hold one series per point of gap.points, in that order.
+        """
+        step = gap.step
+        now = time.time() if now is None else now
+        settled_until = (int(now) // step) * step - step
+        covered_until = min(gap.last_ts, settled_until)
+
+        with self._write_lock, self._connect() as conn:
+            for iess, series in zip(gap.points, result):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO samples (source, iess, step, function, ts, value, quality) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    zip(repeat(source), repeat(iess), repeat(step), repeat(function),
+                        series.timestamps, series.values, series.qualities),
+                )
+                point_covered_until = self._complete_until(series, gap.first_ts, covered_until, step)
+                if point_covered_until >= gap.first_ts:
+                    self._add_coverage(conn, source, iess, step, function, gap.first_ts, point_covered_until)
+
+    @staticmethod
+    def _complete_until(series, first_ts: int, last_ts: int, step: int) -> int:
+        """The last grid timestamp up to which series holds a valued sample at every step from first_ts."""
+        expected = first_ts
+        for ts, value, quality in zip(series.timestamps, series.values, series.qualities):
+            if ts < expected:
+                continue
+            if ts != expected or value != value or quality == NO_DATA_QUALITY or expected > last_ts:
+                break
+            expected += step
+        return min(expected - step, last_ts)
+
+    @staticmethod
+    def _add_coverage(conn, source, iess, step, function, start_ts, end_ts):
+        # Merge with every interval that overlaps or touches (within one step) the new one
+        key = (source, iess, step, function)
+        touching = (*key, end_ts + step, start_ts - step)
+        rows = conn.execute(
+            "SELECT start_ts, end_ts FROM coverage WHERE source=? AND iess=? AND step=? AND function=? AND start_ts<=? AND end_ts>=?",
+            touching,
+        ).fetchall()
+        conn.execute(
+            "DELETE FROM coverage WHERE source=? AND iess=? AND step=? AND function=? AND start_ts<=? AND end_ts>=?",
+            touching,
+        )
+        for row_start, row_end in rows:
+            start_ts = min(start_ts, row_start)
+            end_ts = max(end_ts, row_end)
+        conn.execute("INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?)", (*key, start_ts, end_ts))
+
+    def read(self, source: str, point_list: list[str], step_seconds: int, function: str, starttime: int, endtime: int) -> TabularTrendResult:
+        """Read the cached samples with starttime <= ts <= endtime, one series per point."""
+        result = TabularTrendResult(point_list, series=[])
+        with self._connect() as conn:
+            for iess in point_list:
+                rows = conn.execute(
+                    "SELECT ts, value, quality FROM samples WHERE source=? AND iess=? AND step=? AND function=? AND ts>=? AND ts<=? ORDER BY ts",
+                    (source, iess, int(step_seconds), function, int(starttime), int(endtime)),
+                ).fetchall()
+                timestamps, values, qualities = zip(*rows) if rows else ((), (), ())
+                result.series.append(TrendSeries(
+                    array("q", timestamps),
+                    array("d", (NAN if value is None else value for value in values)),
+                    bytearray(qualities),
+                ))
+        return result
+
+    def clear(self, source: str | None = None):
+        with self._write_lock, self._connect() as conn:
+            if source is None:
+                conn.execute("DELETE FROM samples")
+                conn.execute("DELETE FROM coverage")
+            else:
+                conn.execute("DELETE FROM samples WHERE source=?", (source,))
+                conn.execute("DELETE FROM coverage WHERE source=?", (source,))
+
+
+def load_through_cache(cache: TrendCache, source: str, point_list: list[str], step_seconds: int, function: str,
+                       starttime: int, endtime: int, fetch):
+    """
+    Fetch only the missing intervals into the cache, then read the window from it.
+    fetch(points, starttime, endtime) loads one interval from EDS, e.g. EdsRestClient._fetch_historic_data.
+
+    Returns:
+        TabularTrendResult, [] if fetch returned no TabularTrendResult (request not created),
+        or None if the cache itself failed (the caller then falls back to a plain EDS request).
+    """
+    try:
+        gaps = cache.plan_fetches(source, point_list, step_seconds, function, starttime, endtime)
+        logger.info(f"[{source}] Trend cache: {len(gaps)} missing interval(s) to fetch from EDS")
+        for gap in gaps:
+            gap_start, gap_end = gap.request_window()
+            results = fetch(list(gap.points), gap_start, gap_end)
+            if not isinstance(results, TabularTrendResult):
+                return []
+            cache.store(source, gap, function, results)
+        return cache.read(source, point_list, step_seconds, function, starttime, endtime)
+    except sqlite3.Error as e:
+        logger.warning(f"Trend cache failed, loading from EDS directly: {e}")
+        return None
+
+
+_default_trend_cache = None
+_default_trend_cache_lock = threading.Lock()
+
+def get_default_trend_cache() -> TrendCache | None:
+    """
+    Return the process-wide TrendCache, or None if disabled with PIPELINE_EDS_TREND_CACHE=off.
+    A cache that cannot be opened is logged and treated as disabled, so trends still load from EDS.
+    """
+    global _default_trend_cache
+    setting = os.getenv(TREND_CACHE_ENV_VAR, "").strip()
+    if setting.lower() in ("0", "off", "false", "no"):
+        return None
+    with _default_trend_cache_lock:
+        if _default_trend_cache is None:
+            try:
+                _default_trend_cache = TrendCache(setting or None)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Trend cache unavailable, loading from EDS only: {e}")
+                return None
+        return _default_trend_cache
+
+def set_default_trend_cache(cache: TrendCache | None):
+    """Replace the process-wide cache, e.g. with a TrendCache on another path."""
+    global _default_trend_cache
+    with _default_trend_cache_lock:
+        _default_trend_cache = cache
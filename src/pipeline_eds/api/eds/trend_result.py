@@ -0,0 +1,158 @@
+# src/pipeline_eds/api/eds/trend_result.py
+"""
+Columnar containers for tabular trend data.
+
+EDS returns tabular trend samples as [ts, value, quality] triplets, e.g.
+    sample = [1757763000, 48.93896783431371, 'G']
+Rather than building one dict per sample, each point keeps three packed columns:
+    - timestamps: array('q')  (unix seconds)
+    - values:     array('d')  (NaN where EDS sent no value)
+    - qualities:  bytearray   (one ASCII quality code per sample, e.g. b'G')
+
+A 30-day, 1-minute trend of 20 points is ~860k samples; as columns that is
+about 15 MB of packed numbers instead of close to a million dicts.
+
+NumPy is optional. When it is installed, TrendSeries.as_numpy() returns zero-copy views.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from array import array
+import csv
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # columnar results still work, only as_numpy() is unavailable
+
+NAN = float("nan")
+NO_DATA_QUALITY = ord("N")
+
+class TrendSeries:
+    """The samples of one point, stored column-wise."""
+    __slots__ = ("timestamps", "values", "qualities")
+
+    def __init__(self, timestamps: array | None = None, values: array | None = None, qualities: bytearray | None = None):
+        self.timestamps = timestamps if timestamps is not None else array("q")
+        self.values = values if values is not None else array("d")
+        self.qualities = qualities if qualities is not None else bytearray()
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __repr__(self):
+        return f"TrendSeries(len={len(self)})"
+
+    def append(self, ts: int, value: float | None, quality: str | None = "G"):
+        self.timestamps.append(int(ts))
+        self.values.append(NAN if value is None else value)
+        self.qualities.append(ord(quality[0]) if quality else NO_DATA_QUALITY)
+
+    def extend_samples(self, samples):
+        """
+        Append raw EDS samples, i.e. an iterable of [ts, value, quality].
+        """
+        ts_append = self.timestamps.append
+        value_append = self.values.append
+        quality_append = self.qualities.append
+        for ts, value, quality in samples:
+            ts_append(ts)
+            value_append(NAN if value is None else value)
+            quality_append(ord(quality[0]) if quality else NO_DATA_QUALITY)
+
+    def extend(self, other: "TrendSeries"):
+        """Append all samples of another TrendSeries (e.g. the next response page)."""
+        self.timestamps.extend(other.timestamps)
+        self.values.extend(other.values)
+        self.qualities.extend(other.qualities)
+
+    def quality_codes(self) -> str:
+        """Return the quality codes as one string, e.g. 'GGGBG'."""
+        return self.qualities.decode("ascii")
+
+    def rows(self):
+        """
+        Yield legacy {ts, value, quality} dicts, one per sample.
+        Only for callers that really need per-sample objects.
+        """
+        for ts, value, quality in zip(self.timestamps, self.values, self.qualities):
+            yield {"ts": ts, "value": value, "quality": chr(quality)}
+
+    def as_numpy(self):
+        """
+        Return (timestamps, values, qualities) as zero-copy NumPy views over the columns.
+        The views share memory with this series; do not append while holding them.
+        """
+        if np is None:
+            raise ImportError("numpy is not installed. Use the array-backed columns instead.")
+        return (
+            np.frombuffer(self.timestamps, dtype=np.int64),
+            np.frombuffer(self.values, dtype=np.float64),
+            np.frombuffer(self.qualities, dtype=np.uint8),
+        )
+
+
+class TabularTrendResult:
+    """
+    One TrendSeries per requested point, in the order of the requested point list.
+
+    Supports len(), indexing and iteration like the list-of-lists it replaces,
+    so `for idx, series in enumerate(results)` keeps working.
+    """
+
+    def __init__(self, point_list: list[str] | None = None, series: list[TrendSeries] | None = None):
+        self.point_list = list(point_list) if point_list is not None else []
+        if series is None:
+            series = [TrendSeries() for _ in self.point_list]
+        self.series = series
+
+    def __len__(self):
+        return len(self.series)
+
+    def __getitem__(self, idx) -> TrendSeries:
+        return self.series[idx]
+
+    def __iter__(self):
+        return iter(self.series)
+
+    def __repr__(self):
+        return f"TabularTrendResult(points={len(self)}, samples={self.sample_count()})"
+
+    def series_for(self, iess: str) -> TrendSeries:
+        return self.series[self.point_list.index(iess)]
+
+    def sample_count(self) -> int:
+        return sum(len(series) for series in self.series)
+
+    def write_csv(self, file, labels: list[str] | None = None, timestamp_formatter=None):
+        """
+        Write all points to an open text file in long format: label, timestamp, value, quality.
+
+        Args:
+            file: An open, writable text file (newline="").
+            labels: Optional label per point. Defaults to the point list.
+            timestamp_formatter: Optional callable applied to each unix timestamp.
+        """
+        labels = labels if labels is not None else self.point_list
+        writer = csv.writer(file)
+        writer.writerow(["point", "timestamp", "value", "quality"])
+        for label, series in zip(labels, self.series):
+            timestamps = series.timestamps if timestamp_formatter is None else map(timestamp_formatter, series.timestamps)
+            writer.writerows(zip(repeat(label), timestamps, series.values, series.quality_codes()))
+
+
+def write_csv_stream(pairs, file, labels: list[str], timestamp_formatter=None) -> int:
+    """
+    Write (point_index, TrendSeries) pairs to an open text file as they arrive,
+    e.g. from EdsRestClient.iter_tabular_trend(). Nothing is held after a page is written.
+
+    Returns:
+        int: The number of samples written.
+    """
+    writer = csv.writer(file)
+    writer.writerow(["point", "timestamp", "value", "quality"])
+    count = 0
+    for idx, series in pairs:
+        timestamps = series.timestamps if timestamp_formatter is None else map(timestamp_formatter, series.timestamps)
+        writer.writerows(zip(repeat(labels[idx]), timestamps, series.values, series.quality_codes()))
+        count += len(series)
+    return count
@@ -3,10 +3,10 @@ import requests
 import logging
 # from typing import Union # for 3.8 friendly type suggestions
 
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader, RjnUploadJob
 from pipeline_eds.calls import call_ping
 from pipeline_eds.env import find_urls
 from pipeline_eds.decorators import log_function_call
-from pipeline_eds.time_manager import TimeManager
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +26,8 @@ class RjnClient:
             response.raise_for_status() # catch 4xx/5xx html status
             token = response.json().get('token')
             session.headers['Authorization'] = f'Bearer {token}'
-            print("Status code:", response.status_code)
-            print("Response text:", response.text)
+            logger.info(f"RJN login status code: {response.status_code}")
+            logger.debug(f"RJN login response text: {response.text}")
             return session
         except requests.exceptions.SSLError as ssl_err:
             logging.warning("SSL verification failed. Will retry on next scheduled cycle.")
@@ -46,55 +46,12 @@ class RjnClient:
     @staticmethod
     #def send_data_to_rjn(session, base_url:str, project_id:str, entity_id:int, timestamps: list[Union[int, float, str]], values: list[float]):
     def send_data_to_rjn(session, base_url, project_id, entity_id, timestamps, values):
-        if timestamps is None:
-            raise ValueError("timestamps cannot be None")
-        if values is None:
-            raise ValueError("values cannot be None")
-        if not isinstance(timestamps, list):
-            raise ValueError("timestamps must be a list. If you have a single timestamp, use: [timestamp] ")
-        if not isinstance(values, list):
-            raise ValueError("values must be a list. If you have a single value, use: [value] ")
-        # Check for matching lengths of timestamps and values
-        if len(timestamps) != len(values):
-            raise ValueError(f"timestamps and values must have the same length: {len(timestamps)} vs {len(values)}")
-
-        timestamps_str = [TimeManager(ts).as_formatted_date_time() for ts in timestamps]
-
-        url = f"{base_url}/projects/{project_id}/entities/{entity_id}/data"
-        params = {
-            "interval": 300,    
-            "import_mode": "OverwriteExistingData",
-            "incoming_time": "DST"#, # DST seemed to fail and offset by an hour into the future. UTC with central time seemed to fail and offset the data 5 hours into the past. 
-            #"local_timezone": "CST_CentralStandardTime"
-        }
-        body = {
-        "comments": "Imported from EDS.",
-        "data": dict(zip(timestamps_str, values))  # Works for single or multiple entries
-        }
-        
-
-        response = None
-        try:
-            response = session.post(url=url, json= body, params = params)
-
-            print("Status code:", response.status_code)
-            print("Response text:", response.text)
-            if response is None:
-                print("Response = None, job cancelled")
-            else:
-                response.raise_for_status()
-                print(f"Sent timestamps and values to entity {entity_id} (HTTP {response.status_code})")
-                return True
-        except requests.exceptions.ConnectionError as e:
-            print("Skipping RjnClient.send_data_to_rjn() due to connection error")
-            print(e)
-            return False
-        except requests.exceptions.RequestException as e:
-            print(f"Error sending data to RJN: {e}")
-            if response is not None:# and response.status_code != 500:
-                logging.debug(f"Response content: {response.text}")  # Print error response
-                
-            return False
+        """
+        Send one entity's samples to RJN. Returns True on success.
+        For many entities at once, use RjnBulkUploader.upload_all(), which sends them in parallel.
+        """
+        job = RjnUploadJob(project_id=project_id, entity_id=entity_id, timestamps=timestamps, values=values)
+        return RjnBulkUploader.send_job(session, base_url, job).succeeded
                 
     @staticmethod
     def ping():
@@ -0,0 +1,221 @@
+# src/pipeline_eds/api/rjn_bulk.py
+"""
+Bulk uploads to the RJN data API.
+
+RjnBulkUploader sends many (project_id, entity_id, samples) jobs:
+    - over one authenticated session with a pooled keep-alive HTTPAdapter
+    - with a bounded number of parallel workers
+    - honouring 429/503 Retry-After: one rate-limited reply pauses every worker
+      of that RJN base URL until the server's time, not just the one that got it
+    - retrying connection errors, timeouts and 5xx replies per job with jittered exponential backoff;
+      other 4xx replies are not retried
+and returns one RjnUploadResult per job, in job order.
+
+Timestamps may be unix seconds (formatted straight to RJN's UTC 'YYYY-MM-DD HH:MM:SS')
+or strings (parsed through TimeManager, as RjnClient.send_data_to_rjn always did).
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from concurrent.futures import ThreadPoolExecutor
+import dataclasses
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pipeline_eds.bulk_time import get_formatter
+from pipeline_eds.time_manager import TimeManager
+
+logger = logging.getLogger(__name__)
+
+RJN_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+@dataclasses.dataclass(frozen=True)
+class RjnUploadJob:
+    """The samples of one RJN entity."""
+    project_id: str
+    entity_id: str
+    timestamps: list
+    values: list
+    label: str = ""  # e.g. the IESS, for log messages
+    idempotency_key: str = ""  # sent as the Idempotency-Key header when set (see RjnOutbox)
+
+    def validate(self):
+        if self.timestamps is None:
+            raise ValueError("timestamps cannot be None")
+        if self.values is None:
+            raise ValueError("values cannot be None")
+        if not isinstance(self.timestamps, list):
+            raise ValueError("timestamps must be a list. If you have a single timestamp, use: [timestamp] ")
+        if not isinstance(self.values, list):
+            raise ValueError("values must be a list. If you have a single value, use: [value] ")
+        # Check for matching lengths of timestamps and values
+        if len(self.timestamps) != len(self.values):
+            raise ValueError(f"timestamps and values must have the same length: {len(self.timestamps)} vs {len(self.values)}")
+
+
+@dataclasses.dataclass
+class RjnUploadResult:
+    job: RjnUploadJob
+    succeeded: bool = False
+    status_code: int | None = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+    @property
+    def auth_failed(self) -> bool:
+        """RJN refused the bearer token (e.g. expired); the batch itself may be fine."""
+        return self.status_code in RjnBulkUploader.AUTH_FAILURE_STATUS_CODES
+
+
+def format_rjn_timestamps(timestamps: list) -> list[str]:
+    """RJN's 'YYYY-MM-DD HH:MM:SS' (UTC) for each timestamp; unix seconds skip the string parsing."""
+    formatter = get_formatter("datetime", "UTC")
+    return [formatter.format_one(ts) if isinstance(ts, (int, float)) else TimeManager(ts).as_formatted_date_time()
+            for ts in timestamps]
+
+def _retry_after_seconds(response) -> float | None:
+    """Seconds from a Retry-After header, given as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RjnBulkUploader:
+    MAX_WORKERS = 8
+    MAX_ATTEMPTS = 4
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 60.0
+    REQUEST_TIMEOUT = 30
+    POOL_MAXSIZE = 16
+    # Not retried with the same token, but worth sending again after a new login
+    AUTH_FAILURE_STATUS_CODES = (401, 403)
+
+    PARAMS = {
+        "interval": 300,
+        "import_mode": "OverwriteExistingData",
+        "incoming_time": "DST"#, # DST seemed to fail and offset by an hour into the future. UTC with central time seemed to fail and offset the data 5 hours into the past.
+        #"local_timezone": "CST_CentralStandardTime"
+    }
+
+    _resume_at = {}  # {base_url: monotonic time before which no request is sent}
+    _lock = threading.Lock()
+    _sleep = staticmethod(time.sleep)
+
+    @classmethod
+    def configure_session(cls, session: requests.Session, pool_maxsize: int | None = None) -> requests.Session:
+        """Mount a keep-alive pool large enough for the workers on an (authenticated) RJN session."""
+        if not getattr(session, "_rjn_pooled", False):
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize or cls.POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session._rjn_pooled = True
+        return session
+
+    @classmethod
+    def upload_all(cls, session, base_url: str, jobs: list[RjnUploadJob], max_workers: int | None = None,
+                   max_attempts: int | None = None) -> list[RjnUploadResult]:
+        """
+        Send every job, up to max_workers at a time. A failing job does not stop the others.
+
+        Returns:
+            list[RjnUploadResult]: One per job, in job order.
+        """
+        if not jobs:
+            return []
+        max_workers = min(max_workers or cls.MAX_WORKERS, len(jobs))
+        cls.configure_session(session, max(max_workers, cls.POOL_MAXSIZE))
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rjn-upload") as executor:
+            results = list(executor.map(lambda job: cls._send_job_reporting_errors(session, base_url, job, max_attempts), jobs))
+        n_ok = sum(result.succeeded for result in results)
+        logger.info(f"RJN bulk upload: {n_ok}/{len(results)} job(s) succeeded in {time.monotonic() - started:.1f} s")
+        return results
+
+    @classmethod
+    def send_job(cls, session, base_url: str, job: RjnUploadJob, max_attempts: int | None = None) -> RjnUploadResult:
+        """Send one job, retrying as described in the module docstring."""
+        job.validate()
+        base_url = base_url.rstrip("/")
+        url = f"{base_url}/projects/{job.project_id}/entities/{job.entity_id}/data"
+        body = {
+            "comments": "Imported from EDS.",
+            "data": dict(zip(format_rjn_timestamps(job.timestamps), job.values)),  # Works for single or multiple entries
+        }
+        request_kwargs = {"headers": {"Idempotency-Key": job.idempotency_key}} if job.idempotency_key else {}
+        max_attempts = max_attempts or cls.MAX_ATTEMPTS
+        result = RjnUploadResult(job)
+        started = time.monotonic()
+
+        while result.attempts < max_attempts:
+            result.attempts += 1
+            cls._wait_for_rate_limit(base_url)
+            retry_after = None
+            try:
+                response = session.post(url=url, json=body, params=cls.PARAMS, timeout=cls.REQUEST_TIMEOUT, **request_kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                result.error = f"{type(e).__name__}: {e}"
+            else:
+                result.status_code = response.status_code
+                logger.debug(f"RJN {job.project_id}/{job.entity_id} HTTP {response.status_code}: {response.text}")
+                if response.ok:
+                    result.succeeded = True
+                    result.error = ""
+                    break
+                result.error = f"HTTP {response.status_code}"
+                if response.status_code in (429, 503):
+                    retry_after = _retry_after_seconds(response)
+                    if retry_after is not None:
+                        cls._pause(base_url, retry_after)
+                elif response.status_code < 500:
+                    break  # the request itself is wrong; repeating it will not help
+            if result.attempts < max_attempts and retry_after is None:
+                cls._sleep(cls._backoff(result.attempts))
+
+        result.elapsed = time.monotonic() - started
+        tag = f" [{job.label}]" if job.label else ""
+        if result.succeeded:
+            logger.info(f"Sent {len(job.timestamps)} value(s) to RJN entity {job.entity_id}{tag} (HTTP {result.status_code}, attempt {result.attempts})")
+        else:
+            logger.warning(f"RJN upload failed for project {job.project_id}, entity {job.entity_id}{tag} after {result.attempts} attempt(s): {result.error}")
+        return result
+
+    @classmethod
+    def _send_job_reporting_errors(cls, session, base_url, job, max_attempts) -> RjnUploadResult:
+        # An invalid job becomes a failed result instead of aborting the whole batch
+        try:
+            return cls.send_job(session, base_url, job, max_attempts)
+        except ValueError as e:
+            logger.error(f"Invalid RJN upload job for project {job.project_id}, entity {job.entity_id}: {e}")
+            return RjnUploadResult(job, error=str(e))
+
+    @classmethod
+    def _backoff(cls, attempt: int) -> float:
+        """Full jitter: uniform in [0, base * 2**(attempt-1)], capped."""
+        return random.uniform(0, min(cls.BACKOFF_MAX_SECONDS, cls.BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+
+    @classmethod
+    def _pause(cls, base_url: str, seconds: float):
+        logger.info(f"RJN asked to retry after {seconds:.1f} s; pausing uploads to {base_url}")
+        with cls._lock:
+            cls._resume_at[base_url] = max(cls._resume_at.get(base_url, 0.0), time.monotonic() + seconds)
+
+    @classmethod
+    def _wait_for_rate_limit(cls, base_url: str):
+        with cls._lock:
+            resume_at = cls._resume_at.get(base_url, 0.0)
+        delay = resume_at - time.monotonic()
+        if delay > 0:
+            cls._sleep(delay)
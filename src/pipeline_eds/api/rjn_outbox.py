@@ -0,0 +1,193 @@
+# src/pipeline_eds/api/rjn_outbox.py
+"""
+Durable outbox for RJN transmissions.
+
+Every transformed batch (one RjnUploadJob) is written to a local SQLite queue before
+anything is sent. Senders then claim due batches, post them with RjnBulkUploader and
+acknowledge each one. A batch is only ever removed from the pending set by an
+acknowledgement (or by RJN rejecting it outright), so:
+    - a failed post, or a process that dies between posting and bookkeeping, leaves the
+      batch pending, and the next drain() sends it again, with no second EDS round trip
+    - every batch carries an idempotency key (a hash of its entity and samples), sent as
+      the Idempotency-Key header; enqueuing the same batch twice stores it once, and
+      re-posting it is harmless since the RJN import mode overwrites existing data
+    - after an RJN outage the backlog is drained in parallel, oldest first
+
+Failed batches wait with exponential backoff (capped at RETRY_MAX_SECONDS) before they are
+due again. A 401/403 (expired or refused token) says nothing about the batch: it stays pending
+and is due right away, for a drain after the next login. Batches RJN rejects with any other
+4xx except 429 are set aside as 'dead' for inspection.
+Acknowledged batches are kept for KEEP_SENT_SECONDS, then purged.
+
+Default location: the queries directory of the workspace (rjn_outbox.sqlite).
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import contextlib
+import hashlib
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import time
+
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader, RjnUploadJob, RjnUploadResult
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_FILE_NAME = "rjn_outbox.sqlite"
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    idempotency_key TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL,
+    first_ts INTEGER,
+    last_ts INTEGER,
+    n_samples INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    lease_until REAL NOT NULL DEFAULT 0,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (state, next_attempt_at, created_at);
+"""
+
+def idempotency_key(job: RjnUploadJob) -> str:
+    payload = json.dumps([job.project_id, job.entity_id, list(job.timestamps), list(job.values)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+def _unix_or_none(timestamps, pick):
+    numeric = [ts for ts in timestamps if isinstance(ts, (int, float))]
+    return int(pick(numeric)) if numeric else None
+
+
+class RjnOutbox:
+    RETRY_BASE_SECONDS = 30
+    RETRY_MAX_SECONDS = 300
+    # A claimed batch is offered to other senders again if not acknowledged within this time
+    LEASE_SECONDS = 600
+    KEEP_SENT_SECONDS = 7 * 24 * 3600
+    DRAIN_BATCH_SIZE = 200
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_workspace(cls, workspace_manager) -> "RjnOutbox":
+        return cls(workspace_manager.get_queries_dir() / OUTBOX_FILE_NAME)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the outbox safe to use from worker threads.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, jobs: list[RjnUploadJob], now: float | None = None) -> list[RjnUploadJob]:
+        """
+        Durably store jobs before they are sent.
+
+        Returns:
+            list[RjnUploadJob]: The jobs with their idempotency_key set, in the given order.
+        """
+        now = time.time() if now is None else now
+        keyed = []
+        rows = []
+        for job in jobs:
+            key = job.idempotency_key or idempotency_key(job)
+            keyed.append(RjnUploadJob(job.project_id, job.entity_id, job.timestamps, job.values, job.label, key))
+            payload = json.dumps({"timestamps": list(job.timestamps), "values": list(job.values)})
+            rows.append((key, str(job.project_id), str(job.entity_id), job.label, payload,
+                         _unix_or_none(job.timestamps, min), _unix_or_none(job.timestamps, max),
+                         len(job.timestamps), now, now))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, project_id, entity_id, label, payload, first_ts, last_ts, "
+                "n_samples, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return keyed
+
+    def claim_due(self, limit: int | None = None, now: float | None = None) -> list[RjnUploadJob]:
+        """Lease the oldest pending batches that are due, so no other sender picks them up meanwhile."""
+        now = time.time() if now is None else now
+        limit = limit or self.DRAIN_BATCH_SIZE
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT idempotency_key, project_id, entity_id, label, payload FROM outbox "
+                "WHERE state = ? AND next_attempt_at <= ? AND lease_until <= ? ORDER BY created_at LIMIT ?",
+                (PENDING, now, now, limit),
+            ).fetchall()
+            conn.executemany("UPDATE outbox SET lease_until = ? WHERE idempotency_key = ?",
+                             [(now + self.LEASE_SECONDS, row[0]) for row in rows])
+        jobs = []
+        for key, project_id, entity_id, label, payload in rows:
+            data = json.loads(payload)
+            jobs.append(RjnUploadJob(project_id, entity_id, data["timestamps"], data["values"], label, key))
+        return jobs
+
+    def record_results(self, results: list[RjnUploadResult], now: float | None = None):
+        """Acknowledge sent batches; schedule the others for a retry, or set rejected ones aside."""
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            for result in results:
+                key = result.job.idempotency_key
+                if result.succeeded:
+                    conn.execute("UPDATE outbox SET state = ?, sent_at = ?, attempts = attempts + 1, last_error = '', lease_until = 0 "
+                                 "WHERE idempotency_key = ?", (SENT, now, key))
+                    continue
+                rejected = (result.status_code is not None and 400 <= result.status_code < 500
+                            and result.status_code != 429 and not result.auth_failed)
+                attempts = conn.execute("SELECT attempts FROM outbox WHERE idempotency_key = ?", (key,)).fetchone()
+                attempts = (attempts[0] if attempts else 0) + 1
+                delay = 0 if result.auth_failed else min(self.RETRY_MAX_SECONDS, self.RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+                conn.execute("UPDATE outbox SET state = ?, attempts = ?, last_error = ?, next_attempt_at = ?, lease_until = 0 "
+                             "WHERE idempotency_key = ?",
+                             (DEAD if rejected else PENDING, attempts, result.error, now + delay, key))
+
+    def drain(self, session, base_url: str, max_workers: int | None = None, batch_size: int | None = None) -> list[RjnUploadResult]:
+        """
+        Send every due batch, oldest first, up to max_workers at a time. Stops early when a whole
+        round fails (RJN is still down); the rest stays pending for the next drain.
+        """
+        results = []
+        while True:
+            jobs = self.claim_due(limit=batch_size)
+            if not jobs:
+                break
+            round_results = RjnBulkUploader.upload_all(session, base_url, jobs, max_workers=max_workers)
+            self.record_results(round_results)
+            results.extend(round_results)
+            if not any(result.succeeded for result in round_results):
+                logger.warning(f"RJN outbox: no batch of this round was accepted; {self.counts().get(PENDING, 0)} batch(es) left pending")
+                break
+        self.purge_sent()
+        if results:
+            logger.info(f"RJN outbox: {sum(result.succeeded for result in results)}/{len(results)} batch(es) sent")
+        return results
+
+    def purge_sent(self, now: float | None = None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute("DELETE FROM outbox WHERE state = ? AND sent_at < ?", (SENT, now - self.KEEP_SENT_SECONDS))
+
+    def counts(self) -> dict[str, int]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state").fetchall())
@@ -0,0 +1,208 @@
+# src/pipeline_eds/backfill.py
+"""
+Historical backfill from EDS to RJN, e.g. when RJN asks for a month of data again.
+
+The range [starttime, endtime) is cut into day-sized shards per plant. Shards are fetched
+from EDS REST with at most `eds_api` requests in flight, and their batches are uploaded to
+RJN by a separate, larger pool of `rjn` workers, so the fetch of one shard overlaps the
+uploads of the previous ones and the run is only as slow as the slower of the two APIs.
+
+Progress is checkpointed per (plant, shard) in a JSON file. Running the same backfill
+again skips the finished shards, so an interrupted backfill resumes where it stopped.
+A shard is finished when all its batches are accepted by RJN, or, when an RjnOutbox is
+used, as soon as they are durably queued in it. The outbox is drained at the start and at
+the end of every run, so running the same backfill again resends what RJN did not accept.
+
+The hourly daemon's success timestamps and entity checkpoints are not touched.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader
+from pipeline_eds.api.rjn_outbox import PENDING
+from pipeline_eds.concurrency_limits import ConcurrencyLimits
+from pipeline_eds.point_transforms import build_rjn_jobs
+
+logger = logging.getLogger(__name__)
+
+SHARD_SECONDS = 24 * 3600
+STEP_SECONDS = 300
+
+@dataclasses.dataclass(frozen=True)
+class BackfillShard:
+    """One plant's slice [starttime, endtime) of the backfill range."""
+    plant: str
+    starttime: int
+    endtime: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.plant}:{self.starttime}-{self.endtime}"
+
+    @property
+    def request_window(self) -> tuple[int, int]:
+        # EDS tabular windows include their end sample; leave it to the next shard
+        return self.starttime, self.endtime - STEP_SECONDS
+
+
+def split_into_shards(plant: str, starttime: int, endtime: int, shard_seconds: int = SHARD_SECONDS) -> list[BackfillShard]:
+    """Consecutive shards covering [starttime, endtime), on STEP_SECONDS boundaries."""
+    starttime = int(starttime) - int(starttime) % STEP_SECONDS
+    # A tail shorter than one step would have no sample, and an inverted request window
+    endtime = int(endtime) - int(endtime) % STEP_SECONDS
+    shard_seconds = max(STEP_SECONDS, int(shard_seconds) - int(shard_seconds) % STEP_SECONDS)
+    shards = []
+    shard_start = starttime
+    while shard_start < endtime:
+        shard_end = min(shard_start + shard_seconds, endtime)
+        shards.append(BackfillShard(plant, shard_start, shard_end))
+        shard_start = shard_end
+    return shards
+
+
+class BackfillCheckpoint:
+    """
+    {shard key: {"jobs": n, "samples": n, "finished_at": unix seconds}} in a JSON file,
+    rewritten atomically after every finished shard.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self._shards = json.load(f).get("shards", {})
+        except FileNotFoundError:
+            self._shards = {}
+
+    @classmethod
+    def for_run(cls, directory: Path | str, rows: list[dict], starttime: int, endtime: int) -> "BackfillCheckpoint":
+        """The checkpoint of this exact backfill (same range and query rows), in directory."""
+        entities = sorted(f"{row.get('zd')}|{row.get('iess')}|{row.get('rjn_projectid')}|{row.get('rjn_entityid')}" for row in rows)
+        digest = hashlib.sha256(json.dumps([int(starttime), int(endtime), entities]).encode("utf-8")).hexdigest()[:12]
+        return cls(Path(directory) / f"backfill_{int(starttime)}_{int(endtime)}_{digest}.json")
+
+    def is_done(self, shard: BackfillShard) -> bool:
+        return shard.key in self._shards
+
+    def mark_done(self, shard: BackfillShard, n_jobs: int, n_samples: int):
+        with self._lock:
+            self._shards[shard.key] = {"jobs": n_jobs, "samples": n_samples, "finished_at": int(time.time())}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"shards": self._shards}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def reset(self):
+        with self._lock:
+            self._shards = {}
+            self.path.unlink(missing_ok=True)
+
+
+async def fetch_shard_from_eds(session, rows: list[dict], shard: BackfillShard):
+    from pipeline_eds.api.eds.rest.async_client import AsyncEdsRestClient
+    starttime, endtime = shard.request_window
+    # One-off history: not worth keeping in the trend cache
+    return await AsyncEdsRestClient.load_historic_data(session, [row['iess'] for row in rows], starttime, endtime,
+                                                       step_seconds=STEP_SECONDS, use_cache=False)
+
+
+@dataclasses.dataclass
+class BackfillSummary:
+    shards_total: int = 0
+    shards_skipped: int = 0  # finished by an earlier run
+    shards_done: int = 0
+    shards_failed: int = 0
+    jobs_sent: int = 0
+    jobs_failed: int = 0
+    jobs_replayed: int = 0  # sent from the outbox, left over from this or an earlier run
+    jobs_pending: int = 0  # still in the outbox after the run
+    samples: int = 0
+
+
+async def run_backfill(plants: dict, starttime: int, endtime: int, session_rjn, checkpoint: BackfillCheckpoint,
+                       limits: ConcurrencyLimits | None = None, outbox=None, shard_seconds: int = SHARD_SECONDS,
+                       fetch=fetch_shard_from_eds, transform=build_rjn_jobs) -> BackfillSummary:
+    """
+    Backfill every plant over [starttime, endtime).
+
+    Args:
+        plants: {plant name: (EDS session, query rows)}.
+        session_rjn: Authenticated RJN session with a base_url attribute.
+        limits: eds_api bounds the EDS fetches in flight, rjn the RJN uploads in flight.
+        outbox: Optional RjnOutbox; batches are queued there before they are sent.
+    """
+    limits = limits or ConcurrencyLimits()
+    semaphores = limits.semaphores()
+    summary = BackfillSummary()
+
+    async def drain_outbox():
+        replayed = await asyncio.to_thread(outbox.drain, session_rjn, session_rjn.base_url, limits.rjn)
+        summary.jobs_replayed += sum(result.succeeded for result in replayed)
+
+    if outbox is not None:
+        # Batches of shards finished by an earlier run, but not accepted by RJN then
+        await drain_outbox()
+    shard_plan = []
+    for plant, (session_eds, rows) in plants.items():
+        for shard in split_into_shards(plant, starttime, endtime, shard_seconds):
+            summary.shards_total += 1
+            if checkpoint.is_done(shard):
+                summary.shards_skipped += 1
+            else:
+                shard_plan.append((shard, session_eds, rows))
+    logger.info(f"Backfill: {len(shard_plan)} of {summary.shards_total} shard(s) to do, checkpoint {checkpoint.path}")
+
+    async def upload(job):
+        async with semaphores["rjn"]:
+            return await asyncio.to_thread(RjnBulkUploader.send_job, session_rjn, session_rjn.base_url, job)
+
+    async def backfill_shard(shard, session_eds, rows):
+        async with semaphores["eds_api"]:
+            results = await fetch(session_eds, rows, shard)
+        # The EDS slot is free again: the next shard is fetched while these batches upload
+        jobs = transform(rows, results) if results else []
+        if outbox is not None:
+            jobs = await asyncio.to_thread(outbox.enqueue, jobs)
+        upload_results = await asyncio.gather(*(upload(job) for job in jobs))
+        if outbox is not None:
+            await asyncio.to_thread(outbox.record_results, upload_results)
+        n_ok = sum(result.succeeded for result in upload_results)
+        summary.jobs_sent += n_ok
+        summary.jobs_failed += len(upload_results) - n_ok
+        if not results:
+            summary.shards_failed += 1
+            logger.warning(f"Backfill shard {shard.key}: no data from EDS; it will be retried on the next run")
+        elif n_ok == len(upload_results) or outbox is not None:
+            n_samples = sum(len(job.timestamps) for job in jobs)
+            summary.samples += n_samples
+            summary.shards_done += 1
+            await asyncio.to_thread(checkpoint.mark_done, shard, len(jobs), n_samples)
+        else:
+            summary.shards_failed += 1
+            logger.warning(f"Backfill shard {shard.key}: {len(upload_results) - n_ok} batch(es) failed; it will be retried on the next run")
+
+    async def backfill_shard_reporting_errors(shard, session_eds, rows):
+        try:
+            await backfill_shard(shard, session_eds, rows)
+        except Exception as e:
+            summary.shards_failed += 1
+            logger.error(f"Backfill shard {shard.key} failed: {e}")
+
+    # Shards are started in time order; the semaphores, not the task count, bound the work in flight
+    shard_plan.sort(key=lambda item: (item[0].starttime, item[0].plant))
+    await asyncio.gather(*(backfill_shard_reporting_errors(*item) for item in shard_plan))
+    if outbox is not None:
+        await drain_outbox()
+        summary.jobs_pending = (await asyncio.to_thread(outbox.counts)).get(PENDING, 0)
+    logger.info(f"Backfill finished: {summary}")
+    return summary
@@ -0,0 +1,161 @@
+# src/pipeline_eds/bulk_time.py
+"""
+Whole-series timestamp alignment and formatting.
+
+Trend series carry unix seconds; RJN, CSV logs and plots want strings. Building one
+datetime (or TimeManager) per sample is the slow part of turning a long series into text.
+Here:
+    - floor_timestamps() aligns a whole column to an interval with integer arithmetic
+      (NumPy when installed, otherwise map() over builtins), no datetime objects
+    - format_timestamps() formats a whole column through a TimestampFormatter, which looks up
+      the zone's UTC offset and the 'YYYY-MM-DD HH:' text once per hour and takes 'MM:SS'
+      from a table, so no datetime is built per sample
+    - get_zone() caches ZoneInfo objects, so zone conversion does not reload tz data
+
+Formats: "datetime" ('YYYY-MM-DD HH:MM:SS', RJN's format), "iso" (datetime.isoformat(),
+with the UTC offset for an aware zone) and "isoz" ('YYYY-MM-DDTHH:MM:SSZ', UTC only).
+Zones: "UTC" (default, as TimeManager), None for the computer's local time
+(as datetime.fromtimestamp(ts)), or any IANA name, e.g. "America/Chicago".
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from itertools import repeat
+import operator
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from backports.zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # columns are aligned with map() instead
+
+_MINUTES_SECONDS = tuple(f"{second // 60:02d}:{second % 60:02d}" for second in range(3600))  # "MM:SS" by second of the hour
+_UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@lru_cache(maxsize=32)
+def get_zone(name: str | None):
+    """tzinfo for a zone name; None for the computer's local time."""
+    if name is None:
+        return None
+    if name.upper() == "UTC":
+        return timezone.utc
+    return ZoneInfo(name)
+
+def floor_timestamps(timestamps, interval: int = 300) -> list[int]:
+    """Each unix timestamp floored to a multiple of interval seconds."""
+    interval = int(interval)
+    if np is not None and isinstance(timestamps, np.ndarray):
+        timestamps = timestamps.astype(np.int64)
+        return (timestamps - timestamps % interval).tolist()
+    timestamps = list(map(int, timestamps))
+    return list(map(operator.sub, timestamps, map(operator.mod, timestamps, repeat(interval))))
+
+def floor_datetime(dt: datetime, minutes: int = 5) -> datetime:
+    """dt floored to the last whole multiple of minutes past the hour."""
+    return dt.replace(minute=dt.minute - dt.minute % minutes, second=0, microsecond=0)
+
+
+class TimestampFormatter:
+    """
+    Formats unix seconds in one format and zone.
+
+    The UTC offset is looked up once per hour and the 'YYYY-MM-DD HH:' text once per local
+    hour; minutes and seconds come from a table. An hour containing an offset change
+    (a DST switch) is formatted through datetime, sample by sample.
+    """
+    FORMATS = {
+        "datetime": "%Y-%m-%d %H:%M:%S",
+        "isoz": "%Y-%m-%dT%H:%M:%SZ",
+        "iso": None,  # datetime.isoformat()
+    }
+    # Beyond this many distinct hours (~11 years) or days the memos start over
+    MAX_MEMO_ENTRIES = 100_000
+
+    def __init__(self, fmt: str = "datetime", zone: str | None = "UTC"):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown timestamp format {fmt!r}; use one of {sorted(self.FORMATS)}")
+        if fmt == "isoz" and get_zone(zone) is not timezone.utc:
+            raise ValueError("The 'isoz' format is for UTC only")
+        self.fmt = fmt
+        self.tz = get_zone(zone)
+        self._strftime = self.FORMATS[fmt]
+        self._separator = " " if fmt == "datetime" else "T"
+        self._hours = {}  # {unix hour: (UTC offset in seconds, text after the seconds) or None if the offset changes within it}
+        self._heads = {}  # {local hour number: 'YYYY-MM-DD HH:'}
+
+    def _format_datetime(self, dt: datetime) -> str:
+        return dt.isoformat() if self._strftime is None else dt.strftime(self._strftime)
+
+    def _aware(self, ts: int) -> datetime:
+        dt = datetime.fromtimestamp(ts, tz=self.tz)
+        return dt if self.tz is not None else dt.astimezone()
+
+    def _hour_entry(self, hour: int):
+        if len(self._hours) >= self.MAX_MEMO_ENTRIES:
+            self._hours.clear()
+        start = self._aware(hour * 3600)
+        offset = start.utcoffset()
+        if self._aware(hour * 3600 + 3599).utcoffset() != offset:
+            entry = None
+        else:
+            # Only an aware isoformat carries the offset, e.g. '-05:00'
+            tail = start.isoformat()[19:] if self.fmt == "iso" and self.tz is not None else ("Z" if self.fmt == "isoz" else "")
+            entry = (int(offset.total_seconds()), tail)
+        self._hours[hour] = entry
+        return entry
+
+    def _head(self, local_hour: int) -> str:
+        if len(self._heads) >= self.MAX_MEMO_ENTRIES:
+            self._heads.clear()
+        day, hour = divmod(local_hour, 24)
+        head = self._heads[local_hour] = f"{date.fromordinal(_UNIX_EPOCH_ORDINAL + day).isoformat()}{self._separator}{hour:02d}:"
+        return head
+
+    def format_one(self, ts) -> str:
+        if ts.__class__ is not int:
+            if not float(ts).is_integer():
+                # Fractional seconds: isoformat adds microseconds, so skip the memos
+                return self._format_datetime(datetime.fromtimestamp(ts, tz=self.tz))
+            ts = int(ts)
+        hour = ts // 3600
+        entry = self._hours[hour] if hour in self._hours else self._hour_entry(hour)
+        if entry is None:
+            return self._format_datetime(datetime.fromtimestamp(ts, tz=self.tz))
+        local = ts + entry[0]
+        head = self._heads.get(local // 3600) or self._head(local // 3600)
+        return head + _MINUTES_SECONDS[local % 3600] + entry[1]
+
+    def format(self, timestamps) -> list[str]:
+        if np is not None and isinstance(timestamps, np.ndarray):
+            timestamps = timestamps.tolist()
+        # format_one(), inlined for the common case (int seconds, memoized hour without a DST switch)
+        hours, heads, format_one = self._hours, self._heads, self.format_one
+        formatted = []
+        append = formatted.append
+        for ts in timestamps:
+            entry = hours.get(ts // 3600) if ts.__class__ is int else None
+            if not entry:
+                append(format_one(ts))
+                continue
+            local = ts + entry[0]
+            head = heads.get(local // 3600)
+            if head is None:
+                head = self._head(local // 3600)
+            append(head + _MINUTES_SECONDS[local % 3600] + entry[1])
+        return formatted
+
+
+@lru_cache(maxsize=16)
+def get_formatter(fmt: str = "datetime", zone: str | None = "UTC") -> TimestampFormatter:
+    return TimestampFormatter(fmt, zone)
+
+def format_timestamps(timestamps, fmt: str = "datetime", zone: str | None = "UTC") -> list[str]:
+    """A whole column of unix seconds as strings, e.g. for an RJN post or a CSV log."""
+    return get_formatter(fmt, zone).format(timestamps)
+
+def format_timestamp(ts, fmt: str = "datetime", zone: str | None = "UTC") -> str:
+    return get_formatter(fmt, zone).format_one(ts)
@@ -25,6 +25,7 @@ except ImportError:
     tzdata = None  # or handle gracefully
 
 from pipeline_eds.time_manager import TimeManager
+from pipeline_eds.bulk_time import format_timestamps
 from pipeline_eds.create_sensors_db import get_db_connection, create_packaged_db, reset_user_db # get_user_db_path, ensure_user_db, 
 from pipeline_eds.api.eds.rest.demo import demo_eds_webplot_point_live, demo_eds_save_point_export
 from pipeline_eds.api.eds.exceptions import  EdsLoginException
@@ -202,7 +203,8 @@ def trend(
     datapoint_count: int = typer.Option(None, "--datapoint-count", "-dp", help="You can explicitly provide the number of datapoints. Default: ~400 data points will be used, based on the nice_step() function. If the --datapoints flag is provided, the --step-seconds flag will be ignored. "), 
     force_webplot: bool = typer.Option(False,"--webplot","-w",help = "Use a browser-based plot instead of local (matplotlib). Useful for remote servers without display."),
     force_matplotlib: bool = typer.Option(False,"--matplotlib","-mpl",help="Force matplotlib to be used for plotting. This will not work if matplotlib is not available."),
-    default_idcs: bool = typer.Option(False, "--default-idcs", "-d", help="Use the default IDCS values for the configured plant name, instead of providing them as arguments.")
+    default_idcs: bool = typer.Option(False, "--default-idcs", "-d", help="Use the default IDCS values for the configured plant name, instead of providing them as arguments."),
+    csv_path: Path = typer.Option(None, "--csv", help="Write the samples to this CSV file as EDS returns them, instead of plotting. Suited to long windows."),
     ):
     """
     Show a curve for a sensor over time.
@@ -287,6 +289,16 @@ def trend(
         step_seconds = helpers.nice_step(TimeManager(dt_finish).as_unix()-TimeManager(dt_start).as_unix()) # TimeManager(starttime).as_unix()
     elif seconds_between_points is not None and datapoint_count is None:
         step_seconds = seconds_between_points
+    if csv_path is not None:
+        # Export: pages go to the file as they arrive, shard by shard, and nothing is kept in memory
+        from pipeline_eds.api.eds.trend_result import write_csv_stream
+        from pipeline_eds.bulk_time import get_formatter
+        with open(csv_path, "w", newline="") as f:
+            pairs = EdsRestClient.stream_historic_data(session, iess_list, dt_start, dt_finish, step_seconds)
+            count = write_csv_stream(pairs, f, labels=idcs, timestamp_formatter=get_formatter("iso", zone=None).format_one)
+        typer.echo(f"{count} sample(s) for {len(idcs)} point(s) written to {csv_path}")
+        return
+
     results = EdsRestClient.load_historic_data(session, iess_list, dt_start, dt_finish, step_seconds) 
     # results is a list of lists. Each inner list is a separate curve.
     if not results:
@@ -294,10 +306,10 @@ def trend(
     
     # The PlotBuffer instance is created once, outside the loop.
     data_buffer = PlotBuffer() 
-    for idx, rows in enumerate(results):
+    for idx, series in enumerate(results):
         
-        # We create a unique label for each of the 'rows' in the outer loop.
-        # The plot will use this label to draw a separate line for each 'rows'.
+        # We create a unique label for each of the series in the outer loop.
+        # The plot will use this label to draw a separate line for each series.
         
         attributes = points_data[iess_list[idx]]
         unit = attributes.get('UN')
@@ -308,15 +320,11 @@ def trend(
         
         # The raw from EdsRestClient.get_tabular_trend() is brought in like this: 
         #   sample = [1757763000, 48.93896783431371, 'G'] 
-        #   and then is converted to a dictionary with keys: ts, value, quality
+        #   and is packed into a columnar TrendSeries: timestamps, values, qualities
         
-        for row in rows:
-            ts = helpers.iso(row.get("ts"))
-            av = row.get("value")
-            
-            # All data is appended to the *same* data_buffer,
-            # but the unique 'label' tells the buffer which series it belongs to.
-            data_buffer.append(label, ts, av, unit)
+        # All data is appended to the *same* data_buffer,
+        # but the unique 'label' tells the buffer which series it belongs to.
+        data_buffer.extend(label, format_timestamps(series.timestamps, "iso", zone=None), series.values, unit)
 
     # Once the loop is done, you can call your show_static function
     # with the single, populated data_buffer.
@@ -335,9 +343,9 @@ def trend(
     
     if print_csv:
         print(f"Time,\\{iess_list[0]}\\,")
-        for idx, rows in enumerate(results):
-            for row in rows:
-                print(f"{helpers.iso(row.get('ts'))},{row.get('value')},")
+        for idx, series in enumerate(results):
+            for ts, value in zip(format_timestamps(series.timestamps, "iso", zone=None), series.values):
+                print(f"{ts},{value},")
 
 @app.command()
 def alarm(
@@ -546,6 +554,141 @@ def points_export(
         return
     typer.echo(f"\nExport file saved to: \n{export_path}\n")
 
+@app.command()
+def backfill(
+    starttime: str = typer.Option(..., "--start", "-s", help="Start of the range to re-send. Use any reasonable format, to be parsed automatically. If you must use spaces, use quotes."),
+    endtime: str = typer.Option(None, "--end", "-e", help="End of the range (exclusive). Default: now."),
+    workspace_name: str = typer.Option("eds_to_rjn", "--workspace", "-ws", help="Workspace whose default query files, secrets and configuration are used."),
+    plant_name: list[str] = typer.Option(None, "--plantname", "-pn", help="Limit the backfill to these EDS ZDs (query 'zd' column). Repeatable."),
+    iess: list[str] = typer.Option(None, "--iess", "-i", help="Limit the backfill to these IESS values. Repeatable."),
+    eds_workers: int = typer.Option(None, "--eds-workers", help="EDS tabular requests in flight. Default: eds_api in the workspace concurrency settings."),
+    rjn_workers: int = typer.Option(None, "--rjn-workers", help="RJN uploads in flight. Default: rjn in the workspace concurrency settings."),
+    shard_hours: float = typer.Option(24, "--shard-hours", help="Size of one checkpointed shard."),
+    restart: bool = typer.Option(False, "--restart", help="Ignore the checkpoint of an earlier, identical backfill and send every shard again."),
+    ):
+    """
+    Re-send a date range from EDS to RJN, in parallel day-sized shards that resume after an interruption.
+    """
+    import asyncio
+    from pipeline_eds.api.eds.rest.session_pool import EdsSessionPool
+    from pipeline_eds.api.rjn import RjnClient
+    from pipeline_eds.api.rjn_bulk import RjnBulkUploader
+    from pipeline_eds.api.rjn_outbox import RjnOutbox
+    from pipeline_eds.backfill import BackfillCheckpoint, run_backfill
+    from pipeline_eds.concurrency_limits import ConcurrencyLimits
+    from pipeline_eds.env import SecretConfig
+    from pipeline_eds.queriesmanager import load_query_rows_from_csv_files, group_queries_by_col
+    from pipeline_eds.workspace_manager import WorkspaceManager
+
+    workspace_manager = WorkspaceManager(workspace_name)
+    rows = load_query_rows_from_csv_files(workspace_manager.get_default_query_file_paths_list())
+    if plant_name:
+        rows = [row for row in rows if row.get('zd') in plant_name]
+    if iess:
+        wanted = {value.upper() for value in iess}
+        rows = [row for row in rows if row.get('iess', '').upper() in wanted]
+    if not rows:
+        raise BadParameter("No query rows match the given --plantname / --iess filters.")
+
+    dt_start, dt_finish = helpers.asses_time_range(starttime=starttime, endtime=endtime)
+    start_ts = TimeManager(dt_start).as_unix()
+    end_ts = TimeManager(dt_finish).as_unix()
+    if end_ts <= start_ts:
+        raise BadParameter("The end must be after the start.", param_hint="--end")
+
+    secrets_dict = SecretConfig.load_config(secrets_file_path = workspace_manager.get_secrets_file_path())
+    plants = {}
+    for zd, plant_rows in group_queries_by_col(rows, 'zd').items():
+        api_credentials = secrets_dict.get("eds_apis", {}).get(zd)
+        if not api_credentials:
+            typer.echo(f"No EDS API configured for {zd}; its {len(plant_rows)} point(s) are skipped.")
+            continue
+        try:
+            plants[zd] = (EdsSessionPool.get_session_with_api_credentials(api_credentials), plant_rows)
+        except Exception as e:
+            typer.echo(f"EDS login failed for {zd} ({e}); its {len(plant_rows)} point(s) are skipped.")
+    if not plants:
+        return
+
+    rjn_credentials = secrets_dict.get("contractor_apis", {}).get("RJN", {})
+    base_url_rjn = rjn_credentials.get("url").rstrip("/")
+    session_rjn = RjnClient.login_to_session(api_url = base_url_rjn, client_id = rjn_credentials.get("client_id"), password = rjn_credentials.get("password"))
+    if session_rjn is None:
+        typer.echo("RJN login failed. Nothing was sent.")
+        return
+    session_rjn.base_url = base_url_rjn
+
+    limits = ConcurrencyLimits.from_workspace(workspace_manager)
+    limits = ConcurrencyLimits(eds_api = eds_workers or limits.eds_api, local_db = limits.local_db, rjn = rjn_workers or limits.rjn)
+    RjnBulkUploader.configure_session(session_rjn, limits.rjn)
+    checkpoint = BackfillCheckpoint.for_run(workspace_manager.get_queries_dir() / "backfill", rows, start_ts, end_ts)
+    if restart:
+        checkpoint.reset()
+
+    typer.echo(f"Backfilling {sum(len(plant_rows) for _, plant_rows in plants.values())} point(s) "
+               f"from {helpers.iso(start_ts)} to {helpers.iso(end_ts)} ({limits.eds_api} EDS / {limits.rjn} RJN workers)")
+    summary = asyncio.run(run_backfill(plants, start_ts, end_ts, session_rjn, checkpoint, limits=limits,
+                                       outbox=RjnOutbox.for_workspace(workspace_manager), shard_seconds=int(shard_hours * 3600)))
+    typer.echo(f"Shards: {summary.shards_done} done, {summary.shards_skipped} already done, {summary.shards_failed} failed")
+    typer.echo(f"Batches: {summary.jobs_sent} sent, {summary.jobs_replayed} resent from the outbox, "
+               f"{summary.jobs_pending} left in the outbox for retry; {summary.samples} sample(s)")
+    if summary.shards_failed:
+        typer.echo("Run the same command again to retry the failed shards.")
+
+@app.command(name="myd-export")
+def myd_export(
+    starttime: str = typer.Option(..., "--start", "-s", help="Start of the range to extract. Use any reasonable format, to be parsed automatically. If you must use spaces, use quotes."),
+    endtime: str = typer.Option(None, "--end", "-e", help="End of the range. Default: now."),
+    plant_name: str = typer.Option(None, "--plantname", "-pn", help="EDS ZD whose query sids, storage_path and myd_layout are used."),
+    sid: list[str] = typer.Option(None, "--sid", help="Sensor ids (query 'sid' column) to extract. Repeatable. Default: every sid of --plantname."),
+    data_dir: Path = typer.Option(None, "--data-dir", "-d", help="A copy of the MariaDB data directory holding the pla_*.MYD files. Default: storage_path of --plantname."),
+    workspace_name: str = typer.Option("eds_to_rjn", "--workspace", "-ws", help="Workspace whose default query files and secrets are used."),
+    output: Path = typer.Option(None, "--output", "-o", help="CSV file to write. Default: print to the terminal."),
+    ):
+    """
+    Extract history straight from the MyISAM data files, without a running MariaDB.
+    """
+    from pipeline_eds.api.eds.myd_reader import MydRowLayout, access_myd_files_offline, read_myd_tables
+    from pipeline_eds.bulk_time import get_formatter
+    from pipeline_eds.env import SecretConfig
+    from pipeline_eds.queriesmanager import load_query_rows_from_csv_files
+    from pipeline_eds.workspace_manager import WorkspaceManager
+
+    if data_dir is None and plant_name is None:
+        raise BadParameter("Give --data-dir, or --plantname to use its configured storage_path.", param_hint="--data-dir")
+    workspace_manager = WorkspaceManager(workspace_name)
+    labels = list(sid or [])
+    if not labels:
+        if plant_name is None:
+            raise BadParameter("Give --sid, or --plantname to use the sids of its query rows.", param_hint="--sid")
+        rows = load_query_rows_from_csv_files(workspace_manager.get_default_query_file_paths_list())
+        labels = [row['sid'] for row in rows if row.get('zd') == plant_name and row.get('sid')]
+        if not labels:
+            raise BadParameter(f"No query rows with a sid for {plant_name}.", param_hint="--plantname")
+
+    dt_start, dt_finish = helpers.asses_time_range(starttime=starttime, endtime=endtime)
+    start_ts = TimeManager(dt_start).as_unix()
+    end_ts = TimeManager(dt_finish).as_unix()
+    try:
+        point = [int(label) for label in labels]
+    except ValueError:
+        raise BadParameter(f"Sensor ids must be integers: {labels}", param_hint="--sid")
+
+    secrets_dict = SecretConfig.load_config(secrets_file_path = workspace_manager.get_secrets_file_path()) if plant_name else {}
+    if data_dir is None:
+        results = access_myd_files_offline(plant_name, start_ts, end_ts, point, secrets_dict)
+    else:
+        plant_config = secrets_dict.get("eds_dbs", {}).get(f"{plant_name}-config", {}) if plant_name else {}
+        results = read_myd_tables(data_dir, point, start_ts, end_ts, layout=MydRowLayout.from_dict(plant_config.get("myd_layout")))
+
+    formatter = get_formatter("datetime").format_one
+    if output is None:
+        results.write_csv(sys.stdout, labels=labels, timestamp_formatter=formatter)
+    else:
+        with open(output, "w", newline="") as f:
+            results.write_csv(f, labels=labels, timestamp_formatter=formatter)
+        typer.echo(f"{results.sample_count()} sample(s) for {len(labels)} point(s) written to {output}")
+
 @app.command()
 def help(ctx: typer.Context):
     """
@@ -0,0 +1,53 @@
+# src/pipeline_eds/concurrency_limits.py
+"""
+How many calls may be in flight at once against each upstream API.
+
+Read from the [concurrency] section of a workspace's configuration.toml:
+
+    [concurrency]
+    eds_api = 2     # plants fetching tabular trends from EDS REST at the same time
+    local_db = 1    # plants reading the local MariaDB fallback at the same time
+    rjn = 4         # RJN uploads in flight
+
+Missing keys, a missing section or an unreadable file fall back to the defaults.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import asyncio
+import dataclasses
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclasses.dataclass(frozen=True)
+class ConcurrencyLimits:
+    eds_api: int = 2
+    local_db: int = 1
+    rjn: int = 4
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> "ConcurrencyLimits":
+        section = (config or {}).get("concurrency", {}) or {}
+        defaults = cls()
+        limits = {}
+        for field in dataclasses.fields(cls):
+            value = section.get(field.name, getattr(defaults, field.name))
+            try:
+                limits[field.name] = max(1, int(value))
+            except (TypeError, ValueError):
+                logger.warning(f"[concurrency] {field.name} = {value!r} is not a number; using {getattr(defaults, field.name)}")
+                limits[field.name] = getattr(defaults, field.name)
+        return cls(**limits)
+
+    @classmethod
+    def from_workspace(cls, workspace_manager) -> "ConcurrencyLimits":
+        from pipeline_eds.helpers import load_toml
+        try:
+            config = load_toml(workspace_manager.get_configuration_file_path())
+        except Exception as e:
+            logger.warning(f"Could not read [concurrency] from configuration.toml ({e}); using defaults")
+            config = {}
+        return cls.from_config(config)
+
+    def semaphores(self) -> dict[str, asyncio.Semaphore]:
+        """One asyncio.Semaphore per upstream API. Call from inside the running event loop."""
+        return {field.name: asyncio.Semaphore(getattr(self, field.name)) for field in dataclasses.fields(self)}
@@ -12,6 +12,7 @@ import zipfile
 from pathlib import Path
 import pendulum
 
+from pipeline_eds.bulk_time import floor_datetime, format_timestamp
 from pipeline_eds.time_manager import TimeManager
 
 logger = logging.getLogger(__name__)
@@ -41,11 +42,8 @@ def load_toml(filepath):
 
 #def round_datetime_to_nearest_past_five_minutes(dt: datetime) -> datetime:
 def round_datetime_to_nearest_past_five_minutes(dt):
-    #print(f"dt = {dt}")
-    allowed_minutes = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55]
-    # Find the largest allowed minute <= current minute
-    rounded_minute = max(m for m in allowed_minutes if m <= dt.minute)
-    return dt.replace(minute=rounded_minute, second=0, microsecond=0)
+    # For whole series of unix timestamps, use bulk_time.floor_timestamps()
+    return floor_datetime(dt, minutes=5)
 
 def get_now_time_rounded():# -> int:
     '''
@@ -91,7 +89,8 @@ def human_readable(ts):
     return datetime.fromtimestamp(ts).strftime("%H:%M:%S")
 
 def iso(ts):
-    return datetime.fromtimestamp(ts).isoformat()
+    # Same as datetime.fromtimestamp(ts).isoformat(); for whole series, use bulk_time.format_timestamps(timestamps, "iso", zone=None)
+    return format_timestamp(ts, "iso", zone=None)
 
 def get_lan_ip_address_of_current_machine():
     """Get the LAN IP address of the current machine."""
@@ -20,6 +20,17 @@ class PlotBuffer:
                 self.data[label]["x"].pop(0)
                 self.data[label]["y"].pop(0)
 
+    def extend(self, label, xs, ys, unit=None):
+        """Append a whole series at once, e.g. the columns of a TrendSeries."""
+        self.data[label]["x"].extend(xs)
+        self.data[label]["y"].extend(ys)
+        self.data[label]["unit"] = unit
+
+        if len(self.data[label]["x"]) > self.max_points:
+            if not KEEP_ALL_LIVE_POINTS:
+                del self.data[label]["x"][:-self.max_points]
+                del self.data[label]["y"][:-self.max_points]
+
     def get_all(self):
         return self.data
 
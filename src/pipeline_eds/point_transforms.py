@@ -0,0 +1,161 @@
+# src/pipeline_eds/point_transforms.py
+"""
+Per-point value transforms, declared in the queries CSV instead of in code.
+
+Optional columns (empty or missing = no change):
+    unit_from, unit_to  convert between units, e.g. in -> ft (see UNIT_CONVERSIONS)
+    scale               multiply by this, after the unit conversion
+    offset              add this, after scaling (in the target unit)
+    round               decimals to round to (default 5; unrounded values fail to post to RJN)
+    quality             quality codes to keep, e.g. G or GF (default: keep all)
+    interval            seconds to floor the timestamps to (default 300, the RJN interval)
+
+Example, the Maxson wet well level from inches to feet above mean sea level:
+    zd,idcs,iess,...,unit_from,unit_to,offset
+    Maxson,M310LI,M310LI.UNIT0@NET0,...,in,ft,181.25
+
+Each distinct set of columns is compiled once into a PointTransform: the unit conversion,
+scale and offset fold into one `value * factor + offset`. apply() works on a whole
+columnar TrendSeries at once (NumPy when installed, otherwise map()/compress() over
+builtins), so no Python bytecode runs per sample. Samples without a value (NaN) are dropped.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import dataclasses
+from functools import lru_cache
+from itertools import compress, repeat
+import logging
+import operator
+
+from pipeline_eds.api.eds.rest.alarm import quality_mask
+from pipeline_eds.api.rjn_bulk import RjnUploadJob
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # series are transformed with map() over builtins instead
+
+logger = logging.getLogger(__name__)
+
+TRANSFORM_COLUMNS = ("unit_from", "unit_to", "scale", "offset", "round", "quality", "interval")
+DEFAULT_ROUND = 5
+DEFAULT_INTERVAL = 300
+
+# (from, to): (factor, offset), i.e. to = from * factor + offset
+UNIT_CONVERSIONS = {
+    ("in", "ft"): (1 / 12, 0.0),
+    ("ft", "in"): (12.0, 0.0),
+    ("ft", "m"): (0.3048, 0.0),
+    ("m", "ft"): (1 / 0.3048, 0.0),
+    ("in", "mm"): (25.4, 0.0),
+    ("mm", "in"): (1 / 25.4, 0.0),
+    ("gpm", "mgd"): (1440 / 1_000_000, 0.0),
+    ("mgd", "gpm"): (1_000_000 / 1440, 0.0),
+    ("cfs", "mgd"): (0.646317, 0.0),
+    ("mgd", "cfs"): (1 / 0.646317, 0.0),
+    ("psi", "ft"): (2.306659, 0.0),  # feet of water
+    ("ft", "psi"): (1 / 2.306659, 0.0),
+    ("degf", "degc"): (5 / 9, -160 / 9),
+    ("degc", "degf"): (1.8, 32.0),
+}
+
+@dataclasses.dataclass(frozen=True)
+class PointTransform:
+    factor: float = 1.0
+    offset: float = 0.0
+    ndigits: int | None = DEFAULT_ROUND
+    qualities: bytes | None = None  # quality codes kept; None keeps every sample
+    interval: int = DEFAULT_INTERVAL
+    unit: str | None = None  # unit of the transformed values, when converted
+
+    def convert_value(self, value: float) -> float:
+        """The transform of one value, for live readings."""
+        value = value * self.factor + self.offset
+        return value if self.ndigits is None else round(value, self.ndigits)
+
+    def apply(self, series) -> tuple[list[int], list[float]]:
+        """
+        Transform a whole TrendSeries.
+
+        Returns:
+            tuple[list[int], list[float]]: Aligned timestamps and values, ready for an RjnUploadJob.
+        """
+        if not len(series):
+            return [], []
+        if np is not None:
+            return self._apply_numpy(series)
+        timestamps, values = series.timestamps, series.values
+        keep = map(operator.eq, values, values)  # False for NaN
+        if self.qualities is not None:
+            keep = map(operator.and_, keep, quality_mask(series.qualities, self.qualities))
+        keep = bytes(keep)
+        if keep.count(0):
+            timestamps, values = list(compress(timestamps, keep)), list(compress(values, keep))
+        if self.interval > 1:
+            timestamps = list(map(operator.sub, timestamps, map(operator.mod, timestamps, repeat(self.interval))))
+        if self.factor != 1.0:
+            values = map(operator.mul, values, repeat(self.factor))
+        if self.offset:
+            values = map(operator.add, values, repeat(self.offset))
+        if self.ndigits is not None:
+            values = map(round, values, repeat(self.ndigits))
+        return list(timestamps), list(values)
+
+    def _apply_numpy(self, series) -> tuple[list[int], list[float]]:
+        timestamps, values, qualities = series.as_numpy()
+        keep = ~np.isnan(values)
+        if self.qualities is not None:
+            keep &= quality_mask(qualities, self.qualities)
+        timestamps, values = timestamps[keep], values[keep]
+        if self.interval > 1:
+            timestamps = timestamps - timestamps % self.interval
+        values = values * self.factor + self.offset
+        if self.ndigits is not None:
+            values = np.round(values, self.ndigits)
+        return timestamps.tolist(), values.tolist()
+
+
+def _column(row: dict, name: str) -> str:
+    return (row.get(name) or "").strip()
+
+@lru_cache(maxsize=256)
+def _compile(unit_from: str, unit_to: str, scale: str, offset: str, ndigits: str, quality: str, interval: str) -> PointTransform:
+    factor, base_offset = 1.0, 0.0
+    unit = None
+    if unit_from or unit_to:
+        key = (unit_from.lower(), unit_to.lower())
+        if key[0] != key[1]:
+            if key not in UNIT_CONVERSIONS:
+                raise ValueError(f"No unit conversion from '{unit_from}' to '{unit_to}'. Known: {sorted(UNIT_CONVERSIONS)}")
+            factor, base_offset = UNIT_CONVERSIONS[key]
+        unit = unit_to or None
+    scale = float(scale) if scale else 1.0
+    return PointTransform(
+        factor=factor * scale,
+        offset=base_offset * scale + (float(offset) if offset else 0.0),
+        ndigits=int(ndigits) if ndigits else DEFAULT_ROUND,
+        qualities=quality.replace(",", "").replace(" ", "").upper().encode("ascii") if quality else None,
+        interval=int(interval) if interval else DEFAULT_INTERVAL,
+        unit=unit,
+    )
+
+def compile_transform(row: dict) -> PointTransform:
+    """
+    The PointTransform of one query row. Rows with the same transform columns share one instance.
+
+    Raises:
+        ValueError: If a column holds something that is not a number, or an unknown unit pair.
+    """
+    try:
+        return _compile(*(_column(row, name) for name in TRANSFORM_COLUMNS))
+    except ValueError as e:
+        raise ValueError(f"Invalid transform columns for {row.get('iess')}: {e}") from e
+
+def build_rjn_jobs(rows: list[dict], results) -> list[RjnUploadJob]:
+    """One RjnUploadJob per query row with samples, transformed as declared in the row."""
+    jobs = []
+    for row, series in zip(rows, results):
+        timestamps, values = compile_transform(row).apply(series)
+        if timestamps:
+            jobs.append(RjnUploadJob(project_id=row['rjn_projectid'], entity_id=row['rjn_entityid'],
+                                     timestamps=timestamps, values=values, label=row['iess']))
+    return jobs
@@ -100,6 +100,77 @@ class QueriesManager:
         self.save_tracking(data)
         logger.info(f"Updated last_attempt for {api_id}: {now}")
 
+    # Per-entity checkpoints: the timestamp of the last sample the target API accepted for each
+    # (project_id, entity_id), so every point is fetched from where it left off instead of from the
+    # one API-wide last_success. A checkpoint never reaches back further than the lookback cap,
+    # so a long-dead entity cannot turn an hourly run into a backfill.
+    CHECKPOINT_STEP_SECONDS = 300
+    CHECKPOINT_MAX_LOOKBACK_SECONDS = 7 * 24 * 3600
+
+    @staticmethod
+    def entity_key(project_id, entity_id) -> str:
+        return f"{project_id}/{entity_id}"
+
+    def get_entity_checkpoints(self, api_id) -> dict:
+        """{entity_key: unix seconds of the last accepted sample}"""
+        entities = self.load_tracking().get(api_id, {}).get("entities", {})
+        return {key: int(entry["last_sample_ts"]) for key, entry in entities.items() if "last_sample_ts" in entry}
+
+    def update_entity_checkpoints(self, api_id, checkpoints: dict):
+        """
+        Record accepted samples, given as {(project_id, entity_id): unix seconds of the newest sample}.
+        Checkpoints only move forward. All entities are written in one save.
+        """
+        if not checkpoints:
+            return
+        data = self.load_tracking()
+        entities = data.setdefault(api_id, {"timestamps": {}}).setdefault("entities", {})
+        for (project_id, entity_id), last_ts in checkpoints.items():
+            key = self.entity_key(project_id, entity_id)
+            if int(last_ts) <= int(entities.get(key, {}).get("last_sample_ts", -1)):
+                continue
+            entities[key] = {
+                "last_sample": TimeManager(int(last_ts)).as_formatted_date_time(),
+                "last_sample_ts": int(last_ts),
+            }
+        self.save_tracking(data)
+        logger.info(f"Updated {len(checkpoints)} entity checkpoint(s) for {api_id}")
+
+    def seed_entity_checkpoints(self, api_id, rows, starttime: int):
+        """
+        Give every entity of rows without a checkpoint one just before starttime, so an entity
+        whose first window fails is retried from there rather than from the API-wide
+        last_success, which other entities' success may have moved past it.
+        """
+        checkpoints = self.get_entity_checkpoints(api_id)
+        missing = {}
+        for row in rows:
+            entity = (row.get("rjn_projectid"), row.get("rjn_entityid"))
+            if self.entity_key(*entity) not in checkpoints:
+                missing[entity] = int(starttime) - self.CHECKPOINT_STEP_SECONDS
+        self.update_entity_checkpoints(api_id, missing)
+
+    def plan_entity_windows(self, api_id, rows, default_starttime: int, endtime: int) -> dict:
+        """
+        Group query rows by their fetch window, derived from each entity's own checkpoint.
+        Entities without a checkpoint start at default_starttime; entities already up to date are left out.
+
+        Returns:
+            dict: {(starttime, endtime): [rows]}, so each window can be one tabular request.
+        """
+        checkpoints = self.get_entity_checkpoints(api_id)
+        earliest = endtime - self.CHECKPOINT_MAX_LOOKBACK_SECONDS
+        windows = defaultdict(list)
+        for row in rows:
+            checkpoint = checkpoints.get(self.entity_key(row.get("rjn_projectid"), row.get("rjn_entityid")))
+            starttime = default_starttime if checkpoint is None else checkpoint + self.CHECKPOINT_STEP_SECONDS
+            starttime = max(starttime, earliest)
+            if starttime > endtime:
+                logger.debug(f"{row.get('iess')} is up to date")
+                continue
+            windows[(starttime, endtime)].append(row)
+        return dict(windows)
+
 def load_query_rows_from_csv_files(csv_paths_list):
     queries_dictlist_unfiltered = []
     for csv_path in csv_paths_list:
@@ -0,0 +1,153 @@
+# src/pipeline_eds/scheduler.py
+"""
+Building blocks for resident (long-running) services.
+
+CronSchedule: a cron-like schedule, standard 5 fields: minute hour day-of-month month day-of-week
+(0 = Sunday). Each field takes `*`, a number, a range `a-b`, a step `*/n` or `a-b/n`, and comma lists.
+    "5 * * * *"       five past every hour
+    "*/15 6-18 * * 1-5"  every quarter hour, 06:00-18:45, Monday to Friday
+
+run_on_schedule(): call a job at every scheduled minute until stopped. A failing cycle is logged
+and the service keeps running. A cycle that overruns the next slot skips that slot.
+
+MtimeCachedValue: a value loaded from files, reloaded only when one of the files' mtimes changes,
+so a resident service picks up edited configuration without re-parsing it every cycle.
+"""
+from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+from datetime import datetime, timedelta
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+class CronSchedule:
+    FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+    # Look at most this far ahead; enough for any valid expression (e.g. 29 February)
+    MAX_LOOKAHEAD = timedelta(days=366 * 8)
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields (minute hour day month weekday): {expression!r}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        )
+        # As in cron: if both day fields are restricted, a day matching either one counts
+        self._day_or_weekday = fields[2] != "*" and fields[4] != "*"
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> frozenset:
+        values = set()
+        for part in field.split(","):
+            spec, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if spec == "*":
+                start, end = low, high
+            elif "-" in spec:
+                start, end = (int(bound) for bound in spec.split("-", 1))
+            else:
+                start = int(spec)
+                end = high if step > 1 else start
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Cron field {field!r} out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, dt: datetime) -> bool:
+        weekday = (dt.weekday() + 1) % 7  # cron counts from Sunday
+        if self._day_or_weekday:
+            return dt.day in self.days or weekday in self.weekdays
+        return dt.day in self.days and weekday in self.weekdays
+
+    def matches(self, dt: datetime) -> bool:
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt: datetime) -> datetime:
+        """The first scheduled minute strictly after dt."""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + self.MAX_LOOKAHEAD
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"{self!r} never fires")
+
+
+def run_on_schedule(schedule: CronSchedule, job: Callable, stop_event: threading.Event | None = None,
+                    now: Callable = datetime.now, label: str = "job"):
+    """
+    Run job() at every time the schedule fires, until stop_event is set (or Ctrl+C).
+    """
+    stop_event = stop_event or threading.Event()
+    next_run = schedule.next_after(now())
+    logger.info(f"{label}: scheduled by {schedule.expression!r}, first run at {next_run:%Y-%m-%d %H:%M}")
+    try:
+        while not stop_event.is_set():
+            delay = (next_run - now()).total_seconds()
+            if delay > 0 and stop_event.wait(delay):
+                break
+            started = time.perf_counter()
+            try:
+                job()
+            except Exception:
+                logger.exception(f"{label}: cycle scheduled for {next_run:%Y-%m-%d %H:%M} failed")
+            logger.info(f"{label}: cycle took {time.perf_counter() - started:.2f} s")
+            next_run = schedule.next_after(max(now(), next_run))
+            logger.info(f"{label}: next run at {next_run:%Y-%m-%d %H:%M}")
+    except KeyboardInterrupt:
+        logger.info(f"{label}: stopped")
+
+
+class MtimeCachedValue:
+    """
+    A value loaded from a set of files, reloaded when the set or any file's mtime changes.
+
+    Args:
+        paths: Callable returning the current list of file paths (the set may itself change).
+        loader: Callable taking that list and returning the value.
+    """
+
+    def __init__(self, paths: Callable, loader: Callable):
+        self._paths = paths
+        self._loader = loader
+        self._signature = None
+        self._value = None
+        self.version = 0  # incremented on every (re)load
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature_of(paths) -> tuple:
+        signature = []
+        for path in paths:
+            try:
+                signature.append((str(path), os.stat(path).st_mtime_ns))
+            except OSError:
+                signature.append((str(path), None))
+        return tuple(signature)
+
+    def get(self):
+        with self._lock:
+            paths = list(self._paths())
+            signature = self._signature_of(paths)
+            if signature != self._signature:
+                self._value = self._loader(paths)
+                if self._signature is not None:
+                    logger.info(f"Reloaded {', '.join(os.path.basename(str(path)) for path in paths)}")
+                self._signature = signature
+                self.version += 1
+            return self._value
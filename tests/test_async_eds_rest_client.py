@@ -0,0 +1,69 @@
+# tests/test_async_eds_rest_client.py
+import asyncio
+import json
+import math
+
+from pipeline_eds.api.eds.request_waiter import PollPolicy
+from pipeline_eds.api.eds.rest.async_client import AsyncEdsRestClient
+from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds.api.eds.trend_cache import TrendCache, set_default_trend_cache
+
+class _Response:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+class _FakeEdsSession:
+    base_url = "http://eds.local:43084/api/v1"
+
+    def __init__(self, create_status=200, statuses=("EXECUTING", "SUCCESS"), pages=()):
+        self.create_status = create_status
+        self.statuses = list(statuses)
+        self.pages = list(pages)
+        self.created = []
+
+    def post(self, url, json=None, verify=None):
+        self.created.append(json)
+        return _Response({"id": 7}, self.create_status)
+
+    def get(self, url, params=None, verify=None):
+        if url.endswith("/requests"):
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            return _Response({"7": {"status": status}})
+        assert url.endswith("/trend/tabular?id=7")
+        return _Response(self.pages.pop(0))
+
+def test_load_historic_data_creates_waits_and_reads_pages(monkeypatch):
+    monkeypatch.setattr(EdsRestClient, "POLL_POLICY", PollPolicy(initial_delay=0, max_delay=0))
+    session = _FakeEdsSession(pages=[
+        [{"status": "OK", "items": [[[300, 1.0, "G"]], [[300, 5.0, "G"]]]}],
+        [{"status": "LAST", "items": [[[600, None, "N"]], []]}],
+    ])
+    results = asyncio.run(AsyncEdsRestClient.load_historic_data(session, ["A", "B"], 300, 600, 300, use_cache=False))
+
+    assert session.created[0]["period"] == {"from": 300, "till": 600}
+    assert [item["pointId"]["iess"] for item in session.created[0]["items"]] == ["A", "B"]
+    assert session.pages == [] and session.statuses == ["SUCCESS"]
+    assert list(results[0].timestamps) == [300, 600]
+    assert math.isnan(results[0].values[1]) and results[0].quality_codes() == "GN"
+    assert list(results[1].values) == [5.0]
+
+def test_load_historic_data_returns_empty_list_when_request_is_refused():
+    session = _FakeEdsSession(create_status=500)
+    assert asyncio.run(AsyncEdsRestClient.load_historic_data(session, ["A"], 300, 600, 300, use_cache=False)) == []
+
+def test_load_historic_data_fetches_gaps_through_the_trend_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(EdsRestClient, "POLL_POLICY", PollPolicy(initial_delay=0, max_delay=0))
+    session = _FakeEdsSession(pages=[
+        [{"status": "LAST", "items": [[[300, 1.0, "G"], [600, 2.0, "G"]], [[300, 5.0, "G"], [600, 6.0, "G"]]]}],
+    ])
+    set_default_trend_cache(TrendCache(tmp_path / "cache.sqlite"))
+    try:
+        first = asyncio.run(AsyncEdsRestClient.load_historic_data(session, ["A", "B"], 300, 600, 300))
+        second = asyncio.run(AsyncEdsRestClient.load_historic_data(session, ["A", "B"], 300, 600, 300))
+    finally:
+        set_default_trend_cache(None)
+
+    assert len(session.created) == 1  # the second call is served from the cache
+    assert list(first[1].values) == list(second[1].values) == [5.0, 6.0]
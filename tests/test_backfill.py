@@ -0,0 +1,94 @@
+# tests/test_backfill.py
+from array import array
+import asyncio
+import threading
+
+from pipeline_eds.api.eds.trend_result import TrendSeries
+from pipeline_eds.api.rjn_outbox import RjnOutbox
+from pipeline_eds.backfill import BackfillCheckpoint, split_into_shards, run_backfill
+
+DAY = 24 * 3600
+START = 1754006400  # 2025-08-01 00:00 UTC
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ""
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+class _FakeRjnSession:
+    base_url = "https://rjn.example"
+
+    def __init__(self, failing_entities=(), failure_status=400):
+        self.failing_entities = set(failing_entities)
+        self.failure_status = failure_status
+        self.posts = []
+        self.lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def post(self, url, json, params, timeout, **kwargs):
+        entity = url.split("/entities/")[1].split("/")[0]
+        with self.lock:
+            self.posts.append((entity, sorted(json["data"])))
+        return _Response(self.failure_status if entity in self.failing_entities else 201)
+
+ROWS = [
+    {"zd": "Maxson", "iess": "FI8001.UNIT0@NET0", "rjn_projectid": "p", "rjn_entityid": "1"},
+    {"zd": "Maxson", "iess": "LI8002.UNIT0@NET0", "rjn_projectid": "p", "rjn_entityid": "2"},
+]
+
+async def _fetch(session, rows, shard):
+    starttime, endtime = shard.request_window
+    return [TrendSeries(array("q", [starttime, endtime]), array("d", [1.0, 2.0]), bytearray(b"GG")) for _ in rows]
+
+
+def test_split_into_shards_covers_range_without_overlap():
+    shards = split_into_shards("Maxson", START + 7, START + 2 * DAY + 3600)
+    assert [(shard.starttime, shard.endtime) for shard in shards] == [
+        (START, START + DAY), (START + DAY, START + 2 * DAY), (START + 2 * DAY, START + 2 * DAY + 3600)]
+    assert shards[0].request_window == (START, START + DAY - 300)
+
+
+def test_split_into_shards_drops_a_tail_shorter_than_one_step():
+    shards = split_into_shards("Maxson", 0, DAY + 60)
+    assert [(shard.starttime, shard.endtime) for shard in shards] == [(0, DAY)]
+    assert all(start <= end for start, end in (shard.request_window for shard in shards))
+
+
+def test_backfill_checkpoints_shards_and_resumes(tmp_path):
+    checkpoint = BackfillCheckpoint.for_run(tmp_path, ROWS, START, START + 3 * DAY)
+    session = _FakeRjnSession(failing_entities={"2"})
+    summary = asyncio.run(run_backfill({"Maxson": (object(), ROWS)}, START, START + 3 * DAY, session, checkpoint, fetch=_fetch))
+    assert (summary.shards_done, summary.shards_failed) == (0, 3)
+    assert len(session.posts) == 6
+
+    session.failing_entities.clear()
+    summary = asyncio.run(run_backfill({"Maxson": (object(), ROWS)}, START, START + 3 * DAY, session, checkpoint, fetch=_fetch))
+    assert (summary.shards_done, summary.jobs_sent, summary.samples) == (3, 6, 12)
+
+    # A new process picks up the finished shards from the file
+    resumed = BackfillCheckpoint.for_run(tmp_path, ROWS, START, START + 3 * DAY)
+    session.posts.clear()
+    summary = asyncio.run(run_backfill({"Maxson": (object(), ROWS)}, START, START + 3 * DAY, session, resumed, fetch=_fetch))
+    assert (summary.shards_skipped, summary.shards_done) == (3, 0)
+    assert session.posts == []
+
+
+def test_batches_left_in_the_outbox_are_resent_by_the_next_run(tmp_path):
+    checkpoint = BackfillCheckpoint.for_run(tmp_path, ROWS, START, START + DAY)
+    outbox = RjnOutbox(tmp_path / "outbox.sqlite")
+    session = _FakeRjnSession(failing_entities={"2"}, failure_status=401)
+    summary = asyncio.run(run_backfill({"Maxson": (object(), ROWS)}, START, START + DAY, session, checkpoint, outbox=outbox, fetch=_fetch))
+    assert (summary.shards_done, summary.jobs_sent, summary.jobs_pending) == (1, 1, 1)
+
+    session.failing_entities.clear()
+    session.posts.clear()
+    summary = asyncio.run(run_backfill({"Maxson": (object(), ROWS)}, START, START + DAY, session, checkpoint, outbox=outbox, fetch=_fetch))
+    assert (summary.shards_skipped, summary.jobs_replayed, summary.jobs_pending) == (1, 1, 0)
+    assert [entity for entity, _ in session.posts] == ["2"]
@@ -0,0 +1,46 @@
+# tests/test_bulk_time.py
+from array import array
+from datetime import datetime, timezone
+
+import pytest
+
+from pipeline_eds import helpers
+from pipeline_eds.api.rjn_bulk import format_rjn_timestamps
+from pipeline_eds.bulk_time import TimestampFormatter, floor_timestamps, format_timestamps, get_zone
+from pipeline_eds.time_manager import TimeManager
+
+# Around the 2025-11-02 fall-back transition in Chicago, at odd seconds
+TIMESTAMPS = array("q", range(1762063200, 1762077600, 617))
+
+
+def test_floor_timestamps_matches_modulo():
+    assert floor_timestamps(TIMESTAMPS, 300) == [ts - ts % 300 for ts in TIMESTAMPS]
+    assert floor_timestamps([1754006699.9], 300) == [1754006400]
+
+
+def test_datetime_format_matches_time_manager():
+    assert format_timestamps(TIMESTAMPS) == [TimeManager(ts).as_formatted_date_time() for ts in TIMESTAMPS]
+    assert format_timestamps(TIMESTAMPS, "isoz") == [TimeManager(ts).as_isoz() for ts in TIMESTAMPS]
+
+
+def test_iso_format_matches_datetime_in_any_zone():
+    chicago = get_zone("America/Chicago")
+    assert get_zone("America/Chicago") is chicago
+    assert format_timestamps(TIMESTAMPS, "iso", "America/Chicago") == [datetime.fromtimestamp(ts, tz=chicago).isoformat() for ts in TIMESTAMPS]
+    assert format_timestamps(TIMESTAMPS, "iso", zone=None) == [datetime.fromtimestamp(ts).isoformat() for ts in TIMESTAMPS]
+    assert helpers.iso(1754006400.5) == datetime.fromtimestamp(1754006400.5).isoformat()
+
+
+def test_rjn_timestamps_keep_utc_semantics_for_numbers_and_strings():
+    assert format_rjn_timestamps([1754006400, 1754006700.0, "2025-08-01T00:10:00Z"]) == [
+        "2025-08-01 00:00:00", "2025-08-01 00:05:00", "2025-08-01 00:10:00"]
+
+
+def test_round_datetime_to_nearest_past_five_minutes():
+    dt = datetime(2025, 8, 1, 10, 59, 59, 999, tzinfo=timezone.utc)
+    assert helpers.round_datetime_to_nearest_past_five_minutes(dt) == datetime(2025, 8, 1, 10, 55, tzinfo=timezone.utc)
+
+
+def test_isoz_is_utc_only():
+    with pytest.raises(ValueError):
+        TimestampFormatter("isoz", "America/Chicago")
@@ -0,0 +1,31 @@
+# tests/test_concurrency_limits.py
+import asyncio
+
+from pipeline_eds.concurrency_limits import ConcurrencyLimits
+
+def test_from_config_reads_section_and_falls_back():
+    limits = ConcurrencyLimits.from_config({"concurrency": {"rjn": 8, "eds_api": "x", "local_db": 0}})
+    assert limits == ConcurrencyLimits(eds_api=2, local_db=1, rjn=8)
+    assert ConcurrencyLimits.from_config(None) == ConcurrencyLimits()
+
+def test_semaphores_bound_in_flight_calls():
+    limits = ConcurrencyLimits(rjn=2)
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        semaphore = limits.semaphores()["rjn"]
+        in_flight = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with semaphore:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
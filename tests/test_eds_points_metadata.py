@@ -0,0 +1,63 @@
+# tests/test_eds_points_metadata.py
+from json import dumps
+
+from pipeline_eds.api.eds.rest.client import EdsRestClient
+
+EXPORT_TEXT = """\
+# EDS points export
+POINT IESS='M100FI.UNIT0@NET0' UN='MGD' DESC='INFLUENT FLOW'
+POINT IESS='FI8001.UNIT0@NET0' UN='MGD' DESC='EFFLUENT FLOW'
+"""
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+class _ExportSession:
+    base_url = "http://eds.local:43084/api/v1"
+    zd = "Maxson"
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+
+    def get(self, url, params=None, json=None, verify=None):
+        self.calls.append(params)
+        return _Response(self.text)
+
+def test_parse_points_export_indexes_by_iess():
+    index = EdsRestClient.parse_points_export(EXPORT_TEXT)
+    assert set(index) == {"M100FI.UNIT0@NET0", "FI8001.UNIT0@NET0"}
+    assert index["M100FI.UNIT0@NET0"]["UN"] == "MGD"
+
+def test_get_points_metadata_uses_one_export_call():
+    session = _ExportSession(EXPORT_TEXT)
+    points = EdsRestClient.get_points_metadata(session, filter_iess=["M100FI.UNIT0@NET0", "FI8001.UNIT0@NET0"])
+    assert len(session.calls) == 1
+    assert session.calls[0]["iess"] == "M100FI.UNIT0@NET0,FI8001.UNIT0@NET0"
+    assert points["FI8001.UNIT0@NET0"]["DESC"] == "EFFLUENT FLOW"
+
+def test_chunk_iess_for_export_respects_budget():
+    iess_list = [f"P{i:04d}.UNIT0@NET0" for i in range(500)]
+    chunks = EdsRestClient.chunk_iess_for_export(iess_list)
+    assert len(chunks) > 1
+    assert [iess for chunk in chunks for iess in chunk] == iess_list
+    assert all(len(",".join(chunk)) <= EdsRestClient.POINTS_EXPORT_QUERY_BUDGET for chunk in chunks)
+
+class _QuerySession:
+    base_url = "http://eds.local:43084/api/v1"
+
+    def __init__(self):
+        self.bodies = []
+
+    def post(self, url, json=None, verify=None):
+        self.bodies.append(json)
+        points = [{"iess": iess, "value": 1.0} for iess in json["filters"][0]["iess"] if iess != "GONE.UNIT0@NET0"]
+        return type("Response", (), {"content": dumps({"points": points}).encode()})()
+
+def test_get_points_live_bulk_chunks_and_indexes():
+    session = _QuerySession()
+    iess_list = ["A.UNIT0@NET0", "B.UNIT0@NET0", "A.UNIT0@NET0", "GONE.UNIT0@NET0", ""]
+    snapshot = EdsRestClient.get_points_live_bulk(session, iess_list, chunk_size=2)
+    assert [body["filters"][0]["iess"] for body in session.bodies] == [["A.UNIT0@NET0", "B.UNIT0@NET0"], ["GONE.UNIT0@NET0"]]
+    assert set(snapshot) == {"A.UNIT0@NET0", "B.UNIT0@NET0"}
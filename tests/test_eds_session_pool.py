@@ -0,0 +1,94 @@
+# tests/test_eds_session_pool.py
+import io
+import json
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from pipeline_eds.api.eds.rest import session_pool
+from pipeline_eds.api.eds.rest.session_pool import EdsSessionPool
+
+API_URL = "http://eds.test/api/v1"
+
+class _FakeEds(BaseAdapter):
+    """Answers /login with a new sessionId and rejects every token but the newest."""
+    def __init__(self):
+        super().__init__()
+        self.logins = 0
+        self.paths = []
+
+    def send(self, request, **kwargs):
+        path = request.url.replace(API_URL, "")
+        self.paths.append(path)
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.raw = io.BytesIO()
+        if path == "/login":
+            self.logins += 1
+            response.status_code = 200
+            response._content = json.dumps({"sessionId": f"token-{self.logins}"}).encode()
+        elif self.logins and request.headers.get("Authorization") == f"Bearer token-{self.logins}":
+            response.status_code = 200
+            response._content = b"{}"
+        else:
+            response.status_code = 401
+            response._content = b"{}"
+        return response
+
+    def close(self):
+        pass
+
+class _FakeKeyring:
+    def __init__(self):
+        self.store = {}
+    def get_password(self, service, user):
+        return self.store.get((service, user))
+    def set_password(self, service, user, value):
+        self.store[(service, user)] = value
+    def delete_password(self, service, user):
+        self.store.pop((service, user), None)
+
+def test_pool_reuses_session_and_relogs_in_on_401(monkeypatch):
+    fake_keyring = _FakeKeyring()
+    monkeypatch.setattr(session_pool, "keyring", fake_keyring)
+    monkeypatch.setattr(EdsSessionPool, "_sessions", {})
+    fake_eds = _FakeEds()
+    real_new_session = session_pool.requests.Session
+
+    def session_with_fake_transport():
+        session = real_new_session()
+        session.mount("http://eds.test", fake_eds)
+        return session
+    monkeypatch.setattr(session_pool.requests, "Session", session_with_fake_transport)
+
+    # A valid token from an earlier run means no /login at all
+    fake_keyring.set_password(EdsSessionPool._keyring_service_name(API_URL), "admin",
+                              json.dumps({"token": "token-0", "expires_at": 4102444800}))
+    session = EdsSessionPool.get_session(API_URL, "admin", "pw")
+    assert EdsSessionPool.get_session(API_URL + "/", "admin", "pw") is session
+    assert fake_eds.paths == []
+
+    # token-0 is stale on the server: 401 -> login -> replay
+    assert session.get(f"{API_URL}/requests?id=1").status_code == 200
+    assert fake_eds.paths == ["/requests?id=1", "/login", "/requests?id=1"]
+    stored = json.loads(fake_keyring.get_password(EdsSessionPool._keyring_service_name(API_URL), "admin"))
+    assert stored["token"] == "token-1"
+
+def test_plants_sharing_host_and_user_keep_their_own_zd(monkeypatch):
+    monkeypatch.setattr(session_pool, "keyring", None)
+    monkeypatch.setattr(EdsSessionPool, "_sessions", {})
+    fake_eds = _FakeEds()
+    real_new_session = session_pool.requests.Session
+
+    def session_with_fake_transport():
+        session = real_new_session()
+        session.mount("http://eds.test", fake_eds)
+        return session
+    monkeypatch.setattr(session_pool.requests, "Session", session_with_fake_transport)
+
+    maxson = EdsSessionPool.get_session(API_URL, "admin", "pw", zd="Maxson")
+    stiles = EdsSessionPool.get_session(API_URL, "admin", "pw", zd="WWTF")
+    assert maxson is not stiles
+    assert (maxson.zd, stiles.zd) == ("Maxson", "WWTF")
+    assert EdsSessionPool.get_session(API_URL, "admin", "pw", zd="Maxson") is maxson
@@ -0,0 +1,49 @@
+# tests/test_entity_checkpoints.py
+from pipeline_eds.queriesmanager import QueriesManager
+
+class _Workspace:
+    workspace_name = "test"
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_timestamp_success_file_path(self):
+        return self.path
+
+def _row(iess, entity_id):
+    return {"iess": iess, "rjn_projectid": "P", "rjn_entityid": entity_id}
+
+def test_windows_follow_each_entity_checkpoint(tmp_path):
+    manager = QueriesManager(_Workspace(tmp_path / "timestamps_success.json"))
+    end = 1_757_800_000 - 1_757_800_000 % 300
+    manager.update_entity_checkpoints("RJN", {("P", "1"): end - 3600, ("P", "2"): end - 3600, ("P", "3"): end})
+    manager.update_entity_checkpoints("RJN", {("P", "1"): end - 7200})  # never moves backwards
+
+    rows = [_row("A", "1"), _row("B", "2"), _row("C", "3"), _row("D", "4")]
+    windows = manager.plan_entity_windows("RJN", rows, default_starttime=end - 600, endtime=end)
+    assert windows == {
+        (end - 3300, end): [rows[0], rows[1]],  # one request for both
+        (end - 600, end): [rows[3]],            # no checkpoint yet
+    }                                           # C is up to date
+
+def test_lookback_is_capped(tmp_path):
+    manager = QueriesManager(_Workspace(tmp_path / "timestamps_success.json"))
+    end = 1_757_800_200
+    manager.update_entity_checkpoints("RJN", {("P", "1"): 0})
+    windows = manager.plan_entity_windows("RJN", [_row("A", "1")], default_starttime=end - 600, endtime=end)
+    assert list(windows) == [(end - QueriesManager.CHECKPOINT_MAX_LOOKBACK_SECONDS, end)]
+
+def test_seeded_entity_is_retried_after_others_succeed(tmp_path):
+    manager = QueriesManager(_Workspace(tmp_path / "timestamps_success.json"))
+    end = 1_757_800_200
+    rows = [_row("A", "1"), _row("B", "2")]
+    # First run after deployment: no checkpoints; A is accepted, B fails, last_success moves on
+    manager.seed_entity_checkpoints("RJN", rows, starttime=end - 3600)
+    manager.update_entity_checkpoints("RJN", {("P", "1"): end})
+    manager.seed_entity_checkpoints("RJN", rows, starttime=end)  # existing checkpoints are kept
+
+    windows = manager.plan_entity_windows("RJN", rows, default_starttime=end + 300, endtime=end + 3600)
+    assert windows == {
+        (end - 3600, end + 3600): [rows[1]],  # B from its own first window, not from last_success
+        (end + 300, end + 3600): [rows[0]],
+    }
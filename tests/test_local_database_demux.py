@@ -0,0 +1,223 @@
+# tests/test_local_database_demux.py
+from concurrent.futures import ThreadPoolExecutor
+import math
+import threading
+import time
+
+from pipeline_eds.api.eds.database import build_points_query, demultiplex_rows, sort_series_by_time
+from pipeline_eds.api.eds.trend_result import TrendSeries
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.fetches = 0
+
+    def fetchmany(self, size):
+        self.fetches += 1
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+def test_build_points_query_has_one_placeholder_per_id():
+    query = build_points_query("pla_68a5", 3)
+    assert "FROM `pla_68a5`" in query
+    assert "ids IN (%s, %s, %s)" in query
+    assert query.count("%s") == 5
+
+def test_demultiplex_rows_routes_by_id_in_batches():
+    rows = [
+        (100, 7, 8192, 1.5),
+        (100, 9, 2, 3.0),
+        (160, 7, 0, None),
+        (160, 11, 0, 4.0),  # not requested
+        (220, 9, 8192, 3.5),
+    ]
+    cursor = _FakeCursor(rows)
+    series_list = [TrendSeries(), TrendSeries()]
+    n_rows = demultiplex_rows(cursor, ["7", "9"], series_list, fetch_size=2)
+
+    assert n_rows == 5
+    assert cursor.fetches == 4
+    assert list(series_list[0].timestamps) == [100, 160]
+    assert series_list[0].values[0] == 1.5 and math.isnan(series_list[0].values[1])
+    assert series_list[0].quality_codes() == "GN"
+    assert list(series_list[1].timestamps) == [100, 220]
+    assert series_list[1].quality_codes() == "BG"
+
+def test_sort_series_by_time_merges_tables_out_of_order():
+    series = TrendSeries()
+    for ts, value in [(300, 3.0), (400, 4.0), (100, 1.0), (200, 2.0)]:
+        series.append(ts, value, "G")
+    sort_series_by_time(series)
+    assert list(series.timestamps) == [100, 200, 300, 400]
+    assert list(series.values) == [1.0, 2.0, 3.0, 4.0]
+
+class _FakeTableCursor(_FakeCursor):
+    def __init__(self, tables):
+        super().__init__([])
+        self.tables = tables
+        self.show_columns = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        table = query.split("`")[1]
+        if query.startswith("SHOW COLUMNS"):
+            self.show_columns.append(table)
+            self.rows = [("ts",)] if table in self.tables else []
+        else:
+            self.rows = list(self.tables[table])
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+class _FakePool:
+    def __init__(self, tables):
+        self.tables = tables
+        self.cursors = []
+
+    def get_connection(self):
+        pool = self
+
+        class _Conn:
+            def cursor(self, **kwargs):
+                cursor = _FakeTableCursor(pool.tables)
+                pool.cursors.append(cursor)
+                return cursor
+
+            def close(self):
+                pass
+
+        return _Conn()
+
+def test_scan_tables_parallel_merges_in_time_order_and_caches_schema(tmp_path, monkeypatch):
+    from pipeline_eds.api.eds.database import TableSchemaCache, scan_tables_parallel
+
+    monkeypatch.setattr(TableSchemaCache, "CACHE_PATH", tmp_path / "schema.json")
+    monkeypatch.setattr(TableSchemaCache, "_has_ts", None)
+    pool = _FakePool({
+        "pla_b": [(300, 7, 0, 3.0), (300, 9, 0, 30.0)],
+        "pla_a": [(100, 7, 0, 1.0), (200, 7, 0, 2.0)],
+    })
+    tables = ["pla_b", "pla_a", "pla_old"]  # pla_old has no ts column
+
+    result = scan_tables_parallel(pool, tables, ["7", "9"], 0, 1000, schema_key="db", max_workers=3)
+    assert list(result[0].timestamps) == [100, 200, 300]
+    assert list(result[1].values) == [30.0]
+    assert sorted(table for cursor in pool.cursors for table in cursor.show_columns) == ["pla_a", "pla_b", "pla_old"]
+
+    # Second run, new process: the schema comes from the JSON file, no SHOW COLUMNS
+    monkeypatch.setattr(TableSchemaCache, "_has_ts", None)
+    pool.cursors.clear()
+    scan_tables_parallel(pool, tables, ["7", "9"], 0, 1000, schema_key="db")
+    assert not any(cursor.show_columns for cursor in pool.cursors)
+
+class _FakeCatalogConn:
+    def __init__(self, tables):
+        self.tables = tables  # {name: [ts, ...]}
+        self.stats_queries = []
+
+    def cursor(self, **kwargs):
+        conn = self
+
+        class _Cursor(_FakeTableCursor):
+            def execute(self, query, params=None):
+                if "INFORMATION_SCHEMA" in query:
+                    self.rows = [(name,) for name in sorted(conn.tables)]
+                elif query.startswith("SELECT MIN"):
+                    table = query.split("`")[1]
+                    conn.stats_queries.append(table)
+                    stamps = conn.tables[table]
+                    self.rows = [(min(stamps, default=None), max(stamps, default=None), len(stamps))]
+                else:
+                    super().execute(query, params)
+
+        return _Cursor({name: [] for name in self.tables})
+
+def test_table_time_index_prunes_and_refreshes_incrementally(tmp_path, monkeypatch):
+    from pipeline_eds.api.eds.database import TableSchemaCache, TableTimeIndex
+
+    monkeypatch.setattr(TableSchemaCache, "CACHE_PATH", tmp_path / "schema.json")
+    monkeypatch.setattr(TableSchemaCache, "_has_ts", None)
+    monkeypatch.setattr(TableTimeIndex, "CACHE_PATH", tmp_path / "index.json")
+    monkeypatch.setattr(TableTimeIndex, "_index", None)
+    conn = _FakeCatalogConn({"pla_1": [0, 99], "pla_2": [100, 199], "pla_3": [200, 250]})
+
+    assert TableTimeIndex.tables_overlapping(conn, "db", "wwtf", 150, 210) == ["pla_2", "pla_3"]
+    assert sorted(conn.stats_queries) == ["pla_1", "pla_2", "pla_3"]
+
+    # Next run: only the newest (growing) table and the new one are queried
+    monkeypatch.setattr(TableTimeIndex, "_index", None)
+    conn.tables["pla_3"].append(299)
+    conn.tables["pla_4"] = [300, 310]
+    del conn.tables["pla_1"]
+    conn.stats_queries.clear()
+    assert TableTimeIndex.tables_overlapping(conn, "db", "wwtf", 280, 305) == ["pla_3", "pla_4"]
+    assert sorted(conn.stats_queries) == ["pla_3", "pla_4"]
+    assert "pla_1" not in TableTimeIndex.refresh(conn, "db", "wwtf")
+
+class _ExhaustiblePool:
+    """Raises like MySQLConnectionPool when more than pool_size connections are out."""
+    pool_size = 2
+
+    def __init__(self):
+        self.out = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        pool = self
+        with self.lock:
+            if self.out >= self.pool_size:
+                raise RuntimeError("Failed getting connection; pool exhausted")
+            self.out += 1
+            self.peak = max(self.peak, self.out)
+
+        class _Conn:
+            def close(self):
+                with pool.lock:
+                    pool.out -= 1
+
+        return _Conn()
+
+def test_connection_waits_for_a_free_pooled_connection():
+    from pipeline_eds.api.eds.database import LocalDatabasePool
+
+    pool = _ExhaustiblePool()
+    def borrow(_):
+        with LocalDatabasePool.connection(pool):
+            time.sleep(0.01)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(borrow, range(12)))
+    assert pool.peak == 2 and pool.out == 0
+
+def test_get_pool_is_rebuilt_when_the_connection_settings_change(monkeypatch):
+    import types
+    from pipeline_eds.api.eds import database
+    from pipeline_eds.api.eds.database import LocalDatabasePool
+
+    class _FakePool:
+        def __init__(self, pool_name, pool_size, **conn_config):
+            self.conn_config = conn_config
+            self.closed = False
+        def _remove_connections(self):
+            self.closed = True
+
+    fake_mysql = types.SimpleNamespace(connector=types.SimpleNamespace(pooling=types.SimpleNamespace(MySQLConnectionPool=_FakePool)))
+    monkeypatch.setattr(database, "mysql", fake_mysql, raising=False)
+    monkeypatch.setattr(LocalDatabasePool, "_pools", {})
+    monkeypatch.setattr(LocalDatabasePool, "_slots", {})
+
+    first = LocalDatabasePool.get_pool("Maxson", {"host": "db", "password": "old"})
+    assert LocalDatabasePool.get_pool("Maxson", {"password": "old", "host": "db"}) is first
+    second = LocalDatabasePool.get_pool("Maxson", {"host": "db", "password": "new"})
+    assert second is not first and second.conn_config["password"] == "new"
+    assert first.closed and not second.closed
@@ -0,0 +1,50 @@
+# tests/test_myd_reader.py
+import struct
+
+from pipeline_eds.api.eds.myd_reader import MydReader, MydRowLayout, read_myd_tables
+
+def _write_myd(path, rows, layout=MydRowLayout(), trailing=b""):
+    with open(path, "wb") as f:
+        for live, ts, ids, stat, val in rows:
+            f.write(struct.pack(layout.struct_format, 1 if live else 0, ts, ids, 0, stat, val))
+        f.write(trailing)
+
+def test_reader_filters_ids_time_and_deleted_rows(tmp_path):
+    path = tmp_path / "pla_0001.MYD"
+    _write_myd(path, [
+        (True, 100, 7, 0, 1.0),
+        (False, 110, 7, 0, 9.9),   # deleted
+        (True, 120, 9, 2, 2.0),
+        (True, 130, 7, 8192, 3.0),
+        (True, 500, 7, 0, 4.0),    # outside the window
+        (True, 140, 11, 0, 5.0),   # not requested
+    ], trailing=b"\x01\x02")       # partial record being written
+
+    with MydReader(path) as reader:
+        assert len(reader) == 6
+        series_7, series_9 = reader.read_points(["7", "9"], 100, 400)
+    assert list(series_7.timestamps) == [100, 130]
+    assert list(series_7.values) == [1.0, 3.0]
+    assert series_7.quality_codes() == "NG"
+    assert series_9.quality_codes() == "B"
+
+def test_read_myd_tables_merges_files_and_layout_from_dict(tmp_path):
+    layout = MydRowLayout.from_dict({"header_bytes": 2, "columns": [["ts", "I"], ["ids", "I"], ["tss", "I"], ["stat", "I"], ["val", "d"]]})
+    assert layout.record_length == 26
+    _write_myd(tmp_path / "pla_0002.MYD", [(True, 300, 7, 0, 3.0)], layout)
+    _write_myd(tmp_path / "pla_0001.MYD", [(True, 100, 7, 0, 1.0)], layout)
+    (tmp_path / "pla_0003.MYD").write_bytes(b"")
+
+    result = read_myd_tables(tmp_path, ["7"], 0, 1000, layout=layout)
+    assert list(result[0].timestamps) == [100, 300]
+
+def test_myd_export_command_writes_csv(tmp_path):
+    from typer.testing import CliRunner
+    from pipeline_eds.cli import app
+
+    _write_myd(tmp_path / "pla_0001.MYD", [(True, 1_754_006_400, 7, 8192, 1.5), (True, 1_754_006_700, 9, 8192, 2.5)])
+    output = tmp_path / "export.csv"
+    result = CliRunner().invoke(app, ["myd-export", "--start", "2025-08-01 00:00", "--end", "2025-08-02 00:00",
+                                      "--data-dir", str(tmp_path), "--sid", "7", "--output", str(output)])
+    assert result.exit_code == 0, result.output
+    assert output.read_text().splitlines() == ["point,timestamp,value,quality", "7,2025-08-01 00:00:00,1.5,G"]
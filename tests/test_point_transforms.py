@@ -0,0 +1,53 @@
+# tests/test_point_transforms.py
+from array import array
+
+import pytest
+
+from pipeline_eds.api.eds.trend_result import NAN, TrendSeries
+from pipeline_eds.point_transforms import build_rjn_jobs, compile_transform
+
+def _series(samples):
+    series = TrendSeries()
+    for ts, value, quality in samples:
+        series.append(ts, value, quality)
+    return series
+
+
+def test_wet_well_level_inches_to_feet_above_sea_level():
+    transform = compile_transform({"iess": "M310LI.UNIT0@NET0", "unit_from": "in", "unit_to": "ft", "offset": "181.25"})
+    timestamps, values = transform.apply(_series([(1754006410, 120.0, "G"), (1754006770, 60.0, "G")]))
+    assert timestamps == [1754006400, 1754006700]
+    assert values == [191.25, 186.25]
+    assert transform.unit == "ft"
+
+
+def test_defaults_only_align_and_round_and_drop_missing_values():
+    transform = compile_transform({"iess": "FI8001.UNIT0@NET0", "unit_from": "", "scale": None})
+    timestamps, values = transform.apply(_series([(1754006401, 1.1234567, "G"), (1754006701, None, "N")]))
+    assert timestamps == [1754006400]
+    assert values == [1.12346]
+
+
+def test_quality_filter_scale_and_interval():
+    row = {"iess": "X", "scale": "2", "offset": "-1", "round": "1", "quality": "G,F", "interval": "60"}
+    timestamps, values = compile_transform(row).apply(_series([(100, 1.0, "G"), (130, 2.0, "B"), (190, 3.0, "F")]))
+    assert timestamps == [60, 180]
+    assert values == [1.0, 5.0]
+
+
+def test_rows_with_the_same_columns_share_one_compiled_transform():
+    assert compile_transform({"iess": "A", "scale": "3"}) is compile_transform({"iess": "B", "scale": "3"})
+
+
+@pytest.mark.parametrize("row", [{"iess": "X", "scale": "abc"}, {"iess": "X", "unit_from": "in", "unit_to": "furlong"}])
+def test_invalid_columns_raise(row):
+    with pytest.raises(ValueError, match="Invalid transform columns for X"):
+        compile_transform(row)
+
+
+def test_build_rjn_jobs_skips_points_without_samples():
+    rows = [{"iess": "A", "rjn_projectid": "p", "rjn_entityid": "1"},
+            {"iess": "B", "rjn_projectid": "p", "rjn_entityid": "2"}]
+    results = [TrendSeries(array("q", [600]), array("d", [NAN]), bytearray(b"N")), _series([(900, 4.0, "G")])]
+    jobs = build_rjn_jobs(rows, results)
+    assert [(job.entity_id, job.timestamps, job.values, job.label) for job in jobs] == [("2", [900], [4.0], "B")]
@@ -0,0 +1,48 @@
+# tests/test_request_waiter.py
+import threading
+
+import pytest
+
+from pipeline_eds.api.eds.exceptions import EdsRequestCancelledError, EdsRequestDeadlineError, EdsRequestError
+from pipeline_eds.api.eds.request_waiter import PollPolicy, RequestWaiter, rest_status_checker
+
+FAST = PollPolicy(initial_delay=0.001, multiplier=2.0, max_delay=0.004, deadline=2.0)
+
+def test_policy_backs_off_to_max_delay():
+    delays = PollPolicy(initial_delay=0.1, multiplier=2.0, max_delay=0.5).delays()
+    assert [next(delays) for _ in range(5)] == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+def test_wait_all_checks_pending_ids_in_one_call():
+    calls = []
+    script = {1: ["EXECUTING", "SUCCESS"], 2: ["EXECUTING", "EXECUTING", "FAILURE"]}
+    def check_statuses(ids):
+        calls.append(list(ids))
+        return {request_id: (script[request_id].pop(0), "boom") for request_id in ids}
+
+    timings = RequestWaiter(check_statuses, FAST).wait_all([1, 2])
+    assert calls == [[1, 2], [1, 2], [2]]
+    assert timings[1].succeeded and timings[1].polls == 2
+    assert timings[2].status == "FAILURE" and timings[2].message == "boom"
+    with pytest.raises(EdsRequestError):
+        RequestWaiter(lambda ids: {7: ("FAILURE", "bad point")}, FAST).wait(7)
+
+def test_deadline_and_cancel_abandon_pending_requests():
+    abandoned = []
+    running = lambda ids: {request_id: ("EXECUTING", "") for request_id in ids}
+    policy = PollPolicy(initial_delay=0.001, max_delay=0.001, deadline=0.02)
+    with pytest.raises(EdsRequestDeadlineError):
+        RequestWaiter(running, policy, on_abandon=abandoned.extend).wait_all([3])
+    assert abandoned == [3]
+
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(EdsRequestCancelledError):
+        RequestWaiter(running, FAST, cancel_event=cancel).wait(4)
+
+def test_rest_status_checker_accepts_a_null_message():
+    class _Session:
+        def get(self, url, params=None, verify=None):
+            return type("Response", (), {"content": b'{"7": {"status": "FAILURE", "message": null}, "8": {"status": "SUCCESS"}}'})()
+
+    check_statuses = rest_status_checker(_Session(), "http://eds.local:43084/api/v1")
+    assert check_statuses([7, 8]) == {7: ("FAILURE", ""), 8: ("SUCCESS", "")}
@@ -0,0 +1,71 @@
+# tests/test_rjn_bulk_uploader.py
+import threading
+
+import pytest
+import requests
+
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader, RjnUploadJob, format_rjn_timestamps
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+class _FakeSession:
+    """Replies from a per-entity script of status codes; the last one repeats."""
+    def __init__(self, scripts):
+        self.scripts = scripts
+        self.posts = []
+        self.lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def post(self, url, json, params, timeout):
+        entity = url.split("/entities/")[1].split("/")[0]
+        with self.lock:
+            self.posts.append((entity, json))
+            script = self.scripts[entity]
+            reply = script.pop(0) if len(script) > 1 else script[0]
+        if reply == "drop":
+            raise requests.exceptions.ConnectionError("connection reset")
+        return _Response(*reply) if isinstance(reply, tuple) else _Response(reply)
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(RjnBulkUploader, "_sleep", staticmethod(sleeps.append))
+    monkeypatch.setattr(RjnBulkUploader, "_resume_at", {})
+    return sleeps
+
+def test_upload_all_retries_and_reports_per_job(no_sleep):
+    session = _FakeSession({
+        "1": [200],
+        "2": ["drop", 502, 201],
+        "3": [(429, {"Retry-After": "7"}), 200],
+        "4": [400],
+    })
+    jobs = [RjnUploadJob("p", entity, [1757763000], [1.5]) for entity in ("1", "2", "3", "4")]
+    results = RjnBulkUploader.upload_all(session, "https://rjn.example/api/", jobs, max_workers=3)
+
+    assert [result.job.entity_id for result in results] == ["1", "2", "3", "4"]
+    assert [result.succeeded for result in results] == [True, True, True, False]
+    assert [result.attempts for result in results] == [1, 3, 2, 1]
+    assert results[3].error == "HTTP 400"
+    assert any(abs(delay - 7) < 0.5 for delay in no_sleep)  # honoured Retry-After
+    assert session.posts[0][1]["data"] == {"2025-09-13 11:30:00": 1.5}
+
+def test_invalid_job_fails_alone(no_sleep):
+    session = _FakeSession({"1": [200], "2": [200]})
+    jobs = [RjnUploadJob("p", "1", [1, 2], [1.0]), RjnUploadJob("p", "2", [1], [1.0])]
+    results = RjnBulkUploader.upload_all(session, "https://rjn.example/api", jobs)
+    assert [result.succeeded for result in results] == [False, True]
+    assert "same length" in results[0].error
+
+def test_format_rjn_timestamps_matches_string_path():
+    assert format_rjn_timestamps([1757763000, "2025-09-13T11:30:00Z"]) == ["2025-09-13 11:30:00", "2025-09-13 11:30:00"]
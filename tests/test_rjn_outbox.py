@@ -0,0 +1,85 @@
+# tests/test_rjn_outbox.py
+import pytest
+
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader, RjnUploadJob, RjnUploadResult
+from pipeline_eds.api.rjn_outbox import RjnOutbox
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ""
+        self.ok = status_code < 400
+
+class _FakeSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.keys = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def post(self, url, json, params, timeout, headers=None):
+        self.keys.append(headers["Idempotency-Key"])
+        return _Response(self.status_code)
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(RjnBulkUploader, "_sleep", staticmethod(lambda seconds: None))
+    monkeypatch.setattr(RjnBulkUploader, "_resume_at", {})
+
+def _jobs():
+    return [RjnUploadJob("P", "1", [1757763000, 1757763300], [1.0, 2.0]),
+            RjnUploadJob("P", "2", [1757763000], [5.0])]
+
+def test_enqueue_is_idempotent_and_survives_reopen(tmp_path):
+    path = tmp_path / "rjn_outbox.sqlite"
+    keyed = RjnOutbox(path).enqueue(_jobs())
+    RjnOutbox(path).enqueue(_jobs())  # e.g. the same window transformed again after a crash
+    assert RjnOutbox(path).counts() == {"pending": 2}
+    assert all(job.idempotency_key for job in keyed)
+
+    claimed = RjnOutbox(path).claim_due()
+    assert [job.idempotency_key for job in claimed] == [job.idempotency_key for job in keyed]
+    assert claimed[0].timestamps == [1757763000, 1757763300]
+    assert RjnOutbox(path).claim_due() == []  # leased
+
+def test_failed_batches_back_off_and_replay(tmp_path):
+    outbox = RjnOutbox(tmp_path / "rjn_outbox.sqlite")
+    jobs = outbox.enqueue(_jobs(), now=1000.0)
+    outbox.claim_due(now=1000.0)
+    outbox.record_results([RjnUploadResult(jobs[0], error="ConnectionError"),
+                           RjnUploadResult(jobs[1], status_code=400, error="HTTP 400")], now=1000.0)
+    assert outbox.counts() == {"pending": 1, "dead": 1}
+    assert outbox.claim_due(now=1010.0) == []            # backing off
+    assert len(outbox.claim_due(now=1000.0 + RjnOutbox.RETRY_BASE_SECONDS)) == 1
+
+def test_drain_sends_acknowledges_and_stops_while_rjn_is_down(tmp_path):
+    outbox = RjnOutbox(tmp_path / "rjn_outbox.sqlite")
+    keyed = outbox.enqueue(_jobs())
+
+    down = _FakeSession(503)
+    results = outbox.drain(down, "https://rjn.example/api", batch_size=1)
+    assert len(results) == 1 and not results[0].succeeded  # stopped after one failed round
+    assert outbox.counts() == {"pending": 2}
+
+    with outbox._connect() as conn:  # skip the backoff
+        conn.execute("UPDATE outbox SET next_attempt_at = 0, lease_until = 0")
+    up = _FakeSession(200)
+    results = outbox.drain(up, "https://rjn.example/api")
+    assert all(result.succeeded for result in results)
+    assert sorted(up.keys) == sorted(job.idempotency_key for job in keyed)
+    assert outbox.counts() == {"sent": 2}
+
+def test_expired_token_leaves_batches_pending_and_due(tmp_path):
+    outbox = RjnOutbox(tmp_path / "rjn_outbox.sqlite")
+    outbox.enqueue(_jobs(), now=1000.0)
+
+    results = outbox.drain(_FakeSession(401), "https://rjn.example/api")
+    assert [result.status_code for result in results] == [401, 401]
+    assert outbox.counts() == {"pending": 2}
+
+    # Due again at once, for the drain after a new login
+    results = outbox.drain(_FakeSession(200), "https://rjn.example/api")
+    assert all(result.succeeded for result in results)
+    assert outbox.counts() == {"sent": 2}
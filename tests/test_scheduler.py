@@ -0,0 +1,67 @@
+# tests/test_scheduler.py
+from datetime import datetime
+import os
+import threading
+
+import pytest
+
+from pipeline_eds.scheduler import CronSchedule, MtimeCachedValue, run_on_schedule
+
+
+def test_cron_next_after_hourly():
+    schedule = CronSchedule("5 * * * *")
+    assert schedule.next_after(datetime(2025, 8, 15, 10, 4, 59)) == datetime(2025, 8, 15, 10, 5)
+    assert schedule.next_after(datetime(2025, 8, 15, 10, 5)) == datetime(2025, 8, 15, 11, 5)
+    assert schedule.next_after(datetime(2025, 12, 31, 23, 30)) == datetime(2026, 1, 1, 0, 5)
+
+
+def test_cron_steps_ranges_and_weekdays():
+    schedule = CronSchedule("*/15 6-18 * * 1-5")
+    # Friday 18:50 -> Monday 06:00
+    assert schedule.next_after(datetime(2025, 8, 15, 18, 50)) == datetime(2025, 8, 18, 6, 0)
+    assert schedule.matches(datetime(2025, 8, 18, 6, 45))
+    assert not schedule.matches(datetime(2025, 8, 17, 6, 45))  # Sunday
+
+
+def test_cron_day_of_month_or_weekday():
+    schedule = CronSchedule("0 0 1 * 0")  # the 1st, or any Sunday
+    assert schedule.next_after(datetime(2025, 8, 15)) == datetime(2025, 8, 17)
+    assert schedule.next_after(datetime(2025, 8, 31, 1)) == datetime(2025, 9, 1)
+
+
+@pytest.mark.parametrize("expression", ["5 * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *"])
+def test_cron_rejects_invalid(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_mtime_cached_value_reloads_on_change(tmp_path):
+    path = tmp_path / "queries.csv"
+    path.write_text("a")
+    loads = []
+    cached = MtimeCachedValue(lambda: [path], lambda paths: loads.append(1) or paths[0].read_text())
+
+    assert cached.get() == "a"
+    assert cached.get() == "a"
+    assert len(loads) == 1
+
+    path.write_text("b")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cached.get() == "b"
+    assert cached.version == 2
+
+
+def test_run_on_schedule_survives_failing_cycle():
+    stop = threading.Event()
+    clock = iter(datetime(2025, 8, 15, 10, minute) for minute in range(0, 60, 5))
+    calls = []
+
+    def job():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("EDS down")
+        stop.set()
+
+    run_on_schedule(CronSchedule("* * * * *"), job, stop_event=stop, now=lambda: next(clock))
+    assert len(calls) == 2
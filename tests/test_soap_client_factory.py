@@ -0,0 +1,94 @@
+# tests/test_soap_client_factory.py
+import requests
+
+from pipeline_eds.api.eds.soap import client_factory
+from pipeline_eds.api.eds.soap.client_factory import SoapClientFactory
+
+WSDL_URL = "http://eds.test:43080/eds.wsdl"
+
+def test_wsdl_cache_location_follows_content_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(SoapClientFactory, "WSDL_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(SoapClientFactory, "WSDL_RECHECK_SECONDS", 0)
+    documents = [b"<definitions v1/>", b"<definitions v2/>"]
+
+    def fake_get(url, headers=None, timeout=None, verify=None):
+        if not documents:
+            raise requests.exceptions.ConnectionError("offline")
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = documents.pop(0)
+        return response
+    monkeypatch.setattr(client_factory.requests, "get", fake_get)
+
+    first = SoapClientFactory.wsdl_cache_location(WSDL_URL)
+    second = SoapClientFactory.wsdl_cache_location(WSDL_URL)
+    assert first != second and first.parent == second.parent
+    assert not first.exists()  # the old WSDL version's cache is dropped
+    assert SoapClientFactory.wsdl_cache_location(WSDL_URL) == second  # offline: latest cache
+
+def test_wsdl_is_rechecked_after_ttl_with_a_conditional_get(tmp_path, monkeypatch):
+    monkeypatch.setattr(SoapClientFactory, "WSDL_CACHE_DIR", tmp_path)
+    requests_sent = []
+
+    def fake_get(url, headers=None, timeout=None, verify=None):
+        requests_sent.append(dict(headers or {}))
+        response = requests.models.Response()
+        response.status_code = 304 if headers else 200
+        response._content = b"" if headers else b"<definitions/>"
+        response.headers["ETag"] = '"v1"'
+        return response
+    monkeypatch.setattr(client_factory.requests, "get", fake_get)
+
+    first = SoapClientFactory.wsdl_cache_location(WSDL_URL)
+    assert SoapClientFactory.wsdl_cache_location(WSDL_URL) == first
+    assert requests_sent == [{}]  # within the TTL: no request
+
+    monkeypatch.setattr(SoapClientFactory, "WSDL_RECHECK_SECONDS", 0)
+    assert SoapClientFactory.wsdl_cache_location(WSDL_URL) == first
+    assert requests_sent[1] == {"If-None-Match": '"v1"'}
+    assert first.exists()
+
+class _FakeService:
+    def __init__(self):
+        self.logins = 0
+        self.pings = 0
+    def login(self, username, password):
+        self.logins += 1
+        return f"auth-{self.logins}"
+    def ping(self, authstring):
+        self.pings += 1
+        raise Exception("session expired")
+
+def test_get_authenticated_reuses_authstring(monkeypatch):
+    client = type("Client", (), {"service": _FakeService()})()
+    monkeypatch.setattr(SoapClientFactory, "_sessions", {})
+    monkeypatch.setattr(SoapClientFactory, "get_client", classmethod(lambda cls, url: client))
+
+    assert SoapClientFactory.get_authenticated(WSDL_URL, "admin", "pw")[1] == "auth-1"
+    assert SoapClientFactory.get_authenticated(WSDL_URL, "admin", "pw")[1] == "auth-1"
+    assert client.service.logins == 1
+
+    # Idle past the ping threshold and rejected by ping -> fresh login
+    monkeypatch.setattr(SoapClientFactory, "PING_AFTER_IDLE_SECONDS", -1)
+    assert SoapClientFactory.get_authenticated(WSDL_URL, "admin", "pw")[1] == "auth-2"
+    assert client.service.pings == 1
+
+def test_invalidate_logs_the_session_out_before_forgetting_it(monkeypatch):
+    logouts = []
+    attempts = []
+    def logout(authstring):
+        attempts.append(authstring)
+        if len(attempts) == 1:
+            raise requests.exceptions.ConnectionError("network down")
+        logouts.append(authstring)
+    client = type("Client", (), {"service": type("Service", (), {"logout": staticmethod(logout)})()})()
+    monkeypatch.setattr(SoapClientFactory, "_clients", {WSDL_URL: client})
+    monkeypatch.setattr(SoapClientFactory, "_sessions", {(WSDL_URL, "admin"): ("auth-1", 0.0), (WSDL_URL, "ops"): ("auth-2", 0.0)})
+    monkeypatch.setattr(SoapClientFactory, "_stale", [])
+
+    SoapClientFactory.invalidate(WSDL_URL, "admin")  # logout fails: kept for the exit logout
+    SoapClientFactory.invalidate(WSDL_URL, "ops")
+    assert logouts == ["auth-2"] and SoapClientFactory._sessions == {}
+
+    SoapClientFactory.logout_all()
+    assert logouts == ["auth-2", "auth-1"]
@@ -0,0 +1,35 @@
+# tests/test_soap_point_resolver.py
+import re
+
+from pipeline_eds.api.eds.soap.point_resolver import SoapPointResolver, build_iess_patterns
+
+class _Obj:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+class _FakeSoapClient:
+    def __init__(self, existing):
+        self.existing = existing
+        self.patterns = []
+        self.factory = _Obj(create=lambda name: _Obj(iessRe=None))
+        self.service = _Obj(getPoints=self._get_points)
+
+    def _get_points(self, authstring, filter_obj, order, start, count):
+        self.patterns.append(filter_obj.iessRe)
+        matched = [iess for iess in self.existing if re.fullmatch(filter_obj.iessRe, iess)]
+        return _Obj(matchCount=len(matched), points=[_Obj(id=_Obj(iess=iess)) for iess in matched])
+
+def test_build_iess_patterns_escapes_and_chunks():
+    patterns = build_iess_patterns(["M100FI.UNIT0@NET0", "D-321E.UNIT0@NET0", "FI8001.UNIT0@NET0"], max_pattern_length=45)
+    assert patterns[0] == (r"^(M100FI\.UNIT0@NET0|D-321E\.UNIT0@NET0)$", ["M100FI.UNIT0@NET0", "D-321E.UNIT0@NET0"])
+    assert patterns[1][1] == ["FI8001.UNIT0@NET0"]
+
+def test_resolve_uses_one_call_and_caches(monkeypatch):
+    monkeypatch.setattr(SoapPointResolver, "_known", {})
+    client = _FakeSoapClient(existing=["A.UNIT0@NET0", "C.UNIT0@NET0", "AXUNIT0@NET0"])
+    requested = ["C.UNIT0@NET0", "A.UNIT0@NET0", "B.UNIT0@NET0"]
+
+    assert SoapPointResolver.resolve(client, "auth", "plant", requested) == ["C.UNIT0@NET0", "A.UNIT0@NET0"]
+    assert len(client.patterns) == 1
+    SoapPointResolver.resolve(client, "auth", "plant", ["A.UNIT0@NET0", "C.UNIT0@NET0"])
+    assert len(client.patterns) == 1  # served from the per-plant cache
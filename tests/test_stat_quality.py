@@ -0,0 +1,22 @@
+# tests/test_stat_quality.py
+import random
+
+from pipeline_eds.api.eds.rest import alarm
+from pipeline_eds.api.eds.rest.alarm import decode_quality_column, decode_stat, good_mask, primary_quality, quality_mask
+
+def _reference_quality(stat):
+    flags = decode_stat(stat)
+    return flags[0][2] if flags else "N"
+
+def test_primary_quality_matches_decode_stat():
+    rng = random.Random(7)
+    stats = [0, 1, 2, 8192, 8194, 32768, 1 << 22, (1 << 23) - 1] + [rng.getrandbits(23) for _ in range(500)]
+    for stat in stats:
+        assert primary_quality(stat) == _reference_quality(stat), stat
+
+def test_bulk_decoding_without_numpy(monkeypatch):
+    monkeypatch.setattr(alarm, "np", None)
+    stats = [8192, 2, 0, 32768 + 65536, 16384 + 4]
+    assert decode_quality_column(stats) == bytearray(b"GBNUG")
+    assert list(good_mask(stats)) == [True, False, False, False, True]
+    assert list(quality_mask(bytearray(b"GBNUF"), b"GF")) == [True, False, False, False, True]
@@ -0,0 +1,70 @@
+# tests/test_trend_cache.py
+import math
+
+from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds.api.eds.trend_cache import TrendCache, TrendGap, set_default_trend_cache
+from pipeline_eds.api.eds.trend_result import TabularTrendResult, TrendSeries
+
+SOURCE = "http://eds.local:43084/api/v1"
+
+def _series(first_ts, last_ts, step=60):
+    series = TrendSeries()
+    for ts in range(first_ts, last_ts + step, step):
+        series.append(ts, float(ts), "G")
+    return series
+
+def test_missing_intervals_follow_coverage(tmp_path):
+    cache = TrendCache(tmp_path / "cache.sqlite")
+    assert cache.missing_intervals(SOURCE, "A", 60, "AVG", 0, 600) == [(0, 600)]
+
+    gap = TrendGap(120, 300, 60, ("A",))
+    cache.store(SOURCE, gap, "AVG", TabularTrendResult(["A"], [_series(120, 300)]), now=10_000)
+    assert cache.missing_intervals(SOURCE, "A", 60, "AVG", 0, 600) == [(0, 60), (360, 600)]
+
+    # Touching intervals merge into one
+    cache.store(SOURCE, TrendGap(360, 600, 60, ("A",)), "AVG", TabularTrendResult(["A"], [_series(360, 600)]), now=10_000)
+    assert cache.coverage(SOURCE, "A", 60, "AVG") == [(120, 600)]
+    assert cache.missing_intervals(SOURCE, "B", 60, "AVG", 0, 600) == [(0, 600)]
+
+def test_recent_edge_is_not_marked_covered(tmp_path):
+    cache = TrendCache(tmp_path / "cache.sqlite")
+    cache.store(SOURCE, TrendGap(0, 600, 60, ("A",)), "AVG", TabularTrendResult(["A"], [_series(0, 600)]), now=610)
+    # 540 is the last completed step at now=610
+    assert cache.coverage(SOURCE, "A", 60, "AVG") == [(0, 540)]
+
+def test_empty_or_missing_samples_are_not_marked_covered(tmp_path):
+    cache = TrendCache(tmp_path / "cache.sqlite")
+    late = _series(0, 600)
+    late.values[5] = math.nan  # 300: not in the historian yet
+    outage = _series(0, 600)
+    outage.qualities[3] = ord("N")  # 180
+    short = _series(0, 240)  # nothing after 240
+    cache.store(SOURCE, TrendGap(0, 600, 60, ("A", "B", "C")), "AVG",
+                TabularTrendResult(["A", "B", "C"], [late, outage, short]), now=10_000)
+    assert cache.coverage(SOURCE, "A", 60, "AVG") == [(0, 240)]
+    assert cache.coverage(SOURCE, "B", 60, "AVG") == [(0, 120)]
+    assert cache.coverage(SOURCE, "C", 60, "AVG") == [(0, 240)]
+    assert cache.missing_intervals(SOURCE, "A", 60, "AVG", 0, 600) == [(300, 600)]
+
+def test_load_historic_data_fetches_only_gaps(tmp_path, monkeypatch):
+    calls = []
+    def fake_fetch(session, point_list, starttime, endtime, step_seconds):
+        calls.append((tuple(point_list), starttime, endtime))
+        series = [_series(starttime, endtime, step_seconds) for _ in point_list]
+        series[0].values[0] = math.nan
+        return TabularTrendResult(point_list, series)
+
+    session = type("Session", (), {"base_url": SOURCE})()
+    monkeypatch.setattr(EdsRestClient, "_fetch_historic_data", staticmethod(fake_fetch))
+    set_default_trend_cache(TrendCache(tmp_path / "cache.sqlite"))
+    try:
+        first = EdsRestClient.load_historic_data(session, ["A", "B"], 0, 600, 60)
+        second = EdsRestClient.load_historic_data(session, ["A", "B"], 300, 1200, 60)
+    finally:
+        set_default_trend_cache(None)
+
+    # A's first sample came back empty, so A was never marked covered and is asked for again
+    assert calls == [(("A", "B"), 0, 660), (("A",), 300, 1260), (("B",), 660, 1260)]
+    assert list(first[1].timestamps) == list(range(0, 660, 60))
+    assert math.isnan(first[0].values[0])
+    assert list(second[0].timestamps) == list(range(300, 1260, 60))
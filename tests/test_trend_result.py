@@ -0,0 +1,66 @@
+# tests/test_trend_result.py
+import io
+import json
+import math
+
+import pytest
+
+from pipeline_eds.api.eds.exceptions import EdsRequestError
+from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds.api.eds.trend_result import TabularTrendResult, TrendSeries, write_csv_stream
+
+def test_rows_and_csv_round_trip():
+    series = TrendSeries()
+    series.extend_samples([[1, 2.0, "G"], [2, 3.0, "U"]])
+    assert list(series.rows())[1] == {"ts": 2, "value": 3.0, "quality": "U"}
+
+    buffer = io.StringIO()
+    TabularTrendResult(["P"], [series]).write_csv(buffer)
+    assert buffer.getvalue().splitlines()[1:] == ["P,1,2.0,G", "P,2,3.0,U"]
+
+class _PagedSession:
+    base_url = "http://eds.local:43084/api/v1"
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+
+    def get(self, url, verify=None):
+        page = self.pages.pop(0)
+        return type("Response", (), {"content": json.dumps(page).encode()})()
+
+def test_get_tabular_trend_fills_columns():
+    session = _PagedSession([[
+        {"status": "OK", "items": [[[100, 1.5, "G"]], [[100, 7.0, "B"]]]},
+        {"status": "LAST", "items": [[[160, None, "G"]], []]},
+    ]])
+    results = EdsRestClient.get_tabular_trend(session, 7, ["A", "B"])
+    assert list(results[0].timestamps) == [100, 160]
+    assert results[0].values[0] == 1.5 and math.isnan(results[0].values[1])
+    assert results.series_for("B").quality_codes() == "B"
+    assert results.sample_count() == 3
+
+def test_iter_tabular_trend_yields_each_page():
+    session = _PagedSession([
+        [{"status": "OK", "items": [[[100, 1.0, "G"]], []]}],
+        [{"status": "LAST", "items": [[], [[100, 2.0, "G"]]]}],
+    ])
+    stream = EdsRestClient.iter_tabular_trend(session, 7, ["A", "B"])
+    idx, series = next(stream)
+    assert idx == 0 and list(series.values) == [1.0]
+    assert len(session.pages) == 1  # second page not requested yet
+    assert [idx for idx, _ in stream] == [1]
+
+def test_malformed_tabular_page_raises_request_error():
+    session = _PagedSession([[{"status": "LAST", "items": [[["not-a-ts", 1.0, "G"]]]}]])
+    with pytest.raises(EdsRequestError, match=r"\$\[0\]\.items\[0\]\[0\]\[0\]"):
+        list(EdsRestClient.iter_tabular_trend(session, 7, ["A"]))
+
+def test_write_csv_stream_writes_pages_as_they_arrive():
+    session = _PagedSession([
+        [{"status": "OK", "items": [[[100, 1.0, "G"]], []]}],
+        [{"status": "LAST", "items": [[], [[100, 2.0, "B"]]]}],
+    ])
+    buffer = io.StringIO()
+    count = write_csv_stream(EdsRestClient.iter_tabular_trend(session, 7, ["A", "B"]), buffer, labels=["a", "b"])
+    assert count == 2
+    assert buffer.getvalue().splitlines() == ["point,timestamp,value,quality", "a,100,1.0,G", "b,100,2.0,B"]
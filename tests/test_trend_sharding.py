@@ -0,0 +1,80 @@
+# tests/test_trend_sharding.py
+import asyncio
+
+from pipeline_eds.api.eds.exceptions import EdsRequestError
+from pipeline_eds.api.eds.rest.async_client import AsyncEdsRestClient
+from pipeline_eds.api.eds.rest.client import EdsRestClient
+from pipeline_eds.api.eds.rest.sharding import plan_shards, stitch_shards
+from pipeline_eds.api.eds.trend_result import TabularTrendResult, TrendSeries
+
+def test_plan_shards_splits_time_and_points():
+    shards = plan_shards(0, 3000, 60, ["A", "B", "C"], target_samples=40, max_points_per_shard=2)
+    # 2 points per shard -> 20 steps (1200 s) per window -> 3 windows, for 2 point slices
+    assert len(shards) == 6
+    assert [(s.starttime, s.endtime) for s in shards[:3]] == [(0, 1200), (1200, 2400), (2400, 3000)]
+    assert shards[3].points == ("C",) and shards[3].point_offset == 2
+    assert len(plan_shards(0, 600, 60, ["A"])) == 1
+
+def test_stitch_shards_drops_shared_edge_samples():
+    shards = plan_shards(0, 240, 60, ["A"], target_samples=2)
+    assert len(shards) == 2
+    first = TrendSeries(); first.extend_samples([[0, 1.0, "G"], [60, 2.0, "G"], [120, 3.0, "G"]])
+    second = TrendSeries(); second.extend_samples([[120, 3.0, "G"], [180, 4.0, "G"], [240, 5.0, "G"]])
+    results = {shards[0].index: TabularTrendResult(["A"], [first]),
+               shards[1].index: TabularTrendResult(["A"], [second])}
+    merged = stitch_shards(["A"], shards, results)
+    assert list(merged[0].timestamps) == [0, 60, 120, 180, 240]
+    assert merged[0].quality_codes() == "GGGGG"
+
+def test_sharded_load_retries_only_the_failed_shard(monkeypatch):
+    batches = []
+    def fake_batch(session, batch, step_seconds):
+        batches.append([shard.index for shard in batch])
+        results, errors = {}, {}
+        for shard in batch:
+            if shard.index == 1 and len(batches) == 1:
+                errors[shard.index] = EdsRequestError("TIMEOUT")
+                continue
+            series = TrendSeries()
+            series.extend_samples([[ts, float(ts), "G"] for ts in range(shard.starttime, shard.endtime + 60, 60)])
+            results[shard.index] = TabularTrendResult(list(shard.points), [series])
+        return results, errors
+
+    monkeypatch.setattr(EdsRestClient, "_run_tabular_shard_batch", staticmethod(fake_batch))
+    merged = EdsRestClient.load_historic_data_sharded(object(), ["A"], 0, 480, 60, target_samples=3)
+    assert batches == [[0, 1, 2], [1]]
+    assert list(merged[0].timestamps) == list(range(0, 540, 60))
+
+def _grid_series(starttime, endtime, step=60):
+    series = TrendSeries()
+    series.extend_samples([[ts, float(ts), "G"] for ts in range(starttime, endtime + step, step)])
+    return series
+
+def test_async_sharded_load_retries_only_the_failed_shard(monkeypatch):
+    requests = []
+    async def fake_request(session, point_list, starttime, endtime, step_seconds):
+        requests.append((starttime, endtime))
+        if (starttime, endtime) == (180, 360) and requests.count((180, 360)) == 1:
+            raise EdsRequestError("TIMEOUT")
+        return TabularTrendResult(point_list, [_grid_series(starttime, endtime) for _ in point_list])
+
+    monkeypatch.setattr(AsyncEdsRestClient, "_fetch_tabular_request", staticmethod(fake_request))
+    merged = asyncio.run(AsyncEdsRestClient.load_historic_data_sharded(object(), ["A"], 0, 480, 60, target_samples=3, max_workers=2))
+    assert sorted(requests) == [(0, 180), (180, 360), (180, 360), (360, 480)]
+    assert list(merged[0].timestamps) == list(range(0, 540, 60))
+
+def test_stream_runs_shards_in_time_order_without_repeating_samples(monkeypatch):
+    monkeypatch.setattr(EdsRestClient, "TABULAR_TARGET_SAMPLES", 3)
+    requests = []
+    def fake_stream(session, point_list, starttime, endtime, step_seconds):
+        requests.append((starttime, endtime))
+        series = _grid_series(starttime, endtime)
+        yield 0, TrendSeries(series.timestamps[:2], series.values[:2], series.qualities[:2])
+        if requests == [(0, 180), (180, 360)]:
+            raise EdsRequestError("connection dropped after the first page")
+        yield 0, TrendSeries(series.timestamps[2:], series.values[2:], series.qualities[2:])
+
+    monkeypatch.setattr(EdsRestClient, "_stream_tabular_request", staticmethod(fake_stream))
+    timestamps = [ts for _, series in EdsRestClient.stream_historic_data(object(), ["A"], 0, 480, 60) for ts in series.timestamps]
+    assert requests == [(0, 180), (180, 360), (180, 360), (360, 480)]
+    assert timestamps == list(range(0, 540, 60))
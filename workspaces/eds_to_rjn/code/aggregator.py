@@ -5,8 +5,7 @@ from collections import defaultdict
 import os
 from pprint import pprint
 
-from pipeline_eds.api.rjn import RjnClient #send_data_to_rjn2
-from pipeline_eds.time_manager import TimeManager
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader, RjnUploadJob, format_rjn_timestamps
 
 
 def aggregate_and_send(session_rjn, data_file, checkpoint_file):
@@ -45,7 +44,8 @@ def aggregate_and_send(session_rjn, data_file, checkpoint_file):
 
     print(f"len(grouped) = {len(grouped)}")
 
-    # Send data per entity
+    # Send data per entity, several entities at a time
+    jobs = []
     for (projectid, entityid), records in grouped.items():
         print(f"projectid = {projectid}")
         # Sort timestamps if needed
@@ -56,30 +56,18 @@ def aggregate_and_send(session_rjn, data_file, checkpoint_file):
 
         if timestamps:
             print(f"Attempting to send {len(timestamps)} values to RJN for entity {entityid} at site {projectid}")
-            '''
-            send_data_to_rjn(
-                base_url=rjn_base_url,
-                project_id=projectid,
-                entity_id=entityid,
-                headers=headers_rjn,
-                timestamps=timestamps,
-                values=values
-            )
-            '''
-            RjnClient.send_data_to_rjn(
-            session_rjn,
-            base_url = session_rjn.base_url,
-            project_id=row["rjn_projectid"],
-            entity_id=row["rjn_entityid"],
-            timestamps=timestamps,
-            values=[row["value"]]
-        )
-
-            # Record successful sends
-            if os.path.exists(checkpoint_file):
-                with open(checkpoint_file, 'a', newline='') as f:
-                    writer = csv.writer(f)
-                    for ts in timestamps:
-                        writer.writerow([projectid, entityid, TimeManager(ts).as_formatted_date_time()])
+            jobs.append(RjnUploadJob(project_id=projectid, entity_id=entityid, timestamps=timestamps, values=values))
         else:
-            print(f"No new data to send for {projectid} / {entityid}")
\ No newline at end of file
+            print(f"No new data to send for {projectid} / {entityid}")
+
+    results = RjnBulkUploader.upload_all(session_rjn, session_rjn.base_url, jobs)
+
+    # Record successful sends
+    if os.path.exists(checkpoint_file):
+        with open(checkpoint_file, 'a', newline='') as f:
+            writer = csv.writer(f)
+            for result in results:
+                if not result.succeeded:
+                    continue
+                for ts in format_rjn_timestamps(result.job.timestamps):
+                    writer.writerow([result.job.project_id, result.job.entity_id, ts])
@@ -10,7 +10,8 @@ from pipeline_eds.api.eds.rest.client import EdsRestClient
 
 
 def collect_live_values(session, queries_dictlist_filtered_by_session_key):   
-    data = []
+    # Validate all rows first, so that the live values of every point come from one bulk query
+    rows_with_iess = []
     for row in queries_dictlist_filtered_by_session_key:
         #print(f"\trow = {row}")
         # Skip empty rows (if all values in the row are empty or None)
@@ -33,27 +34,33 @@ def collect_live_values(session, queries_dictlist_filtered_by_session_key):
         except ValueError as e:
             print(f"Invalid data in row: {e}")
             continue
-        
-        try:
-            point_data = EdsRestClient.get_points_live(session, iess)
-            if point_data is None:
-                print(f"No data returned for iess={iess}")
-                continue
-            conflicts = set(row.keys()) & set(point_data.keys())
-            if conflicts:
-                logger.debug(f"Warning: column key collision on {conflicts}, for iess = {iess}. This is expected.")
-            '''
-            Not the worst idea:
-            Use nested structures
-            Instead of flattening all column keys into the same dict, keep fetched data as a sub-dictionary.
-            In which case, the aggregate should be JSON (or TOML, whatever), not CSV.
-            However, we have something that works. It is fine for now.
-            '''
-            # Retrieved point data is flatly added to the existing row from the query.   
-            row.update(point_data) 
-            data.append(row)
-        except Exception as e:
-            print(f"Error on row: {e}")
+        rows_with_iess.append((row, iess))
+
+    try:
+        snapshot = EdsRestClient.get_points_live_bulk(session, [iess for _, iess in rows_with_iess])
+    except Exception as e:
+        print(f"Error on live query: {e}")
+        return []
+
+    data = []
+    for row, iess in rows_with_iess:
+        point_data = snapshot.get(iess)
+        if point_data is None:
+            print(f"No data returned for iess={iess}")
+            continue
+        conflicts = set(row.keys()) & set(point_data.keys())
+        if conflicts:
+            logger.debug(f"Warning: column key collision on {conflicts}, for iess = {iess}. This is expected.")
+        '''
+        Not the worst idea:
+        Use nested structures
+        Instead of flattening all column keys into the same dict, keep fetched data as a sub-dictionary.
+        In which case, the aggregate should be JSON (or TOML, whatever), not CSV.
+        However, we have something that works. It is fine for now.
+        '''
+        # Retrieved point data is flatly added to the existing row from the query.   
+        row.update(point_data) 
+        data.append(row)
     return data
 
 if __name__ == "__main__":
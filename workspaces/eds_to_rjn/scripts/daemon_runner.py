@@ -1,18 +1,25 @@
 #workspaces/eds_to_rjn/scripts/daemon_runner.py
 from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
 # import schedule # not used - now we use Microsoft Task Scheduler # left here for reference.
-import time
-import logging
+import asyncio
 import csv
-from datetime import datetime
+import logging
+import time
 
-from pipeline_eds.api.eds.rest.client import EdsRestClient, identify_relevant_tables
+from pipeline_eds.api.eds.rest.session_pool import EdsSessionPool
+from pipeline_eds.api.eds.rest.async_client import AsyncEdsRestClient
+from pipeline_eds.api.eds.database import identify_relevant_tables, access_database_files_locally, this_computer_is_an_enterprise_database_server
 from pipeline_eds.api.rjn import RjnClient
+from pipeline_eds.api.rjn_bulk import RjnBulkUploader, RjnUploadJob, RjnUploadResult, format_rjn_timestamps
+from pipeline_eds.api.rjn_outbox import RjnOutbox
 from pipeline_eds import helpers
+from pipeline_eds.concurrency_limits import ConcurrencyLimits
+from pipeline_eds.point_transforms import build_rjn_jobs
 from pipeline_eds.env import SecretConfig
 from pipeline_eds.workspace_manager import WorkspaceManager
 from pipeline_eds.queriesmanager import QueriesManager
 from pipeline_eds.queriesmanager import load_query_rows_from_csv_files, group_queries_by_col
+from pipeline_eds.scheduler import CronSchedule, MtimeCachedValue, run_on_schedule
 from pipeline_eds.time_manager import TimeManager
 from pipeline_eds.security_and_config import SecurityAndConfig
 
@@ -22,7 +29,7 @@ logger.setLevel(logging.INFO)
 #def save_tabular_trend_data_to_log_file(project_id, entity_id, endtime: int, workspace_manager, timestamps: list[int], values: list[float]):
 def save_tabular_trend_data_to_log_file(project_id, entity_id, endtime, workspace_manager, timestamps, values):
     ### save file for log
-    timestamps_str = [TimeManager(ts).as_formatted_date_time() for ts in timestamps]
+    timestamps_str = format_rjn_timestamps(timestamps)
     endtime_iso = TimeManager(endtime).as_safe_isoformat_for_filename()
     filename = f"rjn_data_{project_id}_{entity_id}_{endtime_iso}.csv"
     log_dir = workspace_manager.get_logs_dir()
@@ -36,63 +43,160 @@ def save_tabular_trend_data_to_log_file(project_id, entity_id, endtime, workspac
         for ts, val in zip(timestamps_str, values):
             writer.writerow([ts, val])
             
-def run_hourly_tabular_trend_eds_to_rjn(test = False):
+class DaemonState:
+    """
+    What a resident daemon keeps between cycles (see serve()):
+        - the query rows, re-read only when default-queries.toml or one of its CSV files changes
+        - the secrets, re-read when the secrets file changes; the EDS and RJN sessions are then dropped,
+          so the next cycle logs in with the new credentials
+        - the configuration.toml settings ([concurrency], [schedule]), re-read when the file changes
+        - the authenticated RJN session, renewed after RJN_SESSION_TTL_SECONDS or an HTTP 401
+        - the outbox
+    A one-shot run builds a fresh DaemonState, so it behaves as before.
+    """
+    # Renew the RJN bearer token at least this often, even if RJN never answers 401
+    RJN_SESSION_TTL_SECONDS = 6 * 60 * 60
+    DEFAULT_CRON = "5 * * * *"
+
+    def __init__(self, workspace_name: str = 'eds_to_rjn'):
+        self.workspace_manager = WorkspaceManager(workspace_name)
+        self.queries_manager = QueriesManager(self.workspace_manager)
+        self._queries = MtimeCachedValue(self._query_file_paths, self._load_queries)
+        self._secrets = MtimeCachedValue(lambda: [self.workspace_manager.get_secrets_file_path()],
+                                         lambda paths: SecretConfig.load_config(secrets_file_path = paths[0]))
+        self._configuration = MtimeCachedValue(lambda: [self.workspace_manager.get_configuration_file_path()], self._load_configuration)
+        self._secrets_version = None
+        self._session_rjn = None
+        self._session_rjn_expires_at = 0.0
+        self._outbox = None
+
+    def _query_file_paths(self) -> list:
+        # default-queries.toml itself is watched too, so adding a CSV to it is picked up
+        return [self.workspace_manager.get_queries_dir() / 'default-queries.toml'] + self.workspace_manager.get_default_query_file_paths_list()
+
+    @staticmethod
+    def _load_queries(paths):
+        queries_dictlist_unfiltered = load_query_rows_from_csv_files(paths[1:])
+        return group_queries_by_col(queries_dictlist_unfiltered, 'zd')
+
+    @staticmethod
+    def _load_configuration(paths) -> dict:
+        try:
+            return helpers.load_toml(paths[0])
+        except Exception as e:
+            logger.warning(f"Could not read {paths[0]} ({e}); using defaults")
+            return {}
+
+    def queries_grouped_by_session_key(self):
+        return self._queries.get()
+
+    def secrets(self) -> dict:
+        secrets_dict = self._secrets.get()
+        if self._secrets_version is not None and self._secrets_version != self._secrets.version:
+            logger.info("Secrets changed; dropping the EDS and RJN sessions")
+            EdsSessionPool.close_all()
+            self.drop_rjn_session()
+        self._secrets_version = self._secrets.version
+        return secrets_dict
+
+    def limits(self) -> ConcurrencyLimits:
+        return ConcurrencyLimits.from_config(self._configuration.get())
+
+    def cron(self) -> str:
+        return self._configuration.get().get("schedule", {}).get("cron", self.DEFAULT_CRON)
+
+    def outbox(self) -> RjnOutbox:
+        if self._outbox is None:
+            self._outbox = RjnOutbox.for_workspace(self.workspace_manager)
+        return self._outbox
+
+    def eds_sessions(self, secrets_dict) -> dict:
+        sessions_eds = {}
+
+        # --- Prepare Maxson session_eds
+        base_url_maxson = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("url").rstrip("/")
+        # Pooled session: a token stored by the previous hourly run is reused instead of a fresh /login
+        session_maxson = EdsSessionPool.get_session(api_url = base_url_maxson,
+                                                    username = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("username"),
+                                                    password = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("password"),
+                                                    zd = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("zd"))
+        sessions_eds.update({"Maxson":session_maxson})
+
+
+        # --- Prepare Stiles session_eds
+        try:
+            # REST API access fails due to firewall blocking the port
+            # So, alternatively, if this fails, encourage direct MariaDB access, with files at E:\SQLData\stiles\
+            base_url_stiles = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("url").rstrip("/")
+            session_stiles = EdsSessionPool.get_session(api_url = base_url_stiles,
+                                                        username = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("username"),
+                                                        password = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("password"),
+                                                        zd = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("zd"))
+            sessions_eds.update({"WWTP":session_stiles})
+        except:
+            session_stiles = None # possible reduntant for login_to_session() output 
+        sessions_eds.update({"WWTF":session_stiles})
+        return sessions_eds
+
+    def rjn_session(self, secrets_dict):
+        """The authenticated RJN session, logging in only when there is none or it expired."""
+        if self._session_rjn is not None and time.monotonic() < self._session_rjn_expires_at:
+            return self._session_rjn
+        self.drop_rjn_session()
+        base_url_rjn = secrets_dict.get("contractor_apis", {}).get("RJN", {}).get("url").rstrip("/")
+        session_rjn = RjnClient.login_to_session(api_url = base_url_rjn,
+                                        client_id = secrets_dict.get("contractor_apis", {}).get("RJN", {}).get("client_id"),
+                                        password = secrets_dict.get("contractor_apis", {}).get("RJN", {}).get("password"))
+        if session_rjn is None:
+            return None
+        session_rjn.base_url = base_url_rjn
+        RjnBulkUploader.configure_session(session_rjn)
+
+        def expire_on_auth_failure(response, *args, **kwargs):
+            if response.status_code in RjnBulkUploader.AUTH_FAILURE_STATUS_CODES:
+                self._session_rjn_expires_at = 0.0  # log in again before the next upload
+        session_rjn.hooks["response"].append(expire_on_auth_failure)
+        self._session_rjn = session_rjn
+        self._session_rjn_expires_at = time.monotonic() + self.RJN_SESSION_TTL_SECONDS
+        return session_rjn
 
+    def rjn_session_expired(self) -> bool:
+        """True once RJN refused the token of the current session."""
+        return self._session_rjn is not None and self._session_rjn_expires_at == 0.0
 
+    def drop_rjn_session(self):
+        if self._session_rjn is not None:
+            self._session_rjn.close()
+        self._session_rjn = None
+        self._session_rjn_expires_at = 0.0
+
+
+def run_hourly_tabular_trend_eds_to_rjn(test = False, state: DaemonState | None = None):
+    """
+    One EDS to RJN cycle. A resident daemon passes its DaemonState, so the sessions,
+    query rows and secrets of the previous cycle are reused; otherwise everything is loaded fresh.
+    """
     #test_connection_to_internet()
 
-    workspace_name = 'eds_to_rjn' # workspace_name = WorkspaceManager.identify_default_workspace_name()
-    workspace_manager = WorkspaceManager(workspace_name)
-    queries_manager = QueriesManager(workspace_manager)
-    queries_file_path_list = workspace_manager.get_default_query_file_paths_list() # use default identified by the default-queries.toml file
-    logger.debug(f"queries_file_path_list = {queries_file_path_list}")
-
-    queries_dictlist_unfiltered = load_query_rows_from_csv_files(queries_file_path_list)
-    queries_defaultdictlist_grouped_by_session_key = group_queries_by_col(queries_dictlist_unfiltered,'zd')
-    secrets_dict = SecretConfig.load_config(secrets_file_path = workspace_manager.get_secrets_file_path())
-    sessions_eds = {}
-
-    # --- Prepare Maxson session_eds
-    base_url_maxson = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("url").rstrip("/")
-    session_maxson = EdsRestClient.login_to_session(api_url = base_url_maxson,
-                                                username = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("username"),
-                                                password = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("password"))
-    session_maxson.base_url = base_url_maxson
-    session_maxson.zd = secrets_dict.get("eds_apis", {}).get("Maxson", {}).get("zd")
-    sessions_eds.update({"Maxson":session_maxson})
-
-
-    # --- Prepare Stiles session_eds
-    try:
-        # REST API access fails due to firewall blocking the port
-        # So, alternatively, if this fails, encourage direct MariaDB access, with files at E:\SQLData\stiles\
-        base_url_stiles = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("url").rstrip("/")
-        session_stiles = EdsRestClient.login_to_session(api_url = base_url_stiles,
-                                                    username = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("username"),
-                                                    password = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("password"))
-        session_stiles.base_url = base_url_stiles
-        session_stiles.zd = secrets_dict.get("eds_apis", {}).get("WWTP", {}).get("zd")
-        sessions_eds.update({"WWTP":session_stiles})
-    except:
-        session_stiles = None # possible reduntant for login_to_session() output 
-    sessions_eds.update({"WWTF":session_stiles})
-
-    base_url_rjn = secrets_dict.get("contractor_apis", {}).get("RJN", {}).get("url").rstrip("/")
-    session_rjn = RjnClient.login_to_session(api_url = base_url_rjn,
-                                    client_id = secrets_dict.get("contractor_apis", {}).get("RJN", {}).get("client_id"),
-                                    password = secrets_dict.get("contractor_apis", {}).get("RJN", {}).get("password"))
+    state = state or DaemonState() # workspace_name = WorkspaceManager.identify_default_workspace_name()
+    workspace_manager = state.workspace_manager
+    queries_manager = state.queries_manager
+    queries_defaultdictlist_grouped_by_session_key = state.queries_grouped_by_session_key() # use default identified by the default-queries.toml file
+    secrets_dict = state.secrets()
+    sessions_eds = state.eds_sessions(secrets_dict)
+
+    session_rjn = state.rjn_session(secrets_dict)
     if session_rjn is None:
         logger.warning("RJN session not established. Skipping RJN-related data transmission.\n")
         if test is False:
             return
     else:
         logger.info("RJN session established successfully.")
-        session_rjn.base_url = base_url_rjn
     
     # Discern the time range to use
     starttime = queries_manager.get_most_recent_successful_timestamp(api_id="RJN")
     logger.info(f"queries_manager.get_most_recent_successful_timestamp(), key = {'RJN'}")
-    endtime = helpers.get_now_time_rounded(workspace_manager)
+    endtime = helpers.get_now_time_rounded()
     starttime_ts = TimeManager(starttime).as_unix()
     endtime_ts = TimeManager(endtime).as_unix() 
     logger.info(f"starttime = {starttime}")
@@ -102,82 +206,138 @@ def run_hourly_tabular_trend_eds_to_rjn(test = False):
     #session = sessions_eds[key] 
 
     ## To do: start using pandas, for the sake of clarity of manipulation 15 Aug 2025
+    plant_jobs = {}
     for key_eds, session_eds in sessions_eds.items():
-        point_list = [row['iess'] for row in queries_defaultdictlist_grouped_by_session_key.get(key_eds,[])]
-        point_list_sid = [row['sid'] for row in queries_defaultdictlist_grouped_by_session_key.get(key_eds,[])]
-        
-        rjn_projectid_list = [row['rjn_projectid'] for row in queries_defaultdictlist_grouped_by_session_key.get(key_eds,[])]
-        rjn_entityid_list = [row['rjn_entityid'] for row in queries_defaultdictlist_grouped_by_session_key.get(key_eds,[])]
-        
-        
-        if session_eds is None and not EdsRestClient.this_computer_is_an_enterprise_database_server(secrets_dict, key_eds):
+        if session_eds is None and not this_computer_is_an_enterprise_database_server(secrets_dict, key_eds):
             logger.warning(f"Skipping EDS session for {key_eds} — session_eds is None and this computer is not an enterprise database server.")
             continue
-        
+        plant_jobs[key_eds] = (session_eds, queries_defaultdictlist_grouped_by_session_key.get(key_eds,[]))
+
+    # Fetch, transform and upload per plant, all plants at once: the RJN uploads of one plant
+    # overlap the EDS fetch of the next, and a slow Stiles fallback does not hold up Maxson.
+    limits = state.limits()
+    logger.info(f"Concurrency limits: {limits}")
+    # Transformed batches go through the durable outbox; a test run must not leave anything in it
+    outbox = None if test else state.outbox()
+    asyncio.run(run_plant_pipelines(plant_jobs, starttime_ts, endtime_ts, secrets_dict, session_rjn,
+                                    queries_manager, workspace_manager, endtime, limits, outbox, test))
+    if outbox is not None and state.rjn_session_expired():
+        # The token expired during the cycle; its batches are still pending in the outbox
+        logger.info("RJN refused the session token; logging in again to send the pending batches")
+        session_rjn = state.rjn_session(secrets_dict)
+        if session_rjn is not None:
+            outbox.drain(session_rjn, session_rjn.base_url, limits.rjn)
+    # No per-plant logout: the EDS sessions stay valid for the next run (see EdsSessionPool.TOKEN_TTL_SECONDS)
+
+def serve(cron: str | None = None, test = False):
+    """
+    Resident mode: run the EDS to RJN cycle in this process, on a cron schedule
+    ([schedule] cron in configuration.toml, default every hour at :05), instead of a
+    fresh interpreter per Task Scheduler run. Stop with Ctrl+C.
+    """
+    state = DaemonState()
+    schedule = CronSchedule(cron or state.cron())
+    run_on_schedule(schedule, lambda: run_hourly_tabular_trend_eds_to_rjn(test=test, state=state), label="EDS to RJN")
+
+
+async def run_plant_pipelines(plant_jobs, starttime_ts, endtime_ts, secrets_dict, session_rjn,
+                              queries_manager, workspace_manager, endtime, limits, outbox=None, test=False):
+    """
+    Run the fetch -> transform -> upload stages of every plant concurrently.
+    Each upstream API has its own semaphore (see ConcurrencyLimits), so e.g. the local
+    MariaDB fallback and the EDS REST plants do not compete for the same slots.
+    Batches left unsent by earlier runs are replayed from the outbox first.
+    """
+    if outbox is not None and session_rjn is not None:
+        replayed = await asyncio.to_thread(outbox.drain, session_rjn, session_rjn.base_url, limits.rjn)
+        if replayed:
+            logger.info(f"Replayed {len(replayed)} unsent RJN batch(es) from the outbox")
+    semaphores = limits.semaphores()
+    outcomes = await asyncio.gather(
+        *(run_plant_pipeline(key_eds, session_eds, rows, starttime_ts, endtime_ts, secrets_dict, session_rjn,
+                             queries_manager, workspace_manager, endtime, semaphores, outbox, test)
+          for key_eds, (session_eds, rows) in plant_jobs.items()),
+        return_exceptions=True,
+    )
+    for key_eds, outcome in zip(plant_jobs, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"[{key_eds}] EDS to RJN pipeline failed: {outcome}")
+
+async def run_plant_pipeline(key_eds, session_eds, rows, starttime_ts, endtime_ts, secrets_dict, session_rjn,
+                             queries_manager, workspace_manager, endtime, semaphores, outbox=None, test=False):
+    # Each entity is fetched from its own checkpoint; entities sharing a window share one request.
+    # New entities are pinned to this window first, so update_success() cannot skip them if they fail.
+    if not test:
+        queries_manager.seed_entity_checkpoints("RJN", rows, starttime_ts)
+    windows = queries_manager.plan_entity_windows("RJN", rows, starttime_ts, endtime_ts)
+    if not windows:
+        logger.info(f"All {key_eds} entities are up to date.")
+        return
+    logger.info(f"[{key_eds}] {sum(len(window_rows) for window_rows in windows.values())} point(s) in {len(windows)} fetch window(s)")
+
+    async def fetch_and_transform(window, window_rows):
+        results = await fetch_plant_results(key_eds, session_eds, window_rows, window[0], window[1], secrets_dict, semaphores)
+        if not results:
+            logger.info(f"No results retrieved for {key_eds} window {window}. Transmission to RJN skipped.")
+            return []
+        return transform_plant_results(key_eds, window_rows, results)
+
+    job_lists = await asyncio.gather(*(fetch_and_transform(window, window_rows) for window, window_rows in windows.items()))
+    jobs = [job for job_list in job_lists for job in job_list]
+    if test or outbox is None:
+        print(f"[TEST] {len(jobs)} RJN upload(s) skipped")
+        return
+
+    # Once in the outbox the batches are durable: a failed post is retried from there, not
+    # re-fetched from EDS, so the entity checkpoints can move past them right away.
+    # Bookkeeping stays on the event loop thread, so the tracking file is never written concurrently.
+    jobs = await asyncio.to_thread(outbox.enqueue, jobs)
+    queries_manager.update_entity_checkpoints("RJN", {(job.project_id, job.entity_id): max(job.timestamps) for job in jobs})
+
+    results = await asyncio.gather(*(upload_to_rjn(job, session_rjn, semaphores["rjn"]) for job in jobs))
+    await asyncio.to_thread(outbox.record_results, results)
+    for result in results:
+        job = result.job
+        if result.succeeded:
+            logger.info(f"RJN data transmission succeeded for entity_id {job.entity_id}, project_id {job.project_id}.")
+            save_tabular_trend_data_to_log_file(job.project_id, job.entity_id, endtime, workspace_manager, job.timestamps, job.values)
+    if any(result.succeeded for result in results):
+        queries_manager.update_success(api_id="RJN", success_time=endtime)
+
+async def fetch_plant_results(key_eds, session_eds, rows, starttime_ts, endtime_ts, secrets_dict, semaphores):
+    """Fetch stage: EDS REST for plants with a session, the local MariaDB fallback otherwise."""
+    if session_eds is None:
         # Fallback, if API Access fails.
-        if session_eds is None and EdsRestClient.this_computer_is_an_enterprise_database_server(secrets_dict, key_eds):
-            relevant_tables = identify_relevant_tables(key_eds, starttime_ts, endtime_ts, secrets_dict)
-            results = EdsRestClient.access_database_files_locally(key_eds, starttime_ts, endtime_ts, point=point_list_sid, tables=relevant_tables)
-        else:
-            api_url = session_eds.base_url
-            request_id = EdsRestClient.create_tabular_request(session_eds, api_url, starttime_ts, endtime_ts, points=point_list)
-            logger.info(f"request_id = {request_id}")
-            EdsRestClient.wait_for_request_execution_session(session_eds, api_url, request_id)
-            results = EdsRestClient.get_tabular_trend(session_eds, request_id, point_list)
-            session_eds.post(f'{api_url}/logout', verify=False)
-        #print(f"len(results) = {len(results)}")
-        
-        for idx, iess in enumerate(point_list):
-            #print(f"rows = {rows}")
-            timestamps = []
-            values = []
-            entity_id = rjn_entityid_list[idx]
-            project_id = rjn_projectid_list[idx]
-            print(f"/nentity_id = {entity_id}")
-            print(f"iess = {iess}")
-            print(f"project_id = {project_id}")
-            
-            for row in results[idx]:
-                #print(f"row = {row}")
-                #EdsRestClient.print_point_info_row(row)
-
-                dt = datetime.fromtimestamp(row["ts"])
-                timestamp_str = helpers.round_datetime_to_nearest_past_five_minutes(dt).isoformat(timespec='seconds')
-                #if row['quality'] == 'G':
-                timestamps.append(timestamp_str)
-                value = round(row["value"],5)
-                # QUICK AND DIRTY CONVERSION FOR WWTF WETWELL LEVEL TO FEET 
-                if iess == "M310LI.UNIT0@NET0":
-                    value = (value/12)+181.25 # convert inches of wetwell to feet above mean sealevel
-                values.append(value) # unrounded values fail to post
-
-            logger.info(f"len(timestamps) = {len(timestamps)}")
-            if len(timestamps)>0:
-                logger.info(f"timestamps[0] = {timestamps[0]}")
-                logger.info(f"timestamps[-1] = {timestamps[-1]}")
-            else:
-                logger.info(f"No timestamps retrieved. Transmission to RJN skipped for {iess}.")
-            if timestamps and values:
-            
-                # Send data to RJN
-                if not test:
-                    rjn_data_transmission_succeeded = RjnClient.send_data_to_rjn(
-                        session_rjn,
-                        base_url = session_rjn.base_url,
-                        entity_id = entity_id,
-                        project_id = project_id,
-                        timestamps=timestamps,
-                        values=values
-                    )
-                
-                    if rjn_data_transmission_succeeded:
-                        queries_manager.update_success(api_id="RJN", success_time=endtime)
-                        logger.info(f"RJN data transmission succeeded for entity_id {entity_id}, project_id {project_id}.")
-                        save_tabular_trend_data_to_log_file(project_id, entity_id, endtime, workspace_manager,timestamps, values)
-                else:
-                    print("[TEST] RjnClient.send_data_to_rjn() skipped")
-            
-                
+        point_list_sid = [row['sid'] for row in rows]
+        async with semaphores["local_db"]:
+            relevant_tables = await asyncio.to_thread(identify_relevant_tables, key_eds, starttime_ts, endtime_ts, secrets_dict)
+            return await asyncio.to_thread(access_database_files_locally, key_eds, starttime_ts, endtime_ts,
+                                           point=point_list_sid, tables=relevant_tables)
+    point_list = [row['iess'] for row in rows]
+    async with semaphores["eds_api"]:
+        try:
+            # Through the trend cache: overlapping hourly windows and per-entity retries only fetch the gaps
+            return await AsyncEdsRestClient.load_historic_data(session_eds, point_list, starttime_ts, endtime_ts, step_seconds=300)
+        except Exception as e:
+            logger.error(f"[{key_eds}] Tabular trend request failed: {e}")
+            return []
+
+def transform_plant_results(key_eds, rows, results) -> list[RjnUploadJob]:
+    """Transform stage: one RjnUploadJob per point with samples, converted as declared in the query CSV (see point_transforms)."""
+    jobs = build_rjn_jobs(rows, results)
+    for job in jobs:
+        logger.info(f"[{key_eds}] {job.label}: {len(job.timestamps)} sample(s) from {job.timestamps[0]} to {job.timestamps[-1]} for entity {job.entity_id}")
+    sent = {job.label for job in jobs}
+    for row in rows:
+        if row['iess'] not in sent:
+            logger.info(f"No timestamps retrieved. Transmission to RJN skipped for {row['iess']}.")
+    return jobs
+
+async def upload_to_rjn(job: RjnUploadJob, session_rjn, semaphore) -> RjnUploadResult:
+    """Upload stage: send one outbox batch to RJN, with RjnBulkUploader's retries."""
+    async with semaphore:
+        return await asyncio.to_thread(RjnBulkUploader.send_job, session_rjn, session_rjn.base_url, job)
+
 
 def main():
     #logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -195,8 +355,11 @@ if __name__ == "__main__":
         run_hourly_tabular_trend_eds_to_rjn()
     elif cmd == "test":
         run_hourly_tabular_trend_eds_to_rjn(test=True)
+    elif cmd == "serve":
+        serve(cron=sys.argv[2] if len(sys.argv) > 2 else None)
     else:
         print("Usage options: \n"
         "uv run python -m workspaces.eds_to_rjn.scripts.daemon_runner main \n"
         "uv run python -m workspaces.eds_to_rjn.scripts.daemon_runner once \n"
-        "uv run python -m workspaces.eds_to_rjn.scripts.daemon_runner test ")
+        "uv run python -m workspaces.eds_to_rjn.scripts.daemon_runner test \n"
+        "uv run python -m workspaces.eds_to_rjn.scripts.daemon_runner serve [\"<cron expression>\"]")